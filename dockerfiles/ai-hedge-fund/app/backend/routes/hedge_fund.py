@@ -4,7 +4,7 @@ import asyncio
 
 from app.backend.models.schemas import ErrorResponse, HedgeFundRequest
 from app.backend.models.events import StartEvent, ProgressUpdateEvent, ErrorEvent, CompleteEvent
-from app.backend.services.graph import create_graph, parse_hedge_fund_response, run_graph_async
+from app.backend.services.graph import get_graph, parse_hedge_fund_response, run_graph_async
 from app.backend.services.portfolio import create_portfolio
 from src.utils.progress import progress
 from src.utils.analysts import get_agents_list
@@ -24,9 +24,8 @@ async def run_hedge_fund(request_data: HedgeFundRequest, request: Request):
         # Create the portfolio
         portfolio = create_portfolio(request_data.initial_cash, request_data.margin_requirement, request_data.tickers)
 
-        # Construct agent graph
-        graph = create_graph(request_data.selected_agents)
-        graph = graph.compile()
+        # Get the compiled agent graph
+        graph = get_graph(request_data.selected_agents)
 
         # Log a test progress update for debugging
         progress.update_status("system", None, "Preparing hedge fund run")
@@ -118,7 +117,7 @@ async def run_hedge_fund(request_data: HedgeFundRequest, request: Request):
                 final_data = CompleteEvent(
                     data={
                         "decisions": parse_hedge_fund_response(result.get("messages", [])[-1].content),
-                        "analyst_signals": result.get("data", {}).get("analyst_signals", {}),
+                        "analyst_signals": result.get("analyst_signals", {}),
                     }
                 )
                 yield final_data.to_sse()
@@ -1,51 +1,17 @@
 import asyncio
 import json
 from langchain_core.messages import HumanMessage
-from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 
-from src.agents.portfolio_manager import portfolio_management_agent
-from src.agents.risk_manager import risk_management_agent
-from src.main import start
+from src.main import get_workflow
 from src.utils.analysts import ANALYST_CONFIG
-from src.graph.state import AgentState
 
 
-# Helper function to create the agent graph
-def create_graph(selected_agents: list[str]) -> StateGraph:
-    """Create the workflow with selected agents."""
-    graph = StateGraph(AgentState)
-    graph.add_node("start_node", start)
-
+# Helper function to get the agent graph
+def get_graph(selected_agents: list[str]) -> CompiledStateGraph:
+    """Get the compiled workflow with selected agents, shared with the CLI and backtester."""
     # Filter out any agents that are not in analyst.py
-    selected_agents = [agent for agent in selected_agents if agent in ANALYST_CONFIG]
-
-    # Get analyst nodes from the configuration
-    analyst_nodes = {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
-
-    # Add selected analyst nodes
-    for agent_name in selected_agents:
-        node_name, node_func = analyst_nodes[agent_name]
-        graph.add_node(node_name, node_func)
-        graph.add_edge("start_node", node_name)
-
-    # Always add risk and portfolio management (for now)
-    graph.add_node("risk_management_agent", risk_management_agent)
-    graph.add_node("portfolio_manager", portfolio_management_agent)
-
-    # Connect selected agents to risk management
-    for agent_name in selected_agents:
-        node_name = analyst_nodes[agent_name][0]
-        graph.add_edge(node_name, "risk_management_agent")
-
-    # Connect the risk management agent to the portfolio management agent
-    graph.add_edge("risk_management_agent", "portfolio_manager")
-
-    # Connect the portfolio management agent to the end node
-    graph.add_edge("portfolio_manager", END)
-
-    # Set the entry point to the start node
-    graph.set_entry_point("start_node")
-    return graph
+    return get_workflow([agent for agent in selected_agents if agent in ANALYST_CONFIG])
 
 
 async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model_name, model_provider, request=None):
@@ -58,7 +24,7 @@ async def run_graph_async(graph, portfolio, tickers, start_date, end_date, model
 
 
 def run_graph(
-    graph: StateGraph,
+    graph: CompiledStateGraph,
     portfolio: dict,
     tickers: list[str],
     start_date: str,
@@ -84,8 +50,8 @@ def run_graph(
                 "portfolio": portfolio,
                 "start_date": start_date,
                 "end_date": end_date,
-                "analyst_signals": {},
             },
+            "analyst_signals": {},
             "metadata": {
                 "show_reasoning": False,
                 "model_name": model_name,
@@ -93,6 +59,8 @@ def run_graph(
                 "request": request,  # Pass the request for agent-specific model access
             },
         },
+        # Run every selected analyst at once; their signals merge through the analyst_signals reducer
+        config={"max_concurrency": max(sum(1 for name in graph.nodes if name.removesuffix("_agent") in ANALYST_CONFIG), 1)},
     )
 
 
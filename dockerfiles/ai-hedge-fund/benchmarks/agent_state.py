@@ -0,0 +1,80 @@
+"""
+Benchmark for the size of AgentState.messages and the time LangGraph spends merging it.
+
+Runs the hedge fund graph shape (start, analysts, risk manager, portfolio manager)
+with stub nodes that skip data and LLM calls, each emitting a JSON signal message
+for every ticker. Nodes either return the whole history plus their message, as the
+start node, risk manager, technicals and portfolio manager used to, or only their
+message. The "chain" topology runs the analysts one after another, where returning
+the history doubles the state at every node.
+
+    poetry run python -m benchmarks.agent_state
+    poetry run python -m benchmarks.agent_state --analysts 15 --tickers 50
+"""
+
+import argparse
+import json
+import time
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END, StateGraph
+
+from src.graph.state import AgentState
+
+
+def stub_node(name: str, tickers: list[str], full_history: bool):
+    """A node emitting one signal message covering every ticker."""
+    content = json.dumps({ticker: {"signal": "neutral", "confidence": 50.0, "reasoning": f"{name} reasoning for {ticker}" * 4} for ticker in tickers})
+
+    def node(state: AgentState):
+        message = HumanMessage(content=content, name=name)
+        return {"messages": state["messages"] + [message] if full_history else [message]}
+
+    return node
+
+
+def build_graph(analysts: int, tickers: list[str], full_history: bool, chain: bool):
+    graph = StateGraph(AgentState)
+    graph.add_node("start_node", lambda state: state if full_history else {"messages": []})
+    names = [f"analyst_{index}" for index in range(analysts)]
+    for index, name in enumerate(names):
+        graph.add_node(name, stub_node(name, tickers, full_history))
+        graph.add_edge(names[index - 1] if chain and index else "start_node", name)
+    graph.add_node("risk_management_agent", stub_node("risk_management_agent", tickers, full_history))
+    graph.add_node("portfolio_manager", stub_node("portfolio_manager", tickers, full_history))
+    for name in names[-1:] if chain else names:
+        graph.add_edge(name, "risk_management_agent")
+    graph.add_edge("risk_management_agent", "portfolio_manager")
+    graph.add_edge("portfolio_manager", END)
+    graph.set_entry_point("start_node")
+    return graph.compile()
+
+
+def measure(analysts: int, tickers: list[str], full_history: bool, chain: bool, rounds: int) -> tuple[int, int, float]:
+    """Return the final message count, the bytes of message content in the final state and the mean seconds per run."""
+    app = build_graph(analysts, tickers, full_history, chain)
+    initial = {"messages": [HumanMessage(content="Make trading decisions based on the provided data.")], "data": {}, "metadata": {}}
+    final_state = app.invoke(initial)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        app.invoke(initial)
+    seconds = (time.perf_counter() - start) / rounds
+    return len(final_state["messages"]), sum(len(message.content) for message in final_state["messages"]), seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark AgentState message growth with full-history and delta node returns")
+    parser.add_argument("--analysts", type=int, default=15, help="Number of analyst nodes. Defaults to 15")
+    parser.add_argument("--tickers", type=int, default=50, help="Number of tickers in each message. Defaults to 50")
+    parser.add_argument("--rounds", type=int, default=5, help="Graph runs timed per case. Defaults to 5")
+    args = parser.parse_args()
+
+    tickers = [f"T{index:03d}" for index in range(args.tickers)]
+    print(f"{args.analysts} analysts x {args.tickers} tickers")
+    for chain in (False, True):
+        for full_history in (True, False):
+            count, size, seconds = measure(args.analysts, tickers, full_history, chain, args.rounds)
+            topology = "chain" if chain else "fan-out"
+            returns = "history + message" if full_history else "message only"
+            print(f"{topology:<8} {returns:<18} {count:6d} messages  {size / 1024:9.0f} KiB  {seconds * 1000:8.1f} ms/run")
@@ -0,0 +1,95 @@
+"""
+Microbenchmark for decoding financial data API pages.
+
+Compares the old path (response.json() then Model(**data)) with validating the raw
+bytes through a cached TypeAdapter, and with orjson when it is installed. Pages come
+from a response archive recorded with --record-archive, or are synthesized with
+1,000 items each by the local stand-in server.
+
+    poetry run python -m benchmarks.decode_pages
+    poetry run python -m benchmarks.decode_pages --archive responses.json.gz
+"""
+
+import argparse
+import gzip
+import json
+import time
+import tracemalloc
+from typing import Callable
+
+from pydantic import BaseModel
+
+from src.data.models import CompanyNewsResponse, InsiderTradeResponse
+from src.tools.api import _type_adapter
+from src.tools.local_server import synthetic_insider_trades, synthetic_news
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Response models for the endpoints whose pages are large enough to matter
+PAGE_MODELS = {"/insider-trades/": InsiderTradeResponse, "/news/": CompanyNewsResponse}
+
+
+def synthetic_pages() -> list[tuple[type[BaseModel], bytes]]:
+    """One 1,000-item insider trades page and one news page."""
+    trades = synthetic_insider_trades("AAPL", "2024-06-30", None, 1000)
+    news = synthetic_news("AAPL", "2024-06-30", None, 1000)
+    return [(InsiderTradeResponse, json.dumps({"insider_trades": trades}).encode()), (CompanyNewsResponse, json.dumps({"news": news}).encode())]
+
+
+def archived_pages(path: str) -> list[tuple[type[BaseModel], bytes]]:
+    """Every successful insider trades and news response in a recorded archive."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    pages = []
+    for key, responses in entries.items():
+        model = next((model for path, model in PAGE_MODELS.items() if path in key), None)
+        pages.extend((model, response["body"].encode("utf-8")) for response in responses if model and response["status_code"] == 200)
+    return pages
+
+
+def measure(decode: Callable[[type[BaseModel], bytes], BaseModel], pages: list[tuple[type[BaseModel], bytes]], rounds: int) -> tuple[float, int]:
+    """Return the mean seconds per page and the peak bytes allocated while decoding one round."""
+    for model, content in pages:
+        decode(model, content)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for model, content in pages:
+            decode(model, content)
+    seconds = (time.perf_counter() - start) / (rounds * len(pages))
+
+    tracemalloc.start()
+    for model, content in pages:
+        decode(model, content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+DECODERS: dict[str, Callable[[type[BaseModel], bytes], BaseModel]] = {
+    "json + Model(**data)": lambda model, content: model(**json.loads(content)),
+    "TypeAdapter.validate_json": lambda model, content: _type_adapter(model).validate_json(content),
+}
+if orjson is not None:
+    DECODERS["orjson + model_validate"] = lambda model, content: model.model_validate(orjson.loads(content))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark decoding of large insider trades and news pages")
+    parser.add_argument("--archive", type=str, help="Response archive to take pages from. Defaults to synthetic 1,000-item pages")
+    parser.add_argument("--rounds", type=int, default=20, help="Times each page is decoded. Defaults to 20")
+    args = parser.parse_args()
+
+    pages = archived_pages(args.archive) if args.archive else synthetic_pages()
+    if not pages:
+        parser.error("No insider trades or news pages found in the archive")
+    print(f"{len(pages)} pages, {sum(len(content) for _, content in pages) / len(pages) / 1024:.0f} KiB on average")
+
+    baseline = None
+    for name, decode in DECODERS.items():
+        seconds, peak = measure(decode, pages, args.rounds)
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds * 1000:8.2f} ms/page  {baseline / seconds:5.2f}x  peak {peak / 1024:8.0f} KiB")
@@ -8,13 +8,31 @@ from src.graph.state import AgentState, show_agent_reasoning
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 
-from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-)
+from src.tools.run_data import RunDataContext
 from src.utils.llm import call_llm
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "ebit",
+    "interest_expense",
+    "capital_expenditure",
+    "depreciation_and_amortization",
+    "outstanding_shares",
+    "net_income",
+    "total_debt",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="ttm", limit=10)],
+    market_cap=True,
+)
 
 
 class AswathDamodaranSignal(BaseModel):
@@ -33,35 +51,26 @@ def aswath_damodaran_agent(state: AgentState):
     Produces a trading signal and explanation in Damodaran's analytical voice.
     """
     data      = state["data"]
+    run_data  = RunDataContext.from_state(state)
     end_date  = data["end_date"]
     tickers   = data["tickers"]
 
     analysis_data: dict[str, dict] = {}
-    damodaran_signals: dict[str, dict] = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         # ─── Fetch core data ────────────────────────────────────────────────────
         progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("aswath_damodaran_agent", ticker, "Fetching financial line items")
-        line_items = search_line_items(
+        line_items = run_data.search_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "ebit",
-                "interest_expense",
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "outstanding_shares",
-                "net_income",
-                "total_debt",
-            ],
+            LINE_ITEMS,
             end_date,
         )
 
         progress.update_status("aswath_damodaran_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         # ─── Analyses ───────────────────────────────────────────────────────────
         progress.update_status("aswath_damodaran_agent", ticker, "Analyzing growth and reinvestment")
@@ -119,20 +128,20 @@ def aswath_damodaran_agent(state: AgentState):
             state=state,
         )
 
-        damodaran_signals[ticker] = damodaran_output.model_dump()
-
         progress.update_status("aswath_damodaran_agent", ticker, "Done", analysis=damodaran_output.reasoning)
 
+        return damodaran_output.model_dump()
+
+    damodaran_signals = map_tickers(tickers, analyze_ticker)
+
     # ─── Push message back to graph state ──────────────────────────────────────
     message = HumanMessage(content=json.dumps(damodaran_signals), name="aswath_damodaran_agent")
 
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(damodaran_signals, "Aswath Damodaran Agent")
-
-    state["data"]["analyst_signals"]["aswath_damodaran_agent"] = damodaran_signals
     progress.update_status("aswath_damodaran_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"aswath_damodaran_agent": damodaran_signals}}
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -1,13 +1,37 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
 import math
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "earnings_per_share",
+    "revenue",
+    "net_income",
+    "book_value_per_share",
+    "total_assets",
+    "total_liabilities",
+    "current_assets",
+    "current_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=10)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=10)],
+    market_cap=True,
+)
 
 
 class BenGrahamSignal(BaseModel):
@@ -25,21 +49,21 @@ def ben_graham_agent(state: AgentState):
     4. Adequate margin of safety.
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     analysis_data = {}
-    graham_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("ben_graham_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(ticker, ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"], end_date, period="annual", limit=10)
+        financial_line_items = run_data.search_line_items(ticker, LINE_ITEMS, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         # Perform sub-analyses
         progress.update_status("ben_graham_agent", ticker, "Analyzing earnings stability")
@@ -72,10 +96,12 @@ def ben_graham_agent(state: AgentState):
             state=state,
         )
 
-        graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
-
         progress.update_status("ben_graham_agent", ticker, "Done", analysis=graham_output.reasoning)
 
+        return {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
+
+    graham_analysis = map_tickers(tickers, analyze_ticker)
+
     # Wrap results in a single message for the chain
     message = HumanMessage(content=json.dumps(graham_analysis), name="ben_graham_agent")
 
@@ -83,12 +109,9 @@ def ben_graham_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(graham_analysis, "Ben Graham Agent")
 
-    # Store signals in the overall state
-    state["data"]["analyst_signals"]["ben_graham_agent"] = graham_analysis
-
     progress.update_status("ben_graham_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"ben_graham_agent": graham_analysis}}
 
 
 def analyze_earnings_stability(metrics: list, financial_line_items: list) -> dict:
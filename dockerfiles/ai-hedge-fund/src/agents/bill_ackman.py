@@ -1,13 +1,37 @@
 from langchain_openai import ChatOpenAI
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "revenue",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    # Optional: intangible_assets if available
+    # "intangible_assets"
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=5)],
+    market_cap=True,
+)
 
 
 class BillAckmanSignal(BaseModel):
@@ -23,39 +47,28 @@ def bill_ackman_agent(state: AgentState):
     Incorporates brand/competitive advantage, activism potential, and other key factors.
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
     
     analysis_data = {}
-    ackman_analysis = {}
     
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("bill_ackman_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=5)
         
         progress.update_status("bill_ackman_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust long-term view.
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "revenue",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                # Optional: intangible_assets if available
-                # "intangible_assets"
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5
         )
         
         progress.update_status("bill_ackman_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
         
         progress.update_status("bill_ackman_agent", ticker, "Analyzing business quality")
         quality_analysis = analyze_business_quality(metrics, financial_line_items)
@@ -103,13 +116,15 @@ def bill_ackman_agent(state: AgentState):
             state=state,
         )
         
-        ackman_analysis[ticker] = {
+        progress.update_status("bill_ackman_agent", ticker, "Done", analysis=ackman_output.reasoning)
+
+        return {
             "signal": ackman_output.signal,
             "confidence": ackman_output.confidence,
             "reasoning": ackman_output.reasoning
         }
-        
-        progress.update_status("bill_ackman_agent", ticker, "Done", analysis=ackman_output.reasoning)
+
+    ackman_analysis = map_tickers(tickers, analyze_ticker)
     
     # Wrap results in a single message for the chain
     message = HumanMessage(
@@ -120,15 +135,12 @@ def bill_ackman_agent(state: AgentState):
     # Show reasoning if requested
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(ackman_analysis, "Bill Ackman Agent")
-    
-    # Add signals to the overall state
-    state["data"]["analyst_signals"]["bill_ackman_agent"] = ackman_analysis
 
     progress.update_status("bill_ackman_agent", None, "Done")
 
     return {
         "messages": [message],
-        "data": state["data"]
+        "analyst_signals": {"bill_ackman_agent": ackman_analysis},
     }
 
 
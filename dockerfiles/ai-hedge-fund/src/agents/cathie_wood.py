@@ -1,12 +1,38 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "revenue",
+    "gross_margin",
+    "operating_margin",
+    "debt_to_equity",
+    "free_cash_flow",
+    "total_assets",
+    "total_liabilities",
+    "dividends_and_other_cash_distributions",
+    "outstanding_shares",
+    "research_and_development",
+    "capital_expenditure",
+    "operating_expense",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=5)],
+    market_cap=True,
+)
 
 
 class CathieWoodSignal(BaseModel):
@@ -24,41 +50,28 @@ def cathie_wood_agent(state: AgentState):
     4. Willing to endure short-term volatility for long-term gains.
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     analysis_data = {}
-    cw_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("cathie_wood_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("cathie_wood_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust view.
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "revenue",
-                "gross_margin",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                "research_and_development",
-                "capital_expenditure",
-                "operating_expense",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("cathie_wood_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         progress.update_status("cathie_wood_agent", ticker, "Analyzing disruptive potential")
         disruptive_analysis = analyze_disruptive_potential(metrics, financial_line_items)
@@ -89,20 +102,20 @@ def cathie_wood_agent(state: AgentState):
             state=state,
         )
 
-        cw_analysis[ticker] = {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning}
-
         progress.update_status("cathie_wood_agent", ticker, "Done", analysis=cw_output.reasoning)
 
+        return {"signal": cw_output.signal, "confidence": cw_output.confidence, "reasoning": cw_output.reasoning}
+
+    cw_analysis = map_tickers(tickers, analyze_ticker)
+
     message = HumanMessage(content=json.dumps(cw_analysis), name="cathie_wood_agent")
 
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(cw_analysis, "Cathie Wood Agent")
 
-    state["data"]["analyst_signals"]["cathie_wood_agent"] = cw_analysis
-
     progress.update_status("cathie_wood_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"cathie_wood_agent": cw_analysis}}
 
 
 def analyze_disruptive_potential(metrics: list, financial_line_items: list) -> dict:
@@ -1,12 +1,43 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items, get_insider_trades, get_company_news
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
+from src.data.models import DataRequirements, DatedRequirement, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "operating_income",
+    "return_on_invested_capital",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+    "research_and_development",
+    "goodwill_and_intangible_assets",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=10)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=10)],
+    market_cap=True,
+    insider_trades=[DatedRequirement(limit=100)],
+    company_news=[DatedRequirement(limit=100)],
+)
+
 
 class CharlieMungerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
@@ -20,46 +51,31 @@ def charlie_munger_agent(state: AgentState):
     Focuses on moat strength, management quality, predictability, and valuation.
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
     
     analysis_data = {}
-    munger_analysis = {}
     
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("charlie_munger_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
         
         progress.update_status("charlie_munger_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "operating_income",
-                "return_on_invested_capital",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "research_and_development",
-                "goodwill_and_intangible_assets",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=10  # Munger examines long-term trends
         )
         
         progress.update_status("charlie_munger_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
         
         progress.update_status("charlie_munger_agent", ticker, "Fetching insider trades")
         # Munger values management with skin in the game
-        insider_trades = get_insider_trades(
+        insider_trades = run_data.get_insider_trades(
             ticker,
             end_date,
             # Look back 2 years for insider trading patterns
@@ -69,7 +85,7 @@ def charlie_munger_agent(state: AgentState):
         
         progress.update_status("charlie_munger_agent", ticker, "Fetching company news")
         # Munger avoids businesses with frequent negative press
-        company_news = get_company_news(
+        company_news = run_data.get_company_news(
             ticker,
             end_date,
             # Look back 1 year for news
@@ -127,13 +143,15 @@ def charlie_munger_agent(state: AgentState):
             state=state,
         )
         
-        munger_analysis[ticker] = {
+        progress.update_status("charlie_munger_agent", ticker, "Done", analysis=munger_output.reasoning)
+
+        return {
             "signal": munger_output.signal,
             "confidence": munger_output.confidence,
             "reasoning": munger_output.reasoning
         }
-        
-        progress.update_status("charlie_munger_agent", ticker, "Done", analysis=munger_output.reasoning)
+
+    munger_analysis = map_tickers(tickers, analyze_ticker)
     
     # Wrap results in a single message for the chain
     message = HumanMessage(
@@ -146,13 +164,10 @@ def charlie_munger_agent(state: AgentState):
         show_agent_reasoning(munger_analysis, "Charlie Munger Agent")
 
     progress.update_status("charlie_munger_agent", None, "Done")
-    
-    # Add signals to the overall state
-    state["data"]["analyst_signals"]["charlie_munger_agent"] = munger_analysis
 
     return {
         "messages": [message],
-        "data": state["data"]
+        "analyst_signals": {"charlie_munger_agent": munger_analysis},
     }
 
 
@@ -1,26 +1,33 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 import json
 
-from src.tools.api import get_financial_metrics
+from src.tools.run_data import RunDataContext
+from src.data.models import DataRequirements, FinancialMetricsRequirement
+
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=10)],
+)
 
 
 ##### Fundamental Agent #####
 def fundamentals_analyst_agent(state: AgentState):
     """Analyzes fundamental data and generates trading signals for multiple tickers."""
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize fundamental analysis for each ticker
-    fundamental_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker
+    def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("fundamentals_analyst_agent", ticker, "Fetching financial metrics")
 
         # Get the financial metrics
-        financial_metrics = get_financial_metrics(
+        financial_metrics = run_data.get_financial_metrics(
             ticker=ticker,
             end_date=end_date,
             period="ttm",
@@ -29,7 +36,7 @@ def fundamentals_analyst_agent(state: AgentState):
 
         if not financial_metrics:
             progress.update_status("fundamentals_analyst_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return None
 
         # Pull the most recent financial metrics
         metrics = financial_metrics[0]
@@ -132,13 +139,15 @@ def fundamentals_analyst_agent(state: AgentState):
         total_signals = len(signals)
         confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
 
-        fundamental_analysis[ticker] = {
+        progress.update_status("fundamentals_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+
+        return {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
-        progress.update_status("fundamentals_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+    fundamental_analysis = map_tickers(tickers, analyze_ticker)
 
     # Create the fundamental analysis message
     message = HumanMessage(
@@ -150,12 +159,9 @@ def fundamentals_analyst_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(fundamental_analysis, "Fundamental Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["fundamentals_analyst_agent"] = fundamental_analysis
-
     progress.update_status("fundamentals_analyst_agent", None, "Done")
     
     return {
         "messages": [message],
-        "data": data,
+        "analyst_signals": {"fundamentals_analyst_agent": fundamental_analysis},
     }
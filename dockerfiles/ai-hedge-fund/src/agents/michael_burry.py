@@ -9,21 +9,40 @@ from langchain_core.messages import HumanMessage
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel
 
-from src.tools.api import (
-    get_company_news,
-    get_financial_metrics,
-    get_insider_trades,
-    get_market_cap,
-    search_line_items,
-)
+from src.tools.run_data import RunDataContext
 from src.utils.llm import call_llm
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
+from src.data.models import DataRequirements, DatedRequirement, FinancialMetricsRequirement, LineItemsRequirement
 
 __all__ = [
     "MichaelBurrySignal",
     "michael_burry_agent",
 ]
 
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "total_debt",
+    "cash_and_equivalents",
+    "total_assets",
+    "total_liabilities",
+    "outstanding_shares",
+    "issuance_or_purchase_of_equity_shares",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="ttm", limit=10)],
+    market_cap=True,
+    insider_trades=[DatedRequirement(limit=1000, lookback_days=365)],
+    company_news=[DatedRequirement(limit=250, lookback_days=365)],
+)
+
+
 ###############################################################################
 # Pydantic output model
 ###############################################################################
@@ -46,6 +65,7 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     """Analyse stocks using Michael Burry's deep‑value, contrarian framework."""
 
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date: str = data["end_date"]  # YYYY‑MM‑DD
     tickers: list[str] = data["tickers"]
 
@@ -53,39 +73,29 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     start_date = (datetime.fromisoformat(end_date) - timedelta(days=365)).date().isoformat()
 
     analysis_data: dict[str, dict] = {}
-    burry_analysis: dict[str, dict] = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         # ------------------------------------------------------------------
         # Fetch raw data
         # ------------------------------------------------------------------
         progress.update_status("michael_burry_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching line items")
-        line_items = search_line_items(
+        line_items = run_data.search_line_items(
             ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
+            LINE_ITEMS,
             end_date,
         )
 
         progress.update_status("michael_burry_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date=end_date, start_date=start_date)
+        insider_trades = run_data.get_insider_trades(ticker, end_date=end_date, start_date=start_date)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching company news")
-        news = get_company_news(ticker, end_date=end_date, start_date=start_date, limit=250)
+        news = run_data.get_company_news(ticker, end_date=end_date, start_date=start_date, limit=250)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         # ------------------------------------------------------------------
         # Run sub‑analyses
@@ -146,13 +156,15 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
             state=state,
         )
 
-        burry_analysis[ticker] = {
+        progress.update_status("michael_burry_agent", ticker, "Done", analysis=burry_output.reasoning)
+
+        return {
             "signal": burry_output.signal,
             "confidence": burry_output.confidence,
             "reasoning": burry_output.reasoning,
         }
 
-        progress.update_status("michael_burry_agent", ticker, "Done", analysis=burry_output.reasoning)
+    burry_analysis = map_tickers(tickers, analyze_ticker)
 
     # ----------------------------------------------------------------------
     # Return to the graph
@@ -162,11 +174,9 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(burry_analysis, "Michael Burry Agent")
 
-    state["data"]["analyst_signals"]["michael_burry_agent"] = burry_analysis
-
     progress.update_status("michael_burry_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"michael_burry_agent": burry_analysis}}
 
 
 ###############################################################################
@@ -1,19 +1,41 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-    get_insider_trades,
-    get_company_news,
-    get_prices,
-)
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
+from src.data.models import DataRequirements, DatedRequirement, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "revenue",
+    "earnings_per_share",
+    "net_income",
+    "operating_income",
+    "gross_margin",
+    "operating_margin",
+    "free_cash_flow",
+    "capital_expenditure",
+    "cash_and_equivalents",
+    "total_debt",
+    "shareholders_equity",
+    "outstanding_shares",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=5)],
+    market_cap=True,
+    insider_trades=[DatedRequirement(limit=50)],
+    company_news=[DatedRequirement(limit=50)],
+    prices=True,
+)
 
 
 class PeterLynchSignal(BaseModel):
@@ -41,51 +63,38 @@ def peter_lynch_agent(state: AgentState):
     """
 
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     start_date = data["start_date"]
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     analysis_data = {}
-    lynch_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("peter_lynch_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("peter_lynch_agent", ticker, "Gathering financial line items")
         # Relevant line items for Peter Lynch's approach
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("peter_lynch_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date, start_date=None, limit=50)
+        insider_trades = run_data.get_insider_trades(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching company news")
-        company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
+        company_news = run_data.get_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("peter_lynch_agent", ticker, "Fetching recent price data for reference")
-        prices = get_prices(ticker, start_date=start_date, end_date=end_date)
+        prices = run_data.get_prices(ticker, start_date=start_date, end_date=end_date)
 
         # Perform sub-analyses:
         progress.update_status("peter_lynch_agent", ticker, "Analyzing growth")
@@ -142,13 +151,15 @@ def peter_lynch_agent(state: AgentState):
             state=state,
         )
 
-        lynch_analysis[ticker] = {
+        progress.update_status("peter_lynch_agent", ticker, "Done", analysis=lynch_output.reasoning)
+
+        return {
             "signal": lynch_output.signal,
             "confidence": lynch_output.confidence,
             "reasoning": lynch_output.reasoning,
         }
 
-        progress.update_status("peter_lynch_agent", ticker, "Done", analysis=lynch_output.reasoning)
+    lynch_analysis = map_tickers(tickers, analyze_ticker)
 
     # Wrap up results
     message = HumanMessage(content=json.dumps(lynch_analysis), name="peter_lynch_agent")
@@ -156,12 +167,9 @@ def peter_lynch_agent(state: AgentState):
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(lynch_analysis, "Peter Lynch Agent")
 
-    # Save signals to state
-    state["data"]["analyst_signals"]["peter_lynch_agent"] = lynch_analysis
-
     progress.update_status("peter_lynch_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"peter_lynch_agent": lynch_analysis}}
 
 
 def analyze_lynch_growth(financial_line_items: list) -> dict:
@@ -1,19 +1,42 @@
 from src.graph.state import AgentState, show_agent_reasoning
-from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
-    get_insider_trades,
-    get_company_news,
-)
+from src.tools.run_data import RunDataContext
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 from src.utils.llm import call_llm
 import statistics
+from src.data.models import DataRequirements, DatedRequirement, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "revenue",
+    "net_income",
+    "earnings_per_share",
+    "free_cash_flow",
+    "research_and_development",
+    "operating_income",
+    "operating_margin",
+    "gross_margin",
+    "total_debt",
+    "shareholders_equity",
+    "cash_and_equivalents",
+    "ebit",
+    "ebitda",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="annual", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="annual", limit=5)],
+    market_cap=True,
+    insider_trades=[DatedRequirement(limit=50)],
+    company_news=[DatedRequirement(limit=50)],
+)
 
 
 class PhilFisherSignal(BaseModel):
@@ -35,15 +58,15 @@ def phil_fisher_agent(state: AgentState):
     Returns a bullish/bearish/neutral signal with confidence and reasoning.
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     analysis_data = {}
-    fisher_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("phil_fisher_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("phil_fisher_agent", ticker, "Gathering financial line items")
         # Include relevant line items for Phil Fisher's approach:
@@ -51,36 +74,22 @@ def phil_fisher_agent(state: AgentState):
         #   - Margins & Stability: operating_income, operating_margin, gross_margin
         #   - Management Efficiency & Leverage: total_debt, shareholders_equity, free_cash_flow
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
+            LINE_ITEMS,
             end_date,
             period="annual",
             limit=5,
         )
 
         progress.update_status("phil_fisher_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         progress.update_status("phil_fisher_agent", ticker, "Fetching insider trades")
-        insider_trades = get_insider_trades(ticker, end_date, start_date=None, limit=50)
+        insider_trades = run_data.get_insider_trades(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("phil_fisher_agent", ticker, "Fetching company news")
-        company_news = get_company_news(ticker, end_date, start_date=None, limit=50)
+        company_news = run_data.get_company_news(ticker, end_date, start_date=None, limit=50)
 
         progress.update_status("phil_fisher_agent", ticker, "Analyzing growth & quality")
         growth_quality = analyze_fisher_growth_quality(financial_line_items)
@@ -145,13 +154,15 @@ def phil_fisher_agent(state: AgentState):
             state=state,
         )
 
-        fisher_analysis[ticker] = {
+        progress.update_status("phil_fisher_agent", ticker, "Done", analysis=fisher_output.reasoning)
+
+        return {
             "signal": fisher_output.signal,
             "confidence": fisher_output.confidence,
             "reasoning": fisher_output.reasoning,
         }
 
-        progress.update_status("phil_fisher_agent", ticker, "Done", analysis=fisher_output.reasoning)
+    fisher_analysis = map_tickers(tickers, analyze_ticker)
 
     # Wrap results in a single message
     message = HumanMessage(content=json.dumps(fisher_analysis), name="phil_fisher_agent")
@@ -159,11 +170,9 @@ def phil_fisher_agent(state: AgentState):
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(fisher_analysis, "Phil Fisher Agent")
 
-    state["data"]["analyst_signals"]["phil_fisher_agent"] = fisher_analysis
-
     progress.update_status("phil_fisher_agent", None, "Done")
     
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"phil_fisher_agent": fisher_analysis}}
 
 
 def analyze_fisher_growth_quality(financial_line_items: list) -> dict:
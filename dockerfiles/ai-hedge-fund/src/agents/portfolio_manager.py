@@ -26,7 +26,7 @@ def portfolio_management_agent(state: AgentState):
 
     # Get the portfolio and analyst signals
     portfolio = state["data"]["portfolio"]
-    analyst_signals = state["data"]["analyst_signals"]
+    analyst_signals = state["analyst_signals"]
     tickers = state["data"]["tickers"]
 
     # Get position limits, current prices, and signals for every ticker
@@ -79,10 +79,7 @@ def portfolio_management_agent(state: AgentState):
 
     progress.update_status("portfolio_manager", None, "Done")
 
-    return {
-        "messages": state["messages"] + [message],
-        "data": state["data"],
-    }
+    return {"messages": [message]}
 
 
 def generate_trading_decision(
@@ -4,9 +4,37 @@ from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.run_data import RunDataContext
 from src.utils.llm import call_llm
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "net_income",
+    "earnings_per_share",
+    "ebit",
+    "operating_income",
+    "revenue",
+    "operating_margin",
+    "total_assets",
+    "total_liabilities",
+    "current_assets",
+    "current_liabilities",
+    "free_cash_flow",
+    "dividends_and_other_cash_distributions",
+    "issuance_or_purchase_of_equity_shares"
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=5)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="ttm", limit=10)],
+    market_cap=True,
+)
+
 
 class RakeshJhunjhunwalaSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
@@ -16,42 +44,28 @@ class RakeshJhunjhunwalaSignal(BaseModel):
 def rakesh_jhunjhunwala_agent(state: AgentState):
     """Analyzes stocks using Rakesh Jhunjhunwala's principles and LLM reasoning."""
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     # Collect all analysis for LLM reasoning
     analysis_data = {}
-    jhunjhunwala_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
 
         # Core Data
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Fetching financial metrics")
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Fetching financial line items")
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "net_income",
-                "earnings_per_share",
-                "ebit",
-                "operating_income",
-                "revenue",
-                "operating_margin",
-                "total_assets",
-                "total_liabilities",
-                "current_assets",
-                "current_liabilities",
-                "free_cash_flow",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares"
-            ],
+            LINE_ITEMS,
             end_date,
         )
 
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Getting market cap")
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         # ─── Analyses ───────────────────────────────────────────────────────────
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Analyzing growth")
@@ -140,20 +154,20 @@ def rakesh_jhunjhunwala_agent(state: AgentState):
             state=state,
         )
 
-        jhunjhunwala_analysis[ticker] = jhunjhunwala_output.model_dump()
-
         progress.update_status("rakesh_jhunjhunwala_agent", ticker, "Done", analysis=jhunjhunwala_output.reasoning)
 
+        return jhunjhunwala_output.model_dump()
+
+    jhunjhunwala_analysis = map_tickers(tickers, analyze_ticker)
+
     # ─── Push message back to graph state ──────────────────────────────────────
     message = HumanMessage(content=json.dumps(jhunjhunwala_analysis), name="rakesh_jhunjhunwala_agent")
 
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(jhunjhunwala_analysis, "Rakesh Jhunjhunwala Agent")
-
-    state["data"]["analyst_signals"]["rakesh_jhunjhunwala_agent"] = jhunjhunwala_analysis
     progress.update_status("rakesh_jhunjhunwala_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"rakesh_jhunjhunwala_agent": jhunjhunwala_analysis}}
 
 
 def analyze_profitability(financial_line_items: list) -> dict[str, any]:
@@ -1,8 +1,17 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import prices_to_df
+from src.tools.run_data import RunDataContext
 import json
+from src.data.models import DataRequirements
+
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    prices=True,
+)
 
 
 ##### Risk Management Agent #####
@@ -10,19 +19,19 @@ def risk_management_agent(state: AgentState):
     """Controls position sizing based on real-world risk factors for multiple tickers."""
     portfolio = state["data"]["portfolio"]
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     tickers = data["tickers"]
 
     # Initialize risk analysis for each ticker
     risk_analysis = {}
-    current_prices = {}  # Store prices here to avoid redundant API calls
 
     # First, fetch prices for all relevant tickers
-    all_tickers = set(tickers) | set(portfolio.get("positions", {}).keys())
-    
-    for ticker in all_tickers:
+    all_tickers = sorted(set(tickers) | set(portfolio.get("positions", {}).keys()))
+
+    def fetch_current_price(ticker: str) -> float | None:
         progress.update_status("risk_management_agent", ticker, "Fetching price data")
         
-        prices = get_prices(
+        prices = run_data.get_prices(
             ticker=ticker,
             start_date=data["start_date"],
             end_date=data["end_date"],
@@ -30,16 +39,19 @@ def risk_management_agent(state: AgentState):
 
         if not prices:
             progress.update_status("risk_management_agent", ticker, "Warning: No price data found")
-            continue
+            return None
 
         prices_df = prices_to_df(prices)
         
         if not prices_df.empty:
             current_price = prices_df["close"].iloc[-1]
-            current_prices[ticker] = current_price
             progress.update_status("risk_management_agent", ticker, f"Current price: {current_price}")
+            return current_price
         else:
             progress.update_status("risk_management_agent", ticker, "Warning: Empty price data")
+            return None
+
+    current_prices = map_tickers(all_tickers, fetch_current_price)  # Store prices here to avoid redundant API calls
 
     # Calculate total portfolio value based on current market prices (Net Liquidation Value)
     total_portfolio_value = portfolio.get("cash", 0.0)
@@ -107,10 +119,7 @@ def risk_management_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(risk_analysis, "Risk Management Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["risk_management_agent"] = risk_analysis
-
     return {
-        "messages": state["messages"] + [message],
-        "data": data,
+        "messages": [message],
+        "analyst_signals": {"risk_management_agent": risk_analysis},
     }
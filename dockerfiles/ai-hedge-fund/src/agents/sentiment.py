@@ -1,28 +1,36 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 import pandas as pd
 import numpy as np
 import json
 
-from src.tools.api import get_insider_trades, get_company_news
+from src.tools.run_data import RunDataContext
+from src.data.models import DataRequirements, DatedRequirement
+
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    insider_trades=[DatedRequirement(limit=1000)],
+    company_news=[DatedRequirement(limit=100)],
+)
 
 
 ##### Sentiment Agent #####
 def sentiment_analyst_agent(state: AgentState):
     """Analyzes market sentiment and generates trading signals for multiple tickers."""
     data = state.get("data", {})
+    run_data = RunDataContext.from_state(state)
     end_date = data.get("end_date")
     tickers = data.get("tickers")
 
-    # Initialize sentiment analysis for each ticker
-    sentiment_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("sentiment_analyst_agent", ticker, "Fetching insider trades")
 
         # Get the insider trades
-        insider_trades = get_insider_trades(
+        insider_trades = run_data.get_insider_trades(
             ticker=ticker,
             end_date=end_date,
             limit=1000,
@@ -37,7 +45,7 @@ def sentiment_analyst_agent(state: AgentState):
         progress.update_status("sentiment_analyst_agent", ticker, "Fetching company news")
 
         # Get the company news
-        company_news = get_company_news(ticker, end_date, limit=100)
+        company_news = run_data.get_company_news(ticker, end_date, limit=100)
 
         # Get the sentiment from the company news
         sentiment = pd.Series([n.sentiment for n in company_news]).dropna()
@@ -108,13 +116,15 @@ def sentiment_analyst_agent(state: AgentState):
             }
         }
 
-        sentiment_analysis[ticker] = {
+        progress.update_status("sentiment_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+
+        return {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
-        progress.update_status("sentiment_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+    sentiment_analysis = map_tickers(tickers, analyze_ticker)
 
     # Create the sentiment message
     message = HumanMessage(
@@ -126,12 +136,9 @@ def sentiment_analyst_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(sentiment_analysis, "Sentiment Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["sentiment_agent"] = sentiment_analysis
-
     progress.update_status("sentiment_analyst_agent", None, "Done")
 
     return {
         "messages": [message],
-        "data": data,
+        "analyst_signals": {"sentiment_agent": sentiment_analysis},
     }
@@ -8,8 +8,17 @@ import json
 import pandas as pd
 import numpy as np
 
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import prices_to_df
+from src.tools.run_data import RunDataContext
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
+from src.data.models import DataRequirements
+
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    prices=True,
+)
 
 
 def safe_float(value, default=0.0):
@@ -42,18 +51,17 @@ def technical_analyst_agent(state: AgentState):
     5. Statistical Arbitrage Signals
     """
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     start_date = data["start_date"]
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize analysis for each ticker
-    technical_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker
+    def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("technical_analyst_agent", ticker, "Analyzing price data")
 
         # Get the historical price data
-        prices = get_prices(
+        prices = run_data.get_prices(
             ticker=ticker,
             start_date=start_date,
             end_date=end_date,
@@ -61,7 +69,7 @@ def technical_analyst_agent(state: AgentState):
 
         if not prices:
             progress.update_status("technical_analyst_agent", ticker, "Failed: No price data found")
-            continue
+            return None
 
         # Convert prices to a DataFrame
         prices_df = prices_to_df(prices)
@@ -103,7 +111,7 @@ def technical_analyst_agent(state: AgentState):
         )
 
         # Generate detailed analysis report for this ticker
-        technical_analysis[ticker] = {
+        ticker_analysis = {
             "signal": combined_signal["signal"],
             "confidence": round(combined_signal["confidence"] * 100),
             "reasoning": {
@@ -134,7 +142,12 @@ def technical_analyst_agent(state: AgentState):
                 },
             },
         }
-        progress.update_status("technical_analyst_agent", ticker, "Done", analysis=json.dumps(technical_analysis, indent=4))
+
+        progress.update_status("technical_analyst_agent", ticker, "Done", analysis=json.dumps(ticker_analysis, indent=4))
+
+        return ticker_analysis
+
+    technical_analysis = map_tickers(tickers, analyze_ticker)
 
     # Create the technical analyst message
     message = HumanMessage(
@@ -145,14 +158,11 @@ def technical_analyst_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(technical_analysis, "Technical Analyst")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["technical_analyst_agent"] = technical_analysis
-
     progress.update_status("technical_analyst_agent", None, "Done")
 
     return {
-        "messages": state["messages"] + [message],
-        "data": data,
+        "messages": [message],
+        "analyst_signals": {"technical_analyst_agent": technical_analysis},
     }
 
 
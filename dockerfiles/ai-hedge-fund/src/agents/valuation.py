@@ -10,28 +10,43 @@ from statistics import median
 import json
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
 
-from src.tools.api import (
-    get_financial_metrics,
-    get_market_cap,
-    search_line_items,
+from src.tools.run_data import RunDataContext
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "free_cash_flow",
+    "net_income",
+    "depreciation_and_amortization",
+    "capital_expenditure",
+    "working_capital",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=8)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="ttm", limit=2)],
+    market_cap=True,
 )
 
+
 def valuation_analyst_agent(state: AgentState):
     """Run valuation across tickers and write signals back to `state`."""
 
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    valuation_analysis: dict[str, dict] = {}
-
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict | None:
         progress.update_status("valuation_analyst_agent", ticker, "Fetching financial data")
 
         # --- Historical financial metrics (pull 8 latest TTM snapshots for medians) ---
-        financial_metrics = get_financial_metrics(
+        financial_metrics = run_data.get_financial_metrics(
             ticker=ticker,
             end_date=end_date,
             period="ttm",
@@ -39,27 +54,21 @@ def valuation_analyst_agent(state: AgentState):
         )
         if not financial_metrics:
             progress.update_status("valuation_analyst_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return None
         most_recent_metrics = financial_metrics[0]
 
         # --- Fine‑grained line‑items (need two periods to calc WC change) ---
         progress.update_status("valuation_analyst_agent", ticker, "Gathering line items")
-        line_items = search_line_items(
+        line_items = run_data.search_line_items(
             ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
+            line_items=LINE_ITEMS,
             end_date=end_date,
             period="ttm",
             limit=2,
         )
         if len(line_items) < 2:
             progress.update_status("valuation_analyst_agent", ticker, "Failed: Insufficient financial line items")
-            continue
+            return None
         li_curr, li_prev = line_items[0], line_items[1]
 
         # ------------------------------------------------------------------
@@ -99,10 +108,10 @@ def valuation_analyst_agent(state: AgentState):
         # ------------------------------------------------------------------
         # Aggregate & signal
         # ------------------------------------------------------------------
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
         if not market_cap:
             progress.update_status("valuation_analyst_agent", ticker, "Failed: Market cap unavailable")
-            continue
+            return None
 
         method_values = {
             "dcf": {"value": dcf_val, "weight": 0.35},
@@ -114,7 +123,7 @@ def valuation_analyst_agent(state: AgentState):
         total_weight = sum(v["weight"] for v in method_values.values() if v["value"] > 0)
         if total_weight == 0:
             progress.update_status("valuation_analyst_agent", ticker, "Failed: All valuation methods zero")
-            continue
+            return None
 
         for v in method_values.values():
             v["gap"] = (v["value"] - market_cap) / market_cap if v["value"] > 0 else None
@@ -140,24 +149,24 @@ def valuation_analyst_agent(state: AgentState):
             for m, vals in method_values.items() if vals["value"] > 0
         }
 
-        valuation_analysis[ticker] = {
+        progress.update_status("valuation_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+
+        return {
             "signal": signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
-        progress.update_status("valuation_analyst_agent", ticker, "Done", analysis=json.dumps(reasoning, indent=4))
+
+    valuation_analysis = map_tickers(tickers, analyze_ticker)
 
     # ---- Emit message (for LLM tool chain) ----
     msg = HumanMessage(content=json.dumps(valuation_analysis), name="valuation_analyst_agent")
     if state["metadata"].get("show_reasoning"):
         show_agent_reasoning(valuation_analysis, "Valuation Analysis Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["valuation_analyst_agent"] = valuation_analysis
-
     progress.update_status("valuation_analyst_agent", None, "Done")
     
-    return {"messages": [msg], "data": data}
+    return {"messages": [msg], "analyst_signals": {"valuation_analyst_agent": valuation_analysis}}
 
 #############################
 # Helper Valuation Functions
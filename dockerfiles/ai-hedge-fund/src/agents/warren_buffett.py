@@ -4,9 +4,35 @@ from langchain_core.messages import HumanMessage
 from pydantic import BaseModel
 import json
 from typing_extensions import Literal
-from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
+from src.tools.run_data import RunDataContext
 from src.utils.llm import call_llm
+from src.utils.parallel import map_tickers
 from src.utils.progress import progress
+from src.data.models import DataRequirements, FinancialMetricsRequirement, LineItemsRequirement
+
+
+# Line items this agent reads for each ticker
+LINE_ITEMS = [
+    "capital_expenditure",
+    "depreciation_and_amortization",
+    "net_income",
+    "outstanding_shares",
+    "total_assets",
+    "total_liabilities",
+    "shareholders_equity",
+    "dividends_and_other_cash_distributions",
+    "issuance_or_purchase_of_equity_shares",
+    "gross_profit",
+    "revenue",
+    "free_cash_flow",
+]
+
+# Data fetched for each ticker, declared so it can be prefetched before the agent runs
+DATA_REQUIREMENTS = DataRequirements(
+    financial_metrics=[FinancialMetricsRequirement(period="ttm", limit=10)],
+    line_items=[LineItemsRequirement(line_items=LINE_ITEMS, period="ttm", limit=10)],
+    market_cap=True,
+)
 
 
 class WarrenBuffettSignal(BaseModel):
@@ -18,35 +44,22 @@ class WarrenBuffettSignal(BaseModel):
 def warren_buffett_agent(state: AgentState):
     """Analyzes stocks using Buffett's principles and LLM reasoning."""
     data = state["data"]
+    run_data = RunDataContext.from_state(state)
     end_date = data["end_date"]
     tickers = data["tickers"]
 
     # Collect all analysis for LLM reasoning
     analysis_data = {}
-    buffett_analysis = {}
 
-    for ticker in tickers:
+    def analyze_ticker(ticker: str) -> dict:
         progress.update_status("warren_buffett_agent", ticker, "Fetching financial metrics")
         # Fetch required data - request more periods for better trend analysis
-        metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=10)
+        metrics = run_data.get_financial_metrics(ticker, end_date, period="ttm", limit=10)
 
         progress.update_status("warren_buffett_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
+        financial_line_items = run_data.search_line_items(
             ticker,
-            [
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "net_income",
-                "outstanding_shares",
-                "total_assets",
-                "total_liabilities",
-                "shareholders_equity",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares",
-                "gross_profit",
-                "revenue",
-                "free_cash_flow",
-            ],
+            LINE_ITEMS,
             end_date,
             period="ttm",
             limit=10,
@@ -54,7 +67,7 @@ def warren_buffett_agent(state: AgentState):
 
         progress.update_status("warren_buffett_agent", ticker, "Getting market cap")
         # Get current market cap
-        market_cap = get_market_cap(ticker, end_date)
+        market_cap = run_data.get_market_cap(ticker, end_date)
 
         progress.update_status("warren_buffett_agent", ticker, "Analyzing fundamentals")
         # Analyze fundamentals
@@ -126,14 +139,16 @@ def warren_buffett_agent(state: AgentState):
             state=state,
         )
 
+        progress.update_status("warren_buffett_agent", ticker, "Done", analysis=buffett_output.reasoning)
+
         # Store analysis in consistent format with other agents
-        buffett_analysis[ticker] = {
+        return {
             "signal": buffett_output.signal,
             "confidence": buffett_output.confidence,
             "reasoning": buffett_output.reasoning,
         }
 
-        progress.update_status("warren_buffett_agent", ticker, "Done", analysis=buffett_output.reasoning)
+    buffett_analysis = map_tickers(tickers, analyze_ticker)
 
     # Create the message
     message = HumanMessage(content=json.dumps(buffett_analysis), name="warren_buffett_agent")
@@ -142,12 +157,9 @@ def warren_buffett_agent(state: AgentState):
     if state["metadata"]["show_reasoning"]:
         show_agent_reasoning(buffett_analysis, "Warren Buffett Agent")
 
-    # Add the signal to the analyst_signals list
-    state["data"]["analyst_signals"]["warren_buffett_agent"] = buffett_analysis
-
     progress.update_status("warren_buffett_agent", None, "Done")
 
-    return {"messages": [message], "data": state["data"]}
+    return {"messages": [message], "analyst_signals": {"warren_buffett_agent": buffett_analysis}}
 
 
 def analyze_fundamentals(metrics: list) -> dict[str, any]:
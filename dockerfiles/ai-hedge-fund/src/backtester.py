@@ -20,6 +20,7 @@ from src.tools.api import (
     get_financial_metrics,
     get_insider_trades,
 )
+from src.tools.archive import RECORD, REPLAY, ResponseArchive, set_archive
 from src.utils.display import print_backtest_results, format_backtest_row
 from typing_extensions import Callable
 from src.utils.ollama import ensure_ollama_and_model
@@ -272,6 +273,9 @@ class Backtester:
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
 
+        # Page long insider trade and news histories in concurrent sub-ranges of about a quarter each
+        page_windows = max(1, min(8, (end_date_dt - datetime.strptime(self.start_date, "%Y-%m-%d")).days // 90))
+
         for ticker in self.tickers:
             # Fetch price data for the entire period, plus 1 year
             get_prices(ticker, start_date_str, self.end_date)
@@ -280,10 +284,10 @@ class Backtester:
             get_financial_metrics(ticker, self.end_date, limit=10)
 
             # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
+            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000, concurrent_windows=page_windows)
 
             # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000, concurrent_windows=page_windows)
 
         print("Data pre-fetch complete.")
 
@@ -652,9 +656,18 @@ if __name__ == "__main__":
         help="Use all available analysts (overrides --analysts)",
     )
     parser.add_argument("--ollama", action="store_true", help="Use Ollama for local LLM inference")
+    parser.add_argument("--record-archive", type=str, help="Record every financial data API response to this archive file")
+    parser.add_argument("--replay-archive", type=str, help="Serve financial data API responses from this archive file instead of the network")
 
     args = parser.parse_args()
 
+    if args.record_archive and args.replay_archive:
+        parser.error("--record-archive and --replay-archive cannot be used together")
+    if args.record_archive:
+        set_archive(ResponseArchive(args.record_archive, RECORD))
+    elif args.replay_archive:
+        set_archive(ResponseArchive(args.replay_archive, REPLAY))
+
     # Parse tickers from comma-separated string
     tickers = [ticker.strip() for ticker in args.tickers.split(",")] if args.tickers else []
 
@@ -1,69 +1,695 @@
+import asyncio
+import contextlib
+import contextvars
+import datetime
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Iterator
+
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+from src.data.cache_store import CacheStore, store_from_env
+from src.data.models import CompanyFacts, CompanyNews, CompressedNews, FinancialMetrics, InsiderTrade, PriceSeries
+
+# Default time-to-live per dataset, in seconds. None means the entry never expires.
+DEFAULT_TTLS: dict[str, float | None] = {
+    "prices": None,  # Historical prices do not change
+    "live_prices": 15 * 60,  # Price coverage from today onwards, since today's bar is still moving
+    "financial_metrics": 24 * 60 * 60,
+    "line_items": 24 * 60 * 60,
+    "insider_trades": 6 * 60 * 60,  # Also how long coverage from today onwards lasts, since new filings keep arriving
+    "company_news": 60 * 60,  # Likewise for today's news
+    "company_facts": 60 * 60,
+}
+
+# Default in-memory budget per dataset, in bytes. None means the dataset is unbounded.
+DEFAULT_MEMORY_BUDGETS: dict[str, int | None] = {
+    "prices": 128 * 1024 * 1024,
+    "price_coverage": 8 * 1024 * 1024,
+    "financial_metrics": 64 * 1024 * 1024,
+    "line_items": 64 * 1024 * 1024,
+    "insider_trades": 64 * 1024 * 1024,
+    "company_news": 128 * 1024 * 1024,
+    "company_facts": 8 * 1024 * 1024,
+    "insider_trades_coverage": 8 * 1024 * 1024,
+    "company_news_coverage": 8 * 1024 * 1024,
+    "watermarks": 8 * 1024 * 1024,
+}
+
+
+def _model_codec(model: type[BaseModel]) -> tuple:
+    """Store validated models as plain rows, validating them again only when read back from disk."""
+    return to_jsonable_python, lambda key, data: [model.model_validate(row) for row in data]
+
+
+# How datasets that are not stored as JSON-ready lists are (de)serialized for the persistent store
+STORE_CODECS: dict[str, tuple] = {
+    "prices": (lambda series: series.to_columns(), lambda ticker, data: PriceSeries.from_records(ticker, data) if isinstance(data, list) else PriceSeries.from_columns(ticker, data)),
+    "financial_metrics": (to_jsonable_python, lambda key, data: {"limit": data["limit"], "results": [FinancialMetrics.model_validate(row) for row in data["results"]]}),
+    "insider_trades": _model_codec(InsiderTrade),
+    "company_news": _model_codec(CompanyNews),
+    "company_facts": _model_codec(CompanyFacts),
+}
+
+# How datasets are packed while held in memory, to shrink the resident footprint of large text.
+# Unpacking takes an optional (first_day, last_day) range to rebuild only the items dated within it.
+MEMORY_CODECS: dict[str, tuple] = {
+    "company_news": (CompressedNews.from_items, CompressedNews.to_items),
+}
+
+# Fields present on every line item regardless of which line items were requested
+LINE_ITEM_BASE_FIELDS = ("ticker", "report_period", "period", "currency")
+
+# Datasets also cached as one newest-first timeline per ticker, with the field that dates their items
+DATED_FIELDS = {"insider_trades": "filing_date", "company_news": "date"}
+
+# Coverage start for a ticker whose whole history up to some date is cached
+HISTORY_START = datetime.date.min.isoformat()
+
+# How long a fill lock outlives its holder, in seconds, in case the holder dies mid-fetch.
+# A live holder renews the lease every third of it for as long as its fetch takes.
+FILL_LOCK_LEASE = 30.0
+
+# How long a process waits on another one's fill lock before fetching anyway, in seconds.
+# Longer than a fetch that exhausts its retries on capped 429 backoffs.
+FILL_LOCK_WAIT_TIMEOUT = 600.0
+
+# How often a process waiting on another one's fill lock checks whether it is released, in seconds
+FILL_LOCK_POLL_INTERVAL = 0.05
+
+# Items of a long list serialized to estimate the size of the whole list
+SIZE_SAMPLE_ITEMS = 32
+
+# Set while reads should prefer the persistent store, to see entries other processes just wrote
+_read_through: contextvars.ContextVar[bool] = contextvars.ContextVar("cache_read_through", default=False)
+
+
+class MemoryLRU:
+    """
+    Least-recently-used map for one dataset, bounded by the estimated size of its entries.
+
+    Entries carry an optional expiry time; expired entries are dropped when read.
+    A budget of None leaves the map unbounded.
+    """
+
+    def __init__(self, budget: int | None = None):
+        self.budget = budget
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.store_hits = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[any, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> any:
+        """Return the entry for key, marking it as recently used, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            data, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.resident_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def record(self, counter: str):
+        """Increment a lookup counter kept by the cache on top of this map (misses, store_hits)."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def set(self, key: str, data: any, expires_at: float | None = None):
+        """Store an entry, evicting least recently used entries until the budget is met."""
+        size = estimate_size(data)
+        with self._lock:
+            if (previous := self._entries.pop(key, None)) is not None:
+                self.resident_bytes -= previous[1]
+            if self.budget is not None and size > self.budget:
+                # Never worth holding; the persistent store (if any) still has it
+                return
+            self._entries[key] = (data, size, expires_at)
+            self.resident_bytes += size
+            while self.budget is not None and self.resident_bytes > self.budget:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.resident_bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: str):
+        """Drop the entry for key, if any."""
+        with self._lock:
+            if (entry := self._entries.pop(key, None)) is not None:
+                self.resident_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.resident_bytes = 0
+
+    def stats(self) -> dict[str, int | None]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "resident_bytes": self.resident_bytes,
+                "budget_bytes": self.budget,
+            }
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> any:
+        if (data := self.get(key)) is None:
+            raise KeyError(key)
+        return data
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@contextlib.contextmanager
+def _renewing_lease(store: CacheStore, name: str, token: str | None, lease: float) -> Iterator[None]:
+    """Renew a held fill lock from a background thread until the block exits, then release it. A None token (the wait timed out) holds nothing."""
+    if token is None:
+        yield
+        return
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(lease / 3):
+            if not store.renew_fill_lock(name, token, lease):
+                return
+
+    renewer = threading.Thread(target=renew, name="fill-lock-renewer", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+        store.release_fill_lock(name, token)
+
+
+def estimate_size(data: any) -> int:
+    """
+    Approximate the memory held by a cached payload, using its serialized size for plain data.
+
+    Long lists are measured from an evenly spaced sample of their items, so storing a
+    timeline that grew by a few items does not serialize everything it holds again.
+    """
+    if isinstance(data, (PriceSeries, CompressedNews)):
+        return data.nbytes
+    if isinstance(data, dict):
+        return sum(len(key) + estimate_size(value) for key, value in data.items())
+    if isinstance(data, list) and len(data) > SIZE_SAMPLE_ITEMS:
+        sample = data[:: len(data) // SIZE_SAMPLE_ITEMS][:SIZE_SAMPLE_ITEMS]
+        return len(to_json(sample)) * len(data) // len(sample)
+    return len(to_json(data))
+
+
+def memory_budgets_from_env() -> dict[str, int | None]:
+    """
+    Read per-dataset memory budgets from FINANCIAL_DATASETS_CACHE_MEMORY_MB.
+
+    The value is a comma-separated list of dataset=megabytes pairs, e.g.
+    "company_news=256,prices=64"; a value of "none" removes the bound.
+    """
+    budgets = {}
+    for pair in filter(None, os.environ.get("FINANCIAL_DATASETS_CACHE_MEMORY_MB", "").split(",")):
+        dataset, _, megabytes = pair.partition("=")
+        megabytes = megabytes.strip().lower()
+        budgets[dataset.strip()] = None if megabytes == "none" else int(float(megabytes) * 1024 * 1024)
+    return budgets
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """In-memory cache for API responses, optionally backed by a persistent store."""
+
+    def __init__(
+        self,
+        store: CacheStore | None = None,
+        ttls: dict[str, float | None] | None = None,
+        store_from_environment: bool = False,
+        memory_budgets: dict[str, int | None] | None = None,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._memory_budgets = memory_budgets
+
+        self._prices_cache = MemoryLRU()
+        self._financial_metrics_cache = MemoryLRU()
+        self._line_items_cache = MemoryLRU()
+        self._insider_trades_cache = MemoryLRU()
+        self._company_news_cache = MemoryLRU()
+        self._company_facts_cache = MemoryLRU()
+        self._price_coverage_cache = MemoryLRU()
+        self._watermarks_cache = MemoryLRU()
+        self._memories = {
+            "prices": self._prices_cache,
+            "price_coverage": self._price_coverage_cache,
+            "financial_metrics": self._financial_metrics_cache,
+            "line_items": self._line_items_cache,
+            "insider_trades": self._insider_trades_cache,
+            "company_news": self._company_news_cache,
+            "company_facts": self._company_facts_cache,
+            **{f"{dataset}_coverage": MemoryLRU() for dataset in DATED_FIELDS},
+            "watermarks": self._watermarks_cache,
+        }
+        self._budgets_pending = True
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
-        self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
-        self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
-        self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+        self._store = store
+        self._store_pending = store is None and store_from_environment
+        self._resolve_lock = threading.Lock()
+        self._prices_lock = threading.RLock()
+        self._financial_metrics_lock = threading.RLock()
+        self._line_items_lock = threading.RLock()
+        self._dated_lock = threading.RLock()
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
+    def _apply_budgets(self):
+        """Resolve memory budgets on first use, so environment overrides loaded after import apply."""
+        if self._budgets_pending:
+            with self._resolve_lock:
+                if self._budgets_pending:
+                    budgets = {**DEFAULT_MEMORY_BUDGETS, **memory_budgets_from_env(), **(self._memory_budgets or {})}
+                    for dataset, memory in self._memories.items():
+                        memory.budget = budgets.get(dataset)
+                    self._budgets_pending = False
+
+    def _get_store(self) -> CacheStore | None:
+        """Return the persistent store, resolving it from the environment on first use."""
+        if self._store_pending:
+            with self._resolve_lock:
+                if self._store_pending:
+                    self._store = store_from_env()
+                    self._store_pending = False
+        return self._store
+
+    def _merge_data(self, existing: list[BaseModel] | None, new_data: list[BaseModel], key_field: str) -> list[BaseModel]:
         """Merge existing and new data, avoiding duplicates based on a key field."""
         if not existing:
-            return new_data
+            return list(new_data)
 
         # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+        existing_keys = {getattr(item, key_field) for item in existing}
 
         # Only add items that don't exist yet
         merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
+        merged.extend([item for item in new_data if getattr(item, key_field) not in existing_keys])
         return merged
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+    def _get(self, dataset: str, memory: MemoryLRU, key: str, days: tuple[str, str] | None = None) -> any:
+        """
+        Look up a key in memory, falling back to the persistent store (or the other way round inside read_through()).
+
+        For a dated dataset packed in memory, days narrows what is unpacked to the
+        items dated within it; the result may still hold items outside the range.
+        """
+        store = self._get_store()
+        store_first = store is not None and _read_through.get()
+        if not store_first and (data := memory.get(key)) is not None:
+            return MEMORY_CODECS[dataset][1](data, *(days or ())) if dataset in MEMORY_CODECS else data
+
+        entry = store.get_entry(dataset, key) if store is not None else None
+        if entry is None:
+            if store_first and (data := memory.get(key)) is not None:
+                return MEMORY_CODECS[dataset][1](data, *(days or ())) if dataset in MEMORY_CODECS else data
+            memory.record("misses")
+            return None
+
+        memory.record("store_hits")
+        data, expires_at = entry
+        if dataset in STORE_CODECS:
+            data = STORE_CODECS[dataset][1](key, data)
+        # Promote the entry for only as long as the store still holds it
+        self._remember(dataset, memory, key, data, expires_at - time.time() if expires_at is not None else None)
+        return data
+
+    def _set(self, dataset: str, memory: MemoryLRU, key: str, data: any, key_field: str | None, ttl: float | None):
+        """Merge new data into the cache and write it through to the persistent store."""
+        merged = self._merge_data(self._get(dataset, memory, key), data, key_field=key_field) if key_field else data
+        self._remember(dataset, memory, key, merged, ttl)
+        if store := self._get_store():
+            store.set(dataset, key, STORE_CODECS[dataset][0](merged) if dataset in STORE_CODECS else merged, ttl)
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+    def _delete(self, dataset: str, memory: MemoryLRU, key: str):
+        """Drop a key from memory and from the persistent store."""
+        memory.delete(key)
+        if store := self._get_store():
+            store.delete(dataset, key)
 
-    def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
-        """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+    def _remember(self, dataset: str, memory: MemoryLRU, key: str, data: any, ttl: float | None):
+        self._apply_budgets()
+        if dataset in MEMORY_CODECS:
+            data = MEMORY_CODECS[dataset][0](data)
+        memory.set(key, data, time.time() + ttl if ttl is not None else None)
 
-    def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
-        """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+    def _ttl(self, dataset: str, ttl: float | None) -> float | None:
+        return ttl if ttl is not None else self.ttls.get(dataset)
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+    @property
+    def shared(self) -> bool:
+        """Whether entries are shared with other processes through a persistent store."""
+        return self._get_store() is not None
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+    @contextlib.contextmanager
+    def read_through(self) -> Iterator[None]:
+        """Prefer the persistent store over memory for reads in this context, so entries written by other processes are seen."""
+        token = _read_through.set(True)
+        try:
+            yield
+        finally:
+            _read_through.reset(token)
 
-    def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
+    @contextlib.contextmanager
+    def fill_lock(self, name: str, lease: float = FILL_LOCK_LEASE, wait_timeout: float = FILL_LOCK_WAIT_TIMEOUT) -> Iterator[None]:
+        """
+        Hold the fill lock for name, shared with every process using the same store.
+
+        Waits while another process holds it, so only one of them fetches a missing
+        entry, but for no longer than wait_timeout, after which it goes ahead without
+        the lock. The lease is renewed while the lock is held, so a fetch slowed down
+        by retries keeps it. Without a persistent store there is nobody to coordinate
+        with and this does nothing.
+        """
+        store = self._get_store()
+        if store is None:
+            yield
+            return
+        deadline = time.monotonic() + wait_timeout
+        while (token := store.acquire_fill_lock(name, lease)) is None and time.monotonic() < deadline:
+            time.sleep(FILL_LOCK_POLL_INTERVAL)
+        with _renewing_lease(store, name, token, lease):
+            yield
+
+    @contextlib.asynccontextmanager
+    async def fill_lock_async(self, name: str, lease: float = FILL_LOCK_LEASE, wait_timeout: float = FILL_LOCK_WAIT_TIMEOUT) -> AsyncIterator[None]:
+        """Like fill_lock(), but waits without blocking the event loop."""
+        store = self._get_store()
+        if store is None:
+            yield
+            return
+        deadline = time.monotonic() + wait_timeout
+        while (token := store.acquire_fill_lock(name, lease)) is None and time.monotonic() < deadline:
+            await asyncio.sleep(FILL_LOCK_POLL_INTERVAL)
+        with _renewing_lease(store, name, token, lease):
+            yield
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> PriceSeries | None:
+        """Get cached price data for a date range as a view of the ticker's series, or None if any part of the range is not cached."""
+        if self.missing_price_ranges(ticker, start_date, end_date):
+            return None
+        series = self._get("prices", self._prices_cache, ticker)
+        if series is None:
+            # The series was evicted, or never fit in memory, while its coverage was kept
+            with self._prices_lock:
+                self._delete("price_coverage", self._price_coverage_cache, ticker)
+            return None
+        return series.between(start_date, end_date)
+
+    def missing_price_ranges(self, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Get the sub-ranges of [start_date, end_date] that are not covered by cached price data."""
+        coverage = self._get("price_coverage", self._price_coverage_cache, ticker) or []
+        return _missing_ranges(_live_intervals(coverage), start_date, end_date)
+
+    def set_prices(self, ticker: str, data: PriceSeries | list[dict[str, any]], start_date: str, end_date: str):
+        """
+        Merge price data into the ticker's time series and mark [start_date, end_date] as covered.
+
+        Coverage from today onwards only lasts for the live_prices TTL, so the
+        current day's bar is refreshed while historical coverage never expires.
+        """
+        with self._prices_lock:
+            if not isinstance(data, PriceSeries):
+                data = PriceSeries.from_records(ticker, data)
+            # Newer rows replace older ones for the same timestamp
+            existing = self._get("prices", self._prices_cache, ticker)
+            prices = existing.merge(data) if existing is not None else data
+
+            coverage = self._extend_coverage(self._get("price_coverage", self._price_coverage_cache, ticker), start_date, end_date, self.ttls.get("live_prices"))
+
+            self._set("prices", self._prices_cache, ticker, prices, key_field=None, ttl=self.ttls.get("prices"))
+            self._set("price_coverage", self._price_coverage_cache, ticker, coverage, key_field=None, ttl=self.ttls.get("prices"))
+            self._touch_watermark("prices", ticker, str(prices.time[-1])[:10] if len(prices) else None)
+
+    def get_dated(self, dataset: str, ticker: str, start_date: str | None, end_date: str, limit: int) -> list[BaseModel] | None:
+        """
+        Answer an insider trades or company news request from the ticker's cached timeline.
+
+        With a start_date, every cached item in [start_date, end_date] is returned,
+        newest first, if the whole range is covered. Without one, the newest `limit`
+        items up to end_date are returned if the covered range ending there holds
+        that many (or reaches back to the start of the ticker's history). Returns
+        None when the cache cannot answer.
+        """
+        intervals = _live_intervals(self._get(f"{dataset}_coverage", self._memories[f"{dataset}_coverage"], ticker) or [])
+        covering = next(((start, end) for start, end in intervals if start <= end_date <= end), None)
+        if covering is None or (start_date and start_date < covering[0]):
+            return None
+
+        # The day before the covered range holds the oldest items of a full page, which
+        # may be a partial day; the API would answer with the same partial day
+        oldest = _shift_date(covering[0], -1) if covering[0] > HISTORY_START else HISTORY_START
+        items = self._get(dataset, self._memories[dataset], ticker, days=(start_date or oldest, end_date))
+        if items is None:
+            # The timeline was evicted, or never fit in memory, while its coverage was kept
+            with self._dated_lock:
+                self._delete(f"{dataset}_coverage", self._memories[f"{dataset}_coverage"], ticker)
+            return None
+        if start_date:
+            return [item for item in items if start_date <= _item_day(dataset, item) <= end_date]
+
+        candidates = [item for item in items if oldest <= _item_day(dataset, item) <= end_date]
+        if len(candidates) < limit and covering[0] > HISTORY_START:
+            return None
+        return candidates[:limit]
+
+    def missing_dated_ranges(self, dataset: str, ticker: str, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Get the sub-ranges of [start_date, end_date] that the ticker's cached timeline does not cover."""
+        coverage = self._get(f"{dataset}_coverage", self._memories[f"{dataset}_coverage"], ticker) or []
+        return _missing_ranges(_live_intervals(coverage), start_date, end_date)
+
+    def set_dated(self, dataset: str, ticker: str, data: list[BaseModel], start_date: str | None, end_date: str, limit: int):
+        """
+        Merge fetched insider trades or company news into the ticker's timeline and record what they cover.
+
+        A start_date means every item in [start_date, end_date] was fetched. Without
+        one, data is the newest `limit` items up to end_date: a short page covers the
+        ticker's whole history, while a full page only covers the days after its oldest
+        item. Coverage from today onwards expires after the dataset's TTL.
+        """
+        with self._dated_lock:
+            memory = self._memories[dataset]
+            merged = list(dict.fromkeys([*data, *(self._get(dataset, memory, ticker) or [])]))
+            merged.sort(key=lambda item: getattr(item, DATED_FIELDS[dataset]), reverse=True)
+
+            if start_date is None:
+                start_date = HISTORY_START if len(data) < limit else _shift_date(min(_item_day(dataset, item) for item in data), 1)
+            coverage_memory = self._memories[f"{dataset}_coverage"]
+            coverage = self._get(f"{dataset}_coverage", coverage_memory, ticker)
+            if start_date <= end_date:
+                coverage = self._extend_coverage(coverage, start_date, end_date, self.ttls.get(dataset))
+
+            # The timeline outlives any one request; only live coverage expires
+            self._set(dataset, memory, ticker, merged, key_field=None, ttl=None)
+            self._set(f"{dataset}_coverage", coverage_memory, ticker, coverage or [], key_field=None, ttl=None)
+            self._touch_watermark(dataset, ticker, _item_day(dataset, merged[0]) if merged else None)
+
+    def get_watermark(self, dataset: str, ticker: str) -> dict[str, any] | None:
+        """
+        Get how fresh a ticker's cached prices, insider trades or company news are.
+
+        Returns the newest cached item date ("newest"), the last day of the newest
+        covered range ("covered_through") and when the data was last refreshed
+        ("refreshed_at", a Unix timestamp), or None if nothing is cached.
+        """
+        watermark = self._get("watermarks", self._watermarks_cache, f"{dataset}_{ticker}")
+        if watermark is None:
+            return None
+        coverage_dataset = "price_coverage" if dataset == "prices" else f"{dataset}_coverage"
+        intervals = _live_intervals(self._get(coverage_dataset, self._memories[coverage_dataset], ticker) or [])
+        return {**watermark, "covered_through": intervals[-1][1] if intervals else None}
+
+    def _touch_watermark(self, dataset: str, ticker: str, newest: str | None):
+        self._set("watermarks", self._watermarks_cache, f"{dataset}_{ticker}", {"newest": newest, "refreshed_at": time.time()}, key_field=None, ttl=None)
+
+    def _extend_coverage(self, coverage: list[dict[str, any]] | None, start_date: str, end_date: str, live_ttl: float | None) -> list[dict[str, any]]:
+        """
+        Add [start_date, end_date] to a coverage list, dropping expired entries.
+
+        The part before today never expires; the part from today onwards expires
+        after live_ttl. Permanent intervals are collapsed so the list stays short.
+        """
+        today = datetime.date.today().isoformat()
+        now = time.time()
+        coverage = [entry for entry in coverage or [] if entry["expires_at"] is None or entry["expires_at"] > now]
+        if start_date < today:
+            coverage.append({"start": start_date, "end": min(end_date, _shift_date(today, -1)), "expires_at": None})
+        if end_date >= today:
+            coverage.append({"start": max(start_date, today), "end": end_date, "expires_at": now + live_ttl if live_ttl is not None else None})
+
+        permanent = [{"start": start, "end": end, "expires_at": None} for start, end in _merge_intervals([(entry["start"], entry["end"]) for entry in coverage if entry["expires_at"] is None])]
+        return permanent + [entry for entry in coverage if entry["expires_at"] is not None]
+
+    def get_financial_metrics(self, ticker: str, period: str, end_date: str, limit: int) -> list[FinancialMetrics] | None:
+        """
+        Get the newest `limit` cached financial metrics, or None if they are not cached.
+
+        A result cached for a larger limit serves any smaller one, and a result with
+        fewer periods than it was fetched for holds the ticker's whole history, so
+        it serves any limit.
+        """
+        entry = self._get("financial_metrics", self._financial_metrics_cache, f"{ticker}_{period}_{end_date}")
+        if entry is None or (entry["limit"] < limit and len(entry["results"]) >= entry["limit"]):
+            return None
+        return entry["results"][:limit]
+
+    def set_financial_metrics(self, ticker: str, period: str, end_date: str, limit: int, data: list[FinancialMetrics], ttl: float | None = None):
+        """Cache financial metrics fetched for `limit` periods, unless a result for a larger limit is already cached."""
+        cache_key = f"{ticker}_{period}_{end_date}"
+        with self._financial_metrics_lock:
+            entry = self._get("financial_metrics", self._financial_metrics_cache, cache_key)
+            if entry is not None and entry["limit"] >= limit:
+                return
+            self._set("financial_metrics", self._financial_metrics_cache, cache_key, {"limit": limit, "results": list(data)}, key_field=None, ttl=self._ttl("financial_metrics", ttl))
+
+    def get_line_items(self, ticker: str, period: str, end_date: str, line_items: list[str], limit: int) -> list[dict[str, any]] | None:
+        """Get cached line items, or None if any requested field is not cached for `limit` report periods."""
+        entry = self._get("line_items", self._line_items_cache, f"{ticker}_{period}_{end_date}")
+        if entry is None or any(entry["fields"].get(field, 0) < limit for field in line_items):
+            return None
+
+        # Only return the requested columns so results do not depend on what else is cached
+        columns = set(LINE_ITEM_BASE_FIELDS) | set(line_items)
+        return [{name: value for name, value in row.items() if name in columns} for row in entry["results"][:limit]]
+
+    def missing_line_items(self, ticker: str, period: str, end_date: str, line_items: list[str], limit: int) -> list[str]:
+        """Get the requested fields that are not cached for `limit` report periods."""
+        entry = self._get("line_items", self._line_items_cache, f"{ticker}_{period}_{end_date}")
+        fields = entry["fields"] if entry else {}
+        return [field for field in dict.fromkeys(line_items) if fields.get(field, 0) < limit]
+
+    def set_line_items(self, ticker: str, period: str, end_date: str, line_items: list[str], limit: int, data: list[dict[str, any]], ttl: float | None = None):
+        """Merge fetched line item columns into the cached rows for each report period."""
+        cache_key = f"{ticker}_{period}_{end_date}"
+        with self._line_items_lock:
+            entry = self._get("line_items", self._line_items_cache, cache_key) or {"fields": {}, "results": []}
+
+            rows = {row["report_period"]: dict(row) for row in entry["results"]}
+            for item in data:
+                rows.setdefault(item["report_period"], {}).update(item)
+
+            # A field is known for `limit` periods even if the company reported fewer
+            fields = dict(entry["fields"])
+            for field in line_items:
+                fields[field] = max(fields.get(field, 0), limit)
+
+            entry = {"fields": fields, "results": sorted(rows.values(), key=lambda row: row["report_period"], reverse=True)}
+            self._set("line_items", self._line_items_cache, cache_key, entry, key_field=None, ttl=self._ttl("line_items", ttl))
+
+    def get_insider_trades(self, ticker: str) -> list[InsiderTrade] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._get("insider_trades", self._insider_trades_cache, ticker)
 
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
+    def set_insider_trades(self, ticker: str, data: list[InsiderTrade], ttl: float | None = None):
         """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+        self._set("insider_trades", self._insider_trades_cache, ticker, data, key_field="filing_date", ttl=self._ttl("insider_trades", ttl))  # Could also use transaction_date if preferred
 
-    def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
+    def get_company_news(self, ticker: str) -> list[CompanyNews] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._get("company_news", self._company_news_cache, ticker)
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
+    def set_company_news(self, ticker: str, data: list[CompanyNews], ttl: float | None = None):
         """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+        self._set("company_news", self._company_news_cache, ticker, data, key_field="date", ttl=self._ttl("company_news", ttl))
+
+    def get_company_facts(self, ticker: str) -> list[CompanyFacts] | None:
+        """Get cached company facts if available."""
+        return self._get("company_facts", self._company_facts_cache, ticker)
+
+    def set_company_facts(self, ticker: str, data: list[CompanyFacts], ttl: float | None = None):
+        """Replace cached company facts."""
+        self._set("company_facts", self._company_facts_cache, ticker, data, key_field=None, ttl=self._ttl("company_facts", ttl))
+
+    def stats(self) -> dict[str, dict[str, int | None]]:
+        """
+        Get cache counters per dataset, plus a "total" entry.
+
+        Each entry has hits (served from memory), store_hits (served from the
+        persistent store), misses, evictions, entries, resident_bytes and budget_bytes.
+        """
+        self._apply_budgets()
+        stats = {dataset: memory.stats() for dataset, memory in self._memories.items()}
+        budgets = [entry["budget_bytes"] for entry in stats.values()]
+        stats["total"] = {name: sum(entry[name] for entry in stats.values()) for name in ("hits", "store_hits", "misses", "evictions", "entries", "resident_bytes")}
+        stats["total"]["budget_bytes"] = None if None in budgets else sum(budgets)
+        return stats
+
+    def clear(self):
+        """Drop every cached entry, including those in the persistent store."""
+        for memory in self._memories.values():
+            memory.clear()
+        if store := self._get_store():
+            store.clear()
+
+
+def _shift_date(date: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date string by a number of days."""
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=days)).isoformat()
+
+
+def _item_day(dataset: str, item: BaseModel) -> str:
+    """The YYYY-MM-DD day an insider trade was filed or a news item was published."""
+    return getattr(item, DATED_FIELDS[dataset])[:10]
+
+
+def _live_intervals(coverage: list[dict[str, any]]) -> list[tuple[str, str]]:
+    """Merge the unexpired entries of a coverage list into sorted, disjoint intervals."""
+    now = time.time()
+    return _merge_intervals([(entry["start"], entry["end"]) for entry in coverage if entry["expires_at"] is None or entry["expires_at"] > now])
+
+
+def _missing_ranges(intervals: list[tuple[str, str]], start_date: str, end_date: str) -> list[tuple[str, str]]:
+    """Get the sub-ranges of [start_date, end_date] outside sorted, disjoint covered intervals."""
+    if start_date > end_date:
+        return []
+
+    missing = []
+    cursor = start_date
+    for interval_start, interval_end in intervals:
+        if interval_end < cursor:
+            continue
+        if interval_start > end_date:
+            break
+        if interval_start > cursor:
+            missing.append((cursor, _shift_date(interval_start, -1)))
+        cursor = _shift_date(interval_end, 1)
+        if cursor > end_date:
+            return missing
+    missing.append((cursor, end_date))
+    return missing
+
+
+def _merge_intervals(intervals: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """Merge overlapping or adjacent inclusive date intervals."""
+    merged: list[tuple[str, str]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= _shift_date(merged[-1][1], 1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
 
 
-# Global cache instance
-_cache = Cache()
+# Global cache instance, persisted when FINANCIAL_DATASETS_CACHE_PATH is set
+_cache = Cache(store_from_environment=True)
 
 
 def get_cache() -> Cache:
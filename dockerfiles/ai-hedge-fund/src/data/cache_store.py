@@ -0,0 +1,211 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+try:
+    import orjson
+except ImportError:  # Optional: installed with langsmith, but the standard library decoder works too
+    orjson = None
+
+
+def _loads(payload: str) -> any:
+    """Decode a stored payload, with orjson when it is available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by json.dumps, which orjson rejects
+    return json.loads(payload)
+
+
+class CacheStore(ABC):
+    """Interface for persistent backends behind the in-memory Cache."""
+
+    def get(self, dataset: str, key: str) -> list[dict[str, any]] | None:
+        """Return the stored payload, or None if it is missing or expired."""
+        entry = self.get_entry(dataset, key)
+        return entry[0] if entry is not None else None
+
+    @abstractmethod
+    def get_entry(self, dataset: str, key: str) -> tuple[list[dict[str, any]], float | None] | None:
+        """Return the stored payload and when it expires (a Unix timestamp, or None if never), or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, dataset: str, key: str, data: list[dict[str, any]], ttl: float | None = None):
+        """Store a payload. A ttl of None means the entry never expires."""
+
+    @abstractmethod
+    def delete(self, dataset: str, key: str):
+        """Remove a payload if present."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every stored payload."""
+
+    @abstractmethod
+    def acquire_fill_lock(self, name: str, lease: float) -> str | None:
+        """Take the fill lock for name unless another holder has it, returning a token to release it with."""
+
+    @abstractmethod
+    def renew_fill_lock(self, name: str, token: str, lease: float) -> bool:
+        """Extend a held fill lock's lease from now, returning False if it is no longer held with token."""
+
+    @abstractmethod
+    def release_fill_lock(self, name: str, token: str):
+        """Release a fill lock taken with acquire_fill_lock."""
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    SQLite-backed cache store with per-entry expiry and size-bounded eviction.
+
+    Entries are JSON payloads keyed by (dataset, key). When the total payload size
+    exceeds max_bytes, expired entries are dropped first, then the least recently
+    accessed entries until the store is back under its low-water mark.
+
+    The database runs in WAL mode so several processes (e.g. uvicorn workers) can
+    share one file, and fill locks let one of them fetch a missing entry while the
+    others wait for it.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024, low_water_ratio: float = 0.9):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.low_water_ratio = low_water_ratio
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                dataset TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (dataset, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS fill_locks (name TEXT PRIMARY KEY, token TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def get_entry(self, dataset: str, key: str) -> tuple[list[dict[str, any]], float | None] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM cache_entries WHERE dataset = ? AND key = ?",
+                (dataset, key),
+            ).fetchone()
+            if row is None:
+                return None
+
+            payload, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE dataset = ? AND key = ?", (dataset, key))
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE dataset = ? AND key = ?",
+                (now, dataset, key),
+            )
+        return _loads(payload), expires_at
+
+    def set(self, dataset: str, key: str, data: list[dict[str, any]], ttl: float | None = None):
+        now = time.time()
+        payload = json.dumps(data)
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (dataset, key, payload, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset, key, payload, len(payload), expires_at, now),
+            )
+            self._evict(now)
+
+    def delete(self, dataset: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE dataset = ? AND key = ?", (dataset, key))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def total_bytes(self) -> int:
+        """Return the total size of all stored payloads."""
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently accessed ones, until under budget."""
+        if self._total_bytes() <= self.max_bytes:
+            return
+
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+
+        total = self._total_bytes()
+        target = self.max_bytes * self.low_water_ratio
+        if total <= target:
+            return
+
+        rows = self._conn.execute("SELECT dataset, key, size FROM cache_entries ORDER BY accessed_at ASC").fetchall()
+        to_delete = []
+        for dataset, key, size in rows:
+            if total <= target:
+                break
+            to_delete.append((dataset, key))
+            total -= size
+        self._conn.executemany("DELETE FROM cache_entries WHERE dataset = ? AND key = ?", to_delete)
+
+    def acquire_fill_lock(self, name: str, lease: float) -> str | None:
+        """
+        Take the fill lock for name, shared by every process using this file.
+
+        A lock whose lease has run out (e.g. its holder crashed) is taken over.
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM fill_locks WHERE name = ? AND expires_at <= ?", (name, now))
+            cursor = self._conn.execute("INSERT OR IGNORE INTO fill_locks (name, token, expires_at) VALUES (?, ?, ?)", (name, token, now + lease))
+        return token if cursor.rowcount == 1 else None
+
+    def renew_fill_lock(self, name: str, token: str, lease: float) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("UPDATE fill_locks SET expires_at = ? WHERE name = ? AND token = ?", (time.time() + lease, name, token))
+        return cursor.rowcount == 1
+
+    def release_fill_lock(self, name: str, token: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM fill_locks WHERE name = ? AND token = ?", (name, token))
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def store_from_env() -> CacheStore | None:
+    """
+    Build the persistent store configured through the environment.
+
+    FINANCIAL_DATASETS_CACHE_PATH enables the SQLite store at the given file path.
+    FINANCIAL_DATASETS_CACHE_MAX_MB bounds its size (default: 512).
+    """
+    path = os.environ.get("FINANCIAL_DATASETS_CACHE_PATH")
+    if not path:
+        return None
+    max_mb = float(os.environ.get("FINANCIAL_DATASETS_CACHE_MAX_MB", "512"))
+    return SQLiteCacheStore(os.path.expanduser(path), max_bytes=int(max_mb * 1024 * 1024))
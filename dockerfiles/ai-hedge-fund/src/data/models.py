@@ -1,3 +1,9 @@
+import json
+import sys
+import zlib
+
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel
 
 
@@ -15,6 +21,126 @@ class PriceResponse(BaseModel):
     prices: list[Price]
 
 
+class PriceSeries:
+    """
+    Columnar daily price history backed by contiguous, read-only NumPy arrays.
+
+    Times are UTC datetime64[ns] in ascending order. The series still behaves like a
+    sequence of Price for existing callers, but to_df() hands the arrays to pandas
+    without copying and slicing by date returns views.
+    """
+
+    COLUMNS = ("open", "close", "high", "low", "volume")
+
+    def __init__(self, ticker: str, time: np.ndarray, open: np.ndarray, close: np.ndarray, high: np.ndarray, low: np.ndarray, volume: np.ndarray):
+        self.ticker = ticker
+        self.time = time
+        self.open = open
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        for array in (time, open, close, high, low, volume):
+            array.flags.writeable = False
+
+    @classmethod
+    def empty(cls, ticker: str) -> "PriceSeries":
+        return cls(ticker, np.empty(0, dtype="datetime64[ns]"), *(np.empty(0) for _ in range(4)), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_columns(cls, ticker: str, columns: dict[str, list]) -> "PriceSeries":
+        """Build a series from column lists, with times as ISO strings; rows are sorted by time."""
+        if not columns.get("time"):
+            return cls.empty(ticker)
+        time = pd.to_datetime(columns["time"], utc=True).tz_convert(None).to_numpy(dtype="datetime64[ns]")
+        order = np.argsort(time, kind="stable")
+        return cls(
+            ticker,
+            time[order],
+            *(np.asarray(columns[name], dtype=np.float64)[order] for name in ("open", "close", "high", "low")),
+            np.asarray(columns["volume"], dtype=np.int64)[order],
+        )
+
+    @classmethod
+    def from_records(cls, ticker: str, records: list[dict[str, any]]) -> "PriceSeries":
+        """Build a series from price dicts as returned by the API."""
+        return cls.from_columns(ticker, {name: [record[name] for record in records] for name in ("time", *cls.COLUMNS)})
+
+    @classmethod
+    def from_prices(cls, ticker: str, prices: list[Price]) -> "PriceSeries":
+        """Build a series from Price models."""
+        return cls.from_columns(ticker, {name: [getattr(price, name) for price in prices] for name in ("time", *cls.COLUMNS)})
+
+    def to_columns(self) -> dict[str, list]:
+        """Return plain column lists (times as ISO strings), suitable for JSON."""
+        return {
+            "time": np.datetime_as_string(self.time, unit="s", timezone="UTC").tolist(),
+            **{name: getattr(self, name).tolist() for name in self.COLUMNS},
+        }
+
+    def to_df(self) -> pd.DataFrame:
+        """
+        Return a DataFrame indexed by Date whose columns are views of the series arrays.
+
+        The frame is read-only (assigning into it raises) and its index and time
+        column are tz-naive UTC. Use prices_to_df() for a frame callers may modify.
+        """
+        index = pd.DatetimeIndex(self.time, name="Date")
+        return pd.DataFrame({"time": self.time, **{name: getattr(self, name) for name in self.COLUMNS}}, index=index, copy=False)
+
+    def between(self, start_date: str, end_date: str) -> "PriceSeries":
+        """Return the rows whose (UTC) date falls within [start_date, end_date], as views."""
+        start = np.datetime64(start_date, "ns")
+        end = np.datetime64(end_date, "D") + np.timedelta64(1, "D")
+        lo, hi = np.searchsorted(self.time, [start, end.astype("datetime64[ns]")])
+        return self[lo:hi]
+
+    def merge(self, other: "PriceSeries") -> "PriceSeries":
+        """Combine two series; rows in `other` replace rows in this series with the same time."""
+        if not len(other):
+            return self
+        if not len(self):
+            return other
+        time = np.concatenate([self.time, other.time])
+        # Stable sort keeps `other` after `self` for equal times, then the last duplicate wins
+        order = np.argsort(time, kind="stable")
+        time = time[order]
+        keep = np.append(time[1:] != time[:-1], True)
+        columns = (np.concatenate([getattr(self, name), getattr(other, name)])[order][keep] for name in self.COLUMNS)
+        return PriceSeries(self.ticker, time[keep], *columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ("time", *self.COLUMNS))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PriceSeries(self.ticker, *(getattr(self, name)[index] for name in ("time", *self.COLUMNS)))
+        return Price.model_construct(
+            time=str(np.datetime_as_string(self.time[index], unit="s", timezone="UTC")),
+            open=float(self.open[index]),
+            close=float(self.close[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            volume=int(self.volume[index]),
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PriceSeries):
+            return NotImplemented
+        return self.ticker == other.ticker and all(np.array_equal(getattr(self, name), getattr(other, name)) for name in ("time", *self.COLUMNS))
+
+    def __repr__(self) -> str:
+        return f"PriceSeries(ticker={self.ticker!r}, rows={len(self)})"
+
+
 class FinancialMetrics(BaseModel):
     ticker: str
     report_period: str
@@ -60,6 +186,9 @@ class FinancialMetrics(BaseModel):
     book_value_per_share: float | None
     free_cash_flow_per_share: float | None
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class FinancialMetricsResponse(BaseModel):
     financial_metrics: list[FinancialMetrics]
@@ -94,6 +223,9 @@ class InsiderTrade(BaseModel):
     security_title: str | None
     filing_date: str
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class InsiderTradeResponse(BaseModel):
     insider_trades: list[InsiderTrade]
@@ -108,11 +240,65 @@ class CompanyNews(BaseModel):
     url: str
     sentiment: str | None = None
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class CompanyNewsResponse(BaseModel):
     news: list[CompanyNews]
 
 
+class CompressedNews:
+    """
+    Company news packed into one zlib block, for holding many tickers' news in memory.
+
+    Strings that repeat across items (ticker, author, source, sentiment) are interned
+    into shared tables and referenced by index, and the remaining fields are
+    compressed together. Items are only rebuilt when read, without validating them
+    again, since they were validated before being packed.
+    """
+
+    FIELDS = tuple(CompanyNews.model_fields)
+    INTERNED = ("ticker", "author", "source", "sentiment")
+
+    def __init__(self, tables: dict[str, tuple[str | None, ...]], block: bytes, count: int):
+        self.tables = tables
+        self.block = block
+        self.count = count
+
+    @classmethod
+    def from_items(cls, items: list[CompanyNews]) -> "CompressedNews":
+        tables: dict[str, dict[str | None, int]] = {field: {} for field in cls.INTERNED}
+        rows = []
+        for item in items:
+            row = []
+            for field in cls.FIELDS:
+                value = getattr(item, field)
+                row.append(tables[field].setdefault(value, len(tables[field])) if field in tables else value)
+            rows.append(row)
+        block = zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"))
+        return cls({field: tuple(sys.intern(value) if isinstance(value, str) else value for value in table) for field, table in tables.items()}, block, len(items))
+
+    def to_items(self, first_day: str | None = None, last_day: str | None = None) -> list[CompanyNews]:
+        """Rebuild the items, or only those dated within [first_day, last_day] (YYYY-MM-DD) if given."""
+        rows = json.loads(zlib.decompress(self.block))
+        if first_day is not None:
+            date = self.FIELDS.index("date")
+            rows = [row for row in rows if first_day <= row[date][:10] <= last_day]
+        return [CompanyNews.model_construct(**{field: self.tables[field][value] if field in self.tables else value for field, value in zip(self.FIELDS, row)}) for row in rows]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the block and the interned strings."""
+        return len(self.block) + sum(len(value) for table in self.tables.values() for value in table if value is not None)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"CompressedNews(items={self.count}, nbytes={self.nbytes})"
+
+
 class CompanyFacts(BaseModel):
     ticker: str
     name: str
@@ -133,11 +319,91 @@ class CompanyFacts(BaseModel):
     website_url: str | None = None
     weighted_average_shares: int | None = None
 
+    # Cached instances are shared between callers, so they must not be mutated
+    model_config = {"frozen": True}
+
 
 class CompanyFactsResponse(BaseModel):
     company_facts: CompanyFacts
 
 
+class FinancialMetricsRequirement(BaseModel):
+    period: str = "ttm"
+    limit: int = 10
+
+    model_config = {"frozen": True}
+
+
+class LineItemsRequirement(BaseModel):
+    line_items: tuple[str, ...]
+    period: str = "ttm"
+    limit: int = 10
+
+    model_config = {"frozen": True}
+
+
+class DatedRequirement(BaseModel):
+    """Insider trades or company news up to the run's end date."""
+
+    limit: int = 1000
+    lookback_days: int | None = None  # None requests no start date
+
+    model_config = {"frozen": True}
+
+
+class DataRequirements(BaseModel):
+    """The data an analyst fetches for each ticker, declared so it can be fetched ahead of time."""
+
+    financial_metrics: tuple[FinancialMetricsRequirement, ...] = ()
+    line_items: tuple[LineItemsRequirement, ...] = ()
+    market_cap: bool = False
+    insider_trades: tuple[DatedRequirement, ...] = ()
+    company_news: tuple[DatedRequirement, ...] = ()
+    prices: bool = False  # Prices over the run's [start_date, end_date]
+
+    model_config = {"frozen": True}
+
+    @classmethod
+    def union(cls, requirements: list["DataRequirements"]) -> "DataRequirements":
+        """
+        Combine requirements so that fetching the result satisfies each of them.
+
+        Financial metrics and line items are merged per period into one request at
+        the largest limit (for line items, for every field), since their caches serve
+        any smaller request from it. Likewise, insider trades and news requested by
+        limit alone collapse into the largest limit, whose newest items answer the rest.
+        """
+        financial_metrics: dict[str, FinancialMetricsRequirement] = {}
+        for requirement in (item for r in requirements for item in r.financial_metrics):
+            if requirement.period not in financial_metrics or financial_metrics[requirement.period].limit < requirement.limit:
+                financial_metrics[requirement.period] = requirement
+
+        line_items: dict[str, LineItemsRequirement] = {}
+        for requirement in (item for r in requirements for item in r.line_items):
+            merged = line_items.get(requirement.period)
+            if merged is None:
+                line_items[requirement.period] = requirement
+            else:
+                fields = tuple(dict.fromkeys(merged.line_items + requirement.line_items))
+                line_items[requirement.period] = LineItemsRequirement(line_items=fields, period=requirement.period, limit=max(merged.limit, requirement.limit))
+
+        def merge_dated(items: list[DatedRequirement]) -> tuple[DatedRequirement, ...]:
+            windowed = [item for item in items if item.lookback_days is not None]
+            latest = [item for item in items if item.lookback_days is None]
+            if latest:
+                windowed.insert(0, max(latest, key=lambda item: item.limit))
+            return tuple(dict.fromkeys(windowed))
+
+        return cls(
+            financial_metrics=tuple(financial_metrics.values()),
+            line_items=tuple(line_items.values()),
+            market_cap=any(r.market_cap for r in requirements),
+            insider_trades=merge_dated([item for r in requirements for item in r.insider_trades]),
+            company_news=merge_dated([item for r in requirements for item in r.company_news]),
+            prices=any(r.prices for r in requirements),
+        )
+
+
 class Position(BaseModel):
     cash: float = 0.0
     shares: int = 0
@@ -11,10 +11,21 @@ def merge_dicts(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
     return {**a, **b}
 
 
+def merge_analyst_signals(a: dict[str, dict[str, any]], b: dict[str, dict[str, any]]) -> dict[str, dict[str, any]]:
+    """Merge agent -> ticker -> signal updates, so parallel agents never overwrite each other's signals."""
+    merged = dict(a)
+    for agent, signals in b.items():
+        merged[agent] = {**merged.get(agent, {}), **signals}
+    return merged
+
+
 # Define agent state
 class AgentState(TypedDict):
+    # Nodes return only their new messages; the reducer appends them to the history
     messages: Annotated[Sequence[BaseMessage], operator.add]
     data: Annotated[dict[str, any], merge_dicts]
+    # Agents return their own signals instead of mutating shared state
+    analyst_signals: Annotated[dict[str, dict[str, any]], merge_analyst_signals]
     metadata: Annotated[dict[str, any], merge_dicts]
 
 
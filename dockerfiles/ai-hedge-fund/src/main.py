@@ -1,18 +1,22 @@
+import asyncio
+import functools
 import sys
 
 from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from colorama import Fore, Style, init
 import questionary
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
 from src.graph.state import AgentState
 from src.utils.display import print_trading_output
-from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
+from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes, get_data_requirements
 from src.utils.progress import progress
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
 from src.utils.ollama import ensure_ollama_and_model
+from src.tools.run_data import fetch_run_data
 
 import argparse
 from datetime import datetime
@@ -56,12 +60,8 @@ def run_hedge_fund(
     progress.start()
 
     try:
-        # Create a new workflow if analysts are customized
-        if selected_analysts:
-            workflow = create_workflow(selected_analysts)
-            agent = workflow.compile()
-        else:
-            agent = app
+        # Reuse the compiled workflow for this selection of analysts (all of them if none are selected)
+        agent = get_workflow(selected_analysts or None)
 
         final_state = agent.invoke(
             {
@@ -75,19 +75,21 @@ def run_hedge_fund(
                     "portfolio": portfolio,
                     "start_date": start_date,
                     "end_date": end_date,
-                    "analyst_signals": {},
                 },
+                "analyst_signals": {},
                 "metadata": {
                     "show_reasoning": show_reasoning,
                     "model_name": model_name,
                     "model_provider": model_provider,
                 },
             },
+            # Run every selected analyst at once; their signals merge through the analyst_signals reducer
+            config={"max_concurrency": len(selected_analysts or ANALYST_ORDER)},
         )
 
         return {
             "decisions": parse_hedge_fund_response(final_state["messages"][-1].content),
-            "analyst_signals": final_state["data"]["analyst_signals"],
+            "analyst_signals": final_state["analyst_signals"],
         }
     finally:
         # Stop progress tracking
@@ -96,7 +98,22 @@ def run_hedge_fund(
 
 def start(state: AgentState):
     """Initialize the workflow with the input message."""
-    return state
+    # The input message is already in the state, so there are no new messages to add
+    return {"messages": []}
+
+
+def create_data_planning_node(selected_analysts=None):
+    """Create the node that fetches the data the selected analysts declare, once for the whole run."""
+    requirements = get_data_requirements(selected_analysts)
+
+    def plan_data(state: AgentState):
+        data = state["data"]
+        progress.update_status("data_planning", None, "Fetching data")
+        run_data = asyncio.run(fetch_run_data(data["tickers"], data["start_date"], data["end_date"], requirements))
+        progress.update_status("data_planning", None, "Done")
+        return {"data": {"run_data": run_data}}
+
+    return plan_data
 
 
 def create_workflow(selected_analysts=None):
@@ -110,11 +127,16 @@ def create_workflow(selected_analysts=None):
     # Default to all analysts if none selected
     if selected_analysts is None:
         selected_analysts = list(analyst_nodes.keys())
+
+    # Fetch every selected analyst's data up front, before they run
+    workflow.add_node("data_planning", create_data_planning_node(selected_analysts))
+    workflow.add_edge("start_node", "data_planning")
+
     # Add selected analyst nodes
     for analyst_key in selected_analysts:
         node_name, node_func = analyst_nodes[analyst_key]
         workflow.add_node(node_name, node_func)
-        workflow.add_edge("start_node", node_name)
+        workflow.add_edge("data_planning", node_name)
 
     # Always add risk and portfolio management
     workflow.add_node("risk_management_agent", risk_management_agent)
@@ -132,6 +154,31 @@ def create_workflow(selected_analysts=None):
     return workflow
 
 
+# Distinct analyst selections whose compiled workflows are kept
+COMPILED_WORKFLOW_CACHE_SIZE = 32
+
+
+@functools.lru_cache(maxsize=COMPILED_WORKFLOW_CACHE_SIZE)
+def _compile_workflow(selected_analysts: frozenset[str], compile_options: tuple) -> CompiledStateGraph:
+    # Build in ANALYST_ORDER so every ordering of the same selection gives the same graph
+    ordered = [key for _, key in ANALYST_ORDER if key in selected_analysts]
+    return create_workflow(ordered).compile(**dict(compile_options))
+
+
+def get_workflow(selected_analysts=None, **compile_options) -> CompiledStateGraph:
+    """
+    Get the compiled workflow for the selected analysts, compiling it only the first time the selection is seen.
+
+    Workflows are cached by the set of analysts and the compile options, so the CLI,
+    the backtester and the backend share one compiled graph per topology. Compiled
+    graphs keep no per-run state and can be invoked from several threads at once.
+    Compile options must be hashable.
+    """
+    if selected_analysts is None:
+        selected_analysts = get_analyst_nodes().keys()
+    return _compile_workflow(frozenset(selected_analysts), tuple(sorted(compile_options.items())))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the hedge fund trading system")
     parser.add_argument("--initial-cash", type=float, default=100000.0, help="Initial cash position. Defaults to 100000.0)")
@@ -249,9 +296,8 @@ if __name__ == "__main__":
             model_provider = "Unknown"
             print(f"\nSelected model: {Fore.GREEN + Style.BRIGHT}{model_name}{Style.RESET_ALL}\n")
 
-    # Create the workflow with selected analysts
-    workflow = create_workflow(selected_analysts)
-    app = workflow.compile()
+    # Get the compiled workflow for the selected analysts
+    app = get_workflow(selected_analysts)
 
     if args.show_agent_graph:
         file_path = ""
@@ -0,0 +1,116 @@
+"""Fetch the data the analysts need for a ticker universe into the cache before a run."""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from colorama import Fore, Style, init
+from dateutil.relativedelta import relativedelta
+from dotenv import load_dotenv
+
+from src.data.models import DataRequirements
+from src.tools import async_api
+from src.tools.run_data import plan_fetches
+from src.utils.analysts import ANALYST_CONFIG, get_data_requirements
+from src.utils.progress import progress
+
+# Load environment variables from .env file
+load_dotenv()
+
+init(autoreset=True)
+
+
+def read_universe(path: str) -> list[str]:
+    """Read tickers from a file, one or more per line separated by commas or whitespace; '#' starts a comment."""
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            tickers.extend(ticker.strip().upper() for ticker in line.replace(",", " ").split() if ticker.strip())
+    return list(dict.fromkeys(tickers))
+
+
+async def prewarm(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    requirements: DataRequirements,
+    max_concurrency: int = async_api.DEFAULT_MAX_CONCURRENCY,
+    page_windows: int = 1,
+) -> list[tuple[str, str, Exception]]:
+    """
+    Fetch everything the requirements need, at most max_concurrency fetches at a time.
+
+    A failed fetch does not stop the others; the failures are returned as
+    (dataset, ticker, error) tuples.
+    """
+    fetches = plan_fetches(requirements, tickers, start_date, end_date, page_windows)
+    totals: dict[str, int] = {}
+    for dataset, _, _, _ in fetches:
+        totals[dataset] = totals.get(dataset, 0) + 1
+    done = {dataset: 0 for dataset in totals}
+    failures = []
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(dataset: str, ticker: str, fetch: Callable[[], Awaitable]):
+        async with semaphore:
+            progress.update_status(f"prewarm_{dataset}", ticker, f"Fetching ({done[dataset]}/{totals[dataset]})")
+            try:
+                await fetch()
+            except Exception as e:
+                failures.append((dataset, ticker, e))
+            done[dataset] += 1
+            status = "Done" if done[dataset] == totals[dataset] else "Fetching"
+            progress.update_status(f"prewarm_{dataset}", ticker, f"{status} ({done[dataset]}/{totals[dataset]})")
+
+    await asyncio.gather(*(run(dataset, ticker, fetch) for dataset, ticker, _, fetch in fetches))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prewarm the financial data cache for a ticker universe")
+    parser.add_argument("--universe", type=str, required=True, help="File of ticker symbols, separated by newlines, commas or spaces")
+    parser.add_argument("--start-date", type=str, help="Start date (YYYY-MM-DD). Defaults to 3 months before end date")
+    parser.add_argument("--end-date", type=str, help="End date (YYYY-MM-DD). Defaults to today")
+    parser.add_argument("--analysts", type=str, help="Comma-separated analyst keys to prewarm for. Defaults to all analysts")
+    parser.add_argument("--max-concurrency", type=int, default=async_api.DEFAULT_MAX_CONCURRENCY, help=f"Maximum fetches in flight at once. Defaults to {async_api.DEFAULT_MAX_CONCURRENCY}")
+    parser.add_argument("--page-windows", type=int, default=1, help="Date sub-ranges fetched concurrently for paginated insider trades and news. Defaults to 1")
+    parser.add_argument("--cache-path", type=str, help="SQLite cache file. Defaults to FINANCIAL_DATASETS_CACHE_PATH")
+    args = parser.parse_args()
+
+    for date in (args.start_date, args.end_date):
+        if date:
+            try:
+                datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError("Dates must be in YYYY-MM-DD format")
+
+    end_date = args.end_date or datetime.now().strftime("%Y-%m-%d")
+    start_date = args.start_date or (datetime.strptime(end_date, "%Y-%m-%d") - relativedelta(months=3)).strftime("%Y-%m-%d")
+
+    selected_analysts = [key.strip() for key in args.analysts.split(",")] if args.analysts else None
+    if unknown := [key for key in selected_analysts or [] if key not in ANALYST_CONFIG]:
+        parser.error(f"Unknown analysts: {', '.join(unknown)}. Choose from: {', '.join(ANALYST_CONFIG)}")
+
+    # The cache resolves its persistent store on first use, so this still takes effect here
+    if args.cache_path:
+        os.environ["FINANCIAL_DATASETS_CACHE_PATH"] = args.cache_path
+    if not os.environ.get("FINANCIAL_DATASETS_CACHE_PATH"):
+        print(f"{Fore.YELLOW}FINANCIAL_DATASETS_CACHE_PATH is not set; prewarmed data will only last for this process.{Style.RESET_ALL}")
+
+    tickers = read_universe(args.universe)
+    print(f"Prewarming {len(tickers)} tickers from {start_date} to {end_date}...")
+
+    progress.start()
+    try:
+        failures = asyncio.run(prewarm(tickers, start_date, end_date, get_data_requirements(selected_analysts), args.max_concurrency, args.page_windows))
+    finally:
+        progress.stop()
+
+    for dataset, ticker, error in failures:
+        print(f"{Fore.RED}Failed to fetch {dataset} for {ticker}: {error}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN if not failures else Fore.YELLOW}Prewarm complete with {len(failures)} failures.{Style.RESET_ALL}")
+    sys.exit(1 if failures else 0)
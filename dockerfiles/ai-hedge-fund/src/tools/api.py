@@ -1,10 +1,17 @@
 import datetime
+import functools
 import os
 import pandas as pd
 import requests
-import time
-
-from src.data.cache import get_cache
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import BaseModel, TypeAdapter
+from typing import Callable, Generator, TypeVar
+
+from src.data.cache import HISTORY_START, get_cache
+from src.tools.archive import get_archive
+from src.tools.client import get_client, get_rate_limiter
+from src.utils.rate_limiter import backoff_delay
+from src.utils.singleflight import SingleFlight
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
@@ -12,6 +19,7 @@ from src.data.models import (
     FinancialMetricsResponse,
     Price,
     PriceResponse,
+    PriceSeries,
     LineItem,
     LineItemResponse,
     InsiderTrade,
@@ -19,14 +27,62 @@ from src.data.models import (
     CompanyFactsResponse,
 )
 
-# Global cache instance
+# Global cache, HTTP client and rate limiter instances
 _cache = get_cache()
+_client = get_client()
+_rate_limiter = get_rate_limiter()
+
+# Concurrent identical calls (e.g. parallel analysts asking for the same metrics) share one fetch
+_single_flight = SingleFlight()
+
+BASE_URL = "https://api.financialdatasets.ai"
+
+# Maximum number of tickers sent in one line-items search request
+LINE_ITEMS_MAX_TICKERS = 10
+
+# Fewest periods requested per financial metrics fetch. Analysts ask for 5 or 10, so rounding
+# up lets one cached (or in-flight) fetch per ticker and period answer all of them.
+FINANCIAL_METRICS_MIN_FETCH_LIMIT = 10
+
+# Threads that send the requests of a multi-request batch concurrently. Threads are only
+# started when needed, and the connection pool and rate limiter still bound the fan-out.
+_batch_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="financial-data")
+
+
+def _base_url() -> str:
+    """The API root, overridable with FINANCIAL_DATASETS_BASE_URL (e.g. to point at src.tools.local_server)."""
+    return os.environ.get("FINANCIAL_DATASETS_BASE_URL", BASE_URL).rstrip("/")
+
+
+class ApiRequest:
+    """A request to the financial data API, independent of the HTTP client that sends it."""
+
+    def __init__(self, url: str, method: str = "GET", json_data: dict | None = None):
+        self.url = url
+        self.method = method
+        self.json_data = json_data
+        self.headers = {}
+        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
+            self.headers["X-API-KEY"] = api_key
+
+
+# A fetch flow yields batches of requests, receives the matching responses and returns
+# the parsed result. The same flow is driven by the sync functions below and by the
+# asyncio twins in src.tools.async_api, so caching and parsing live in one place.
+Flow = Generator[list[ApiRequest], list[requests.Response], any]
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
 
 
 def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: dict = None, max_retries: int = 3) -> requests.Response:
     """
-    Make an API request with rate limiting handling and moderate backoff.
-    
+    Make an API request through the pooled client, paced by the shared rate limiter.
+
+    A 429 pauses every caller for the server's Retry-After (or X-RateLimit-Reset) when
+    present, falling back to jittered exponential backoff otherwise. When a response
+    archive is configured (see src.tools.archive), responses are recorded to it or
+    replayed from it instead.
+
     Args:
         url: The URL to request
         headers: Headers to include in the request
@@ -36,247 +92,481 @@ def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: d
     
     Returns:
         requests.Response: The response object
-    
-    Raises:
-        Exception: If the request fails with a non-429 error
     """
+    # Replayed responses come from the archive without touching the network or the rate limiter
+    archive = get_archive()
+    if archive is not None and archive.replaying:
+        return archive.replay(method, url, json_data)
+
     for attempt in range(max_retries + 1):  # +1 for initial attempt
+        _rate_limiter.acquire()
         if method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=json_data)
+            response = _client.post(url, headers=headers, json=json_data)
         else:
-            response = requests.get(url, headers=headers)
-        
+            response = _client.get(url, headers=headers)
+
+        advised_wait = _rate_limiter.update_from_headers(response.headers)
+
         if response.status_code == 429 and attempt < max_retries:
-            # Linear backoff: 60s, 90s, 120s, 150s...
-            delay = 60 + (30 * attempt)
-            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay}s before retrying...")
-            time.sleep(delay)
+            delay = advised_wait if advised_wait is not None else backoff_delay(attempt)
+            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay:.1f}s before retrying...")
+            # The next acquire() waits out the pause, holding back every other caller too
+            _rate_limiter.pause(delay)
             continue
-        
+
+        if archive is not None and archive.recording:
+            archive.record(method, url, json_data, response.status_code, response.headers, response.content)
+
         # Return the response (whether success, other errors, or final 429)
         return response
 
 
-def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date}_{end_date}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_prices(cache_key):
-        return [Price(**price) for price in cached_data]
+@functools.cache
+def _type_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(model)
 
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
 
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = _make_api_request(url, headers)
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+def _decode(response: requests.Response, model: type[ResponseModel]) -> ResponseModel:
+    """
+    Validate a response body into a response model.
 
-    # Parse response with Pydantic model
-    price_response = PriceResponse(**response.json())
-    prices = price_response.prices
+    The raw bytes go straight to pydantic-core, which parses and validates them in
+    one pass without building intermediate dicts.
+    """
+    return _type_adapter(model).validate_json(response.content)
 
-    if not prices:
-        return []
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_prices(cache_key, [p.model_dump() for p in prices])
-    return prices
+def _flight_key(dataset: str, **params) -> tuple:
+    """Build a single-flight key from normalized request parameters."""
+    return (dataset, *sorted((name, tuple(sorted(set(value))) if isinstance(value, list) else value) for name, value in params.items()))
 
 
-def get_financial_metrics(
-    ticker: str,
-    end_date: str,
-    period: str = "ttm",
-    limit: int = 10,
-) -> list[FinancialMetrics]:
-    """Fetch financial metrics from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{period}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_financial_metrics(cache_key):
-        return [FinancialMetrics(**metric) for metric in cached_data]
+def _run_flow(flow: Flow):
+    """Drive a fetch flow to completion, sending the requests of each batch concurrently."""
+    try:
+        batch = next(flow)
+        while True:
+            if len(batch) == 1:
+                responses = [_make_api_request(batch[0].url, batch[0].headers, method=batch[0].method, json_data=batch[0].json_data)]
+            else:
+                responses = list(_batch_executor.map(lambda request: _make_api_request(request.url, request.headers, method=request.method, json_data=request.json_data), batch))
+            batch = flow.send(responses)
+    except StopIteration as stop:
+        return stop.value
 
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
 
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = _make_api_request(url, headers)
+def _fill(key: tuple, make_flow: Callable[[], Flow]):
+    """
+    Run a fetch flow, coordinating with other processes that share the persistent cache.
+
+    On a cache miss, the flow is run again under the store's fill lock for key and
+    with store-first reads, so if another process filled the entry meanwhile it is
+    read from the store instead of being fetched twice.
+    """
+    if not _cache.shared:
+        return _run_flow(make_flow())
+
+    flow = make_flow()
+    try:
+        next(flow)
+    except StopIteration as stop:
+        return stop.value
+    flow.close()
+
+    with _cache.fill_lock(repr(key)), _cache.read_through():
+        return _run_flow(make_flow())
+
+
+def _prices_flow(ticker: str, start_date: str, end_date: str) -> Flow:
+    # Serve any range contained in the ticker's cached time series
+    if (cached_data := _cache.get_prices(ticker, start_date, end_date)) is not None:
+        return cached_data
+
+    # If not fully cached, fetch only the missing gaps from the API
+    gaps = _cache.missing_price_ranges(ticker, start_date, end_date)
+    fetched = yield from _fetch_price_gaps(ticker, gaps)
+
+    if (cached_data := _cache.get_prices(ticker, start_date, end_date)) is not None:
+        return cached_data
+    # Only reached if the cache could not hold the series; the gaps are the whole range unless it was evicted mid-flow
+    if gaps != [(start_date, end_date)]:
+        fetched = yield from _fetch_price_gaps(ticker, [(start_date, end_date)])
+    return fetched.between(start_date, end_date)
+
+
+def _fetch_price_gaps(ticker: str, gaps: list[tuple[str, str]]) -> Flow:
+    """Fetch and cache the prices for each gap, returning them merged into one series."""
+    responses = yield [ApiRequest(f"{_base_url()}/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={gap_start}&end_date={gap_end}") for gap_start, gap_end in gaps]
+
+    fetched = PriceSeries.empty(ticker)
+    for (gap_start, gap_end), response in zip(gaps, responses):
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+
+        # Parse response with Pydantic model
+        series = PriceSeries.from_prices(ticker, _decode(response, PriceResponse).prices)
+
+        # Cache the results, recording the gap as covered even if it had no trading days
+        _cache.set_prices(ticker, series, gap_start, gap_end)
+        fetched = fetched.merge(series)
+    return fetched
+
+
+def _financial_metrics_flow(ticker: str, end_date: str, period: str, limit: int) -> Flow:
+    # Any cached result for at least `limit` periods answers the request
+    if (cached_data := _cache.get_financial_metrics(ticker, period, end_date, limit)) is not None:
+        # Cached metrics were validated when fetched and are immutable, so they are shared as-is
+        return list(cached_data)
+
+    # If not in cache, fetch from API
+    [response] = yield [ApiRequest(f"{_base_url()}/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}")]
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
     # Parse response with Pydantic model
-    metrics_response = FinancialMetricsResponse(**response.json())
+    metrics_response = _decode(response, FinancialMetricsResponse)
     financial_metrics = metrics_response.financial_metrics
 
     if not financial_metrics:
         return []
 
-    # Cache the results as dicts using the comprehensive cache key
-    _cache.set_financial_metrics(cache_key, [m.model_dump() for m in financial_metrics])
-    return financial_metrics
-
+    # Cache the validated models; a larger limit replaces a cached smaller one
+    _cache.set_financial_metrics(ticker, period, end_date, limit, financial_metrics)
+    return financial_metrics[:limit]
 
-def search_line_items(
-    ticker: str,
-    line_items: list[str],
-    end_date: str,
-    period: str = "ttm",
-    limit: int = 10,
-) -> list[LineItem]:
-    """Fetch line items from API."""
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
 
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
+def _line_items_flow(ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> Flow:
+    # Answer locally if every requested field is already cached
+    if (cached_data := _cache.get_line_items(ticker, period, end_date, line_items, limit)) is not None:
+        return [LineItem.model_construct(**item) for item in cached_data]
 
+    # Otherwise fetch only the missing columns and merge them into the cached rows
+    missing_line_items = _cache.missing_line_items(ticker, period, end_date, line_items, limit)
     body = {
         "tickers": [ticker],
-        "line_items": line_items,
+        "line_items": missing_line_items,
         "end_date": end_date,
         "period": period,
         "limit": limit,
     }
-    response = _make_api_request(url, headers, method="POST", json_data=body)
+    [response] = yield [ApiRequest(f"{_base_url()}/financials/search/line-items", method="POST", json_data=body)]
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-    data = response.json()
-    response_model = LineItemResponse(**data)
+    response_model = _decode(response, LineItemResponse)
     search_results = response_model.search_results
-    if not search_results:
-        return []
 
     # Cache the results
-    return search_results[:limit]
-
-
-def get_insider_trades(
+    _cache.set_line_items(ticker, period, end_date, missing_line_items, limit, [item.model_dump() for item in search_results[:limit]])
+    cached_data = _cache.get_line_items(ticker, period, end_date, line_items, limit) or []
+    return [LineItem.model_construct(**item) for item in cached_data]
+
+
+def _line_items_batch_flow(tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int) -> Flow:
+    # Only tickers with uncached fields need to be fetched
+    pending = [ticker for ticker in dict.fromkeys(tickers) if _cache.get_line_items(ticker, period, end_date, line_items, limit) is None]
+    if pending:
+        # Fetch the union of missing fields so every pending ticker is complete after one round
+        missing_line_items = list(dict.fromkeys(field for ticker in pending for field in _cache.missing_line_items(ticker, period, end_date, line_items, limit)))
+        chunks = [pending[i : i + LINE_ITEMS_MAX_TICKERS] for i in range(0, len(pending), LINE_ITEMS_MAX_TICKERS)]
+        body = {
+            "line_items": missing_line_items,
+            "end_date": end_date,
+            "period": period,
+        }
+        # Ask for limit periods per ticker; results are trimmed per ticker below
+        responses = yield [ApiRequest(f"{_base_url()}/financials/search/line-items", method="POST", json_data={"tickers": chunk, **body, "limit": limit * len(chunk)}) for chunk in chunks]
+
+        crowded_out = []
+        for chunk, response in zip(chunks, responses):
+            if response.status_code != 200:
+                raise Exception(f"Error fetching data: {', '.join(chunk)} - {response.status_code} - {response.text}")
+            response_model = _decode(response, LineItemResponse)
+
+            # Split the combined search results back out per ticker
+            results_by_ticker = {ticker: [] for ticker in chunk}
+            for item in response_model.search_results:
+                if item.ticker in results_by_ticker:
+                    results_by_ticker[item.ticker].append(item.model_dump())
+
+            # A full response may have hit the limit across tickers, so a ticker short of
+            # `limit` rows in it may have been crowded out rather than have no more periods
+            complete = len(response_model.search_results) < limit * len(chunk)
+            for ticker, results in results_by_ticker.items():
+                if complete or len(results) >= limit:
+                    _cache.set_line_items(ticker, period, end_date, missing_line_items, limit, results[:limit])
+                else:
+                    crowded_out.append(ticker)
+
+        # Fetch those tickers on their own, where the limit is theirs alone
+        if crowded_out:
+            responses = yield [ApiRequest(f"{_base_url()}/financials/search/line-items", method="POST", json_data={"tickers": [ticker], **body, "limit": limit}) for ticker in crowded_out]
+            for ticker, response in zip(crowded_out, responses):
+                if response.status_code != 200:
+                    raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+                search_results = _decode(response, LineItemResponse).search_results
+                _cache.set_line_items(ticker, period, end_date, missing_line_items, limit, [item.model_dump() for item in search_results[:limit]])
+
+    return {ticker: [LineItem.model_construct(**item) for item in _cache.get_line_items(ticker, period, end_date, line_items, limit) or []] for ticker in tickers}
+
+
+def _split_date_range(start_date: str, end_date: str, windows: int) -> list[tuple[str, str]]:
+    """Split [start_date, end_date] into up to `windows` contiguous sub-ranges, newest first."""
+    start = datetime.date.fromisoformat(start_date)
+    days = (datetime.date.fromisoformat(end_date) - start).days + 1
+    windows = max(1, min(windows, days))
+    bounds = [start + datetime.timedelta(days=days * i // windows) for i in range(windows + 1)]
+    return [(bounds[i].isoformat(), (bounds[i + 1] - datetime.timedelta(days=1)).isoformat()) for i in reversed(range(windows))]
+
+
+def _date_paged_flow(
     ticker: str,
     end_date: str,
-    start_date: str | None = None,
-    limit: int = 1000,
-) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_insider_trades(cache_key):
-        return [InsiderTrade(**trade) for trade in cached_data]
+    start_date: str | None,
+    limit: int,
+    concurrent_windows: int,
+    page_url: Callable[[str, str | None], str],
+    parse_page: Callable[[requests.Response], list],
+    item_date: Callable[[any], str],
+) -> Flow:
+    """
+    Fetch every page of a newest-first endpoint filtered by date.
 
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    Each page ends at the oldest date seen on the previous one. With a start_date and
+    concurrent_windows > 1, the window is split into date sub-ranges that are paged
+    independently, so their requests go out in the same batches. Items repeated on a
+    page boundary are dropped.
+    """
+    ranges = _split_date_range(start_date, end_date, concurrent_windows) if start_date and concurrent_windows > 1 else [(start_date, end_date)]
+    pages = [[] for _ in ranges]
+    cursors = {window: window_end for window, (_, window_end) in enumerate(ranges)}
+
+    while cursors:
+        active = list(cursors)
+        responses = yield [ApiRequest(page_url(cursors[window], ranges[window][0])) for window in active]
+        for window, response in zip(active, responses):
+            if response.status_code != 200:
+                raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
 
-    all_trades = []
-    current_end_date = end_date
+            items = parse_page(response)
+            pages[window].extend(items)
+            window_start = ranges[window][0]
 
-    while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-        if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
+            # Only continue pagination if we have a start_date and got a full page
+            if not items or not window_start or len(items) < limit:
+                del cursors[window]
+                continue
 
-        response = _make_api_request(url, headers)
+            # Update the end date to the oldest date from the current page for the next iteration
+            cursors[window] = min(item_date(item) for item in items).split("T")[0]
+
+            # If we've reached or passed the start of the window, we can stop
+            if cursors[window] <= window_start:
+                del cursors[window]
+
+    # Windows are ordered newest first, matching the order of the pages within each window
+    return list(dict.fromkeys(item for page in pages for item in page))
+
+
+def _dated_flow(
+    dataset: str,
+    ticker: str,
+    end_date: str,
+    start_date: str | None,
+    limit: int,
+    concurrent_windows: int,
+    page_url: Callable[[str, str | None], str],
+    parse_page: Callable[[requests.Response], list],
+    item_date: Callable[[any], str],
+) -> Flow:
+    """
+    Fetch insider trades or company news through the ticker's cached timeline.
+
+    Only what the timeline does not cover is requested: the uncovered date ranges
+    when there is a start_date, otherwise a single page of items newer than the
+    latest covered day. A run that moves forward by a day therefore fetches that
+    day's items rather than the whole window again.
+    """
+    if (cached_data := _cache.get_dated(dataset, ticker, start_date, end_date, limit)) is not None:
+        return cached_data
+
+    if start_date:
+        fetched = []
+        gaps = _cache.missing_dated_ranges(dataset, ticker, start_date, end_date)
+        for gap_start, gap_end in gaps:
+            items = yield from _date_paged_flow(ticker, gap_end, gap_start, limit, concurrent_windows, page_url, parse_page, item_date)
+            _cache.set_dated(dataset, ticker, items, gap_start, gap_end, limit)
+            fetched.extend(items)
+    else:
+        # Resume from the day after the covered range that ends closest to end_date, if any
+        gaps = _cache.missing_dated_ranges(dataset, ticker, HISTORY_START, end_date)
+        resume_from = gaps[-1][0] if gaps and gaps[-1][1] == end_date and gaps[-1][0] > HISTORY_START else None
+        [response] = yield [ApiRequest(page_url(end_date, resume_from))]
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        fetched = list(dict.fromkeys(parse_page(response)))
+        # A short page holds everything since resume_from; a full one only the newest items
+        _cache.set_dated(dataset, ticker, fetched, resume_from if len(fetched) < limit else None, end_date, limit)
+
+    if (cached_data := _cache.get_dated(dataset, ticker, start_date, end_date, limit)) is not None:
+        return cached_data
+    # Only reached if the cache could not hold the timeline; what was fetched is the whole answer unless it was evicted mid-flow
+    if start_date and gaps != [(start_date, end_date)]:
+        fetched = yield from _date_paged_flow(ticker, end_date, start_date, limit, concurrent_windows, page_url, parse_page, item_date)
+    elif not start_date and resume_from is not None:
+        [response] = yield [ApiRequest(page_url(end_date, None))]
         if response.status_code != 200:
             raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        fetched = list(dict.fromkeys(parse_page(response)))
+    return fetched if start_date else fetched[:limit]
+
+
+def _insider_trades_flow(ticker: str, end_date: str, start_date: str | None, limit: int, concurrent_windows: int = 1) -> Flow:
+    def page_url(page_end_date: str, page_start_date: str | None) -> str:
+        url = f"{_base_url()}/insider-trades/?ticker={ticker}&filing_date_lte={page_end_date}"
+        if page_start_date:
+            url += f"&filing_date_gte={page_start_date}"
+        return url + f"&limit={limit}"
+
+    return (
+        yield from _dated_flow(
+            "insider_trades",
+            ticker,
+            end_date,
+            start_date,
+            limit,
+            concurrent_windows,
+            page_url,
+            parse_page=lambda response: _decode(response, InsiderTradeResponse).insider_trades,
+            item_date=lambda trade: trade.filing_date,
+        )
+    )
+
+
+def _company_news_flow(ticker: str, end_date: str, start_date: str | None, limit: int, concurrent_windows: int = 1) -> Flow:
+    def page_url(page_end_date: str, page_start_date: str | None) -> str:
+        url = f"{_base_url()}/news/?ticker={ticker}&end_date={page_end_date}"
+        if page_start_date:
+            url += f"&start_date={page_start_date}"
+        return url + f"&limit={limit}"
+
+    return (
+        yield from _dated_flow(
+            "company_news",
+            ticker,
+            end_date,
+            start_date,
+            limit,
+            concurrent_windows,
+            page_url,
+            parse_page=lambda response: _decode(response, CompanyNewsResponse).news,
+            item_date=lambda news: news.date,
+        )
+    )
+
+
+def _market_cap_flow(ticker: str, end_date: str) -> Flow:
+    # Check if end_date is today
+    if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
+        # Company facts change during the day, so the cache only keeps them briefly
+        if cached_data := _cache.get_company_facts(ticker):
+            return cached_data[0].market_cap
 
-        data = response.json()
-        response_model = InsiderTradeResponse(**data)
-        insider_trades = response_model.insider_trades
+        # Get the market cap from company facts API
+        [response] = yield [ApiRequest(f"{_base_url()}/company/facts/?ticker={ticker}")]
+        if response.status_code != 200:
+            print(f"Error fetching company facts: {ticker} - {response.status_code}")
+            return None
 
-        if not insider_trades:
-            break
+        response_model = _decode(response, CompanyFactsResponse)
+        _cache.set_company_facts(ticker, [response_model.company_facts])
+        return response_model.company_facts.market_cap
 
-        all_trades.extend(insider_trades)
+    financial_metrics = yield from _financial_metrics_flow(ticker, end_date, period="ttm", limit=10)
+    if not financial_metrics:
+        return None
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(insider_trades) < limit:
-            break
+    market_cap = financial_metrics[0].market_cap
 
-        # Update end_date to the oldest filing date from current batch for next iteration
-        current_end_date = min(trade.filing_date for trade in insider_trades).split("T")[0]
+    if not market_cap:
+        return None
 
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
+    return market_cap
 
-    if not all_trades:
-        return []
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_insider_trades(cache_key, [trade.model_dump() for trade in all_trades])
-    return all_trades
+def get_prices(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Fetch price data from cache or API, requesting only the date ranges that are not cached yet."""
+    key = _flight_key("prices", ticker=ticker, start_date=start_date, end_date=end_date)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _prices_flow(ticker, start_date, end_date)))
 
 
-def get_company_news(
+def get_financial_metrics(
     ticker: str,
     end_date: str,
-    start_date: str | None = None,
-    limit: int = 1000,
-) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Create a cache key that includes all parameters to ensure exact matches
-    cache_key = f"{ticker}_{start_date or 'none'}_{end_date}_{limit}"
-    
-    # Check cache first - simple exact match
-    if cached_data := _cache.get_company_news(cache_key):
-        return [CompanyNews(**news) for news in cached_data]
-
-    # If not in cache, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    all_news = []
-    current_end_date = end_date
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Fetch financial metrics from cache or API, sharing one fetch between callers asking for different limits."""
+    fetch_limit = max(limit, FINANCIAL_METRICS_MIN_FETCH_LIMIT)
+    key = _flight_key("financial_metrics", ticker=ticker, end_date=end_date, period=period, limit=fetch_limit)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _financial_metrics_flow(ticker, end_date, period, fetch_limit)))[:limit]
 
-    while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
-        if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
 
-        response = _make_api_request(url, headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+def search_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Fetch line items from cache or API, requesting only the fields that are not cached yet."""
+    key = _flight_key("line_items", ticker=ticker, line_items=line_items, end_date=end_date, period=period, limit=limit)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _line_items_flow(ticker, line_items, end_date, period, limit)))
 
-        data = response.json()
-        response_model = CompanyNewsResponse(**data)
-        company_news = response_model.news
 
-        if not company_news:
-            break
+def search_line_items_for_tickers(
+    tickers: list[str],
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers, batching uncached tickers into as few requests as possible."""
+    key = _flight_key("line_items_batch", tickers=tickers, line_items=line_items, end_date=end_date, period=period, limit=limit)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _line_items_batch_flow(tickers, line_items, end_date, period, limit)))
 
-        all_news.extend(company_news)
 
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(company_news) < limit:
-            break
+def get_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    concurrent_windows: int = 1,
+) -> list[InsiderTrade]:
+    """
+    Fetch insider trades from cache or API.
 
-        # Update end_date to the oldest date from current batch for next iteration
-        current_end_date = min(news.date for news in company_news).split("T")[0]
+    With a start_date, concurrent_windows > 1 splits the date range into that many
+    sub-ranges whose pages are fetched concurrently instead of one page at a time.
+    """
+    key = _flight_key("insider_trades", ticker=ticker, end_date=end_date, start_date=start_date, limit=limit)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _insider_trades_flow(ticker, end_date, start_date, limit, concurrent_windows)))
 
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
 
-    if not all_news:
-        return []
+def get_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    concurrent_windows: int = 1,
+) -> list[CompanyNews]:
+    """
+    Fetch company news from cache or API.
 
-    # Cache the results using the comprehensive cache key
-    _cache.set_company_news(cache_key, [news.model_dump() for news in all_news])
-    return all_news
+    With a start_date, concurrent_windows > 1 splits the date range into that many
+    sub-ranges whose pages are fetched concurrently instead of one page at a time.
+    """
+    key = _flight_key("company_news", ticker=ticker, end_date=end_date, start_date=start_date, limit=limit)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _company_news_flow(ticker, end_date, start_date, limit, concurrent_windows)))
 
 
 def get_market_cap(
@@ -284,37 +574,18 @@ def get_market_cap(
     end_date: str,
 ) -> float | None:
     """Fetch market cap from the API."""
-    # Check if end_date is today
-    if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
-        # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
-
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = _make_api_request(url, headers)
-        if response.status_code != 200:
-            print(f"Error fetching company facts: {ticker} - {response.status_code}")
-            return None
-
-        data = response.json()
-        response_model = CompanyFactsResponse(**data)
-        return response_model.company_facts.market_cap
-
-    financial_metrics = get_financial_metrics(ticker, end_date)
-    if not financial_metrics:
-        return None
-
-    market_cap = financial_metrics[0].market_cap
-
-    if not market_cap:
-        return None
-
-    return market_cap
-
-
-def prices_to_df(prices: list[Price]) -> pd.DataFrame:
-    """Convert prices to a DataFrame."""
+    key = _flight_key("market_cap", ticker=ticker, end_date=end_date)
+    return _single_flight.do(key, lambda: _fill(key, lambda: _market_cap_flow(ticker, end_date)))
+
+
+def prices_to_df(prices: PriceSeries | list[Price]) -> pd.DataFrame:
+    """Convert prices to a DataFrame indexed by its UTC Date, which the caller owns and may modify."""
+    if isinstance(prices, PriceSeries):
+        # One copy of the series arrays, already sorted by time, so edits never reach the cache
+        df = prices.to_df().copy()
+        df.index = df.index.tz_localize("UTC")
+        df["time"] = df["time"].dt.tz_localize("UTC")
+        return df
     df = pd.DataFrame([p.model_dump() for p in prices])
     df["Date"] = pd.to_datetime(df["time"])
     df.set_index("Date", inplace=True)
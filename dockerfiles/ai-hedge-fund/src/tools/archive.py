@@ -0,0 +1,157 @@
+"""Record/replay of financial data API responses, for reproducible runs without network access."""
+
+import atexit
+import gzip
+import json
+import os
+import threading
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class ResponseArchive:
+    """
+    Gzipped archive of API responses keyed by method, URL and JSON body.
+
+    In record mode, successful and error responses (but not 429s, which only
+    reflect pacing) are collected in memory and written out by save(), which also
+    runs at interpreter exit. In replay mode, responses are served in the order they
+    were recorded for each request, repeating the last one once they run out, and a
+    request that was never recorded raises instead of reaching the network. The API
+    key is never part of the archive.
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        # Loaded on first use, so an archive being recorded can be replayed once it is saved
+        self._entries: dict[str, list[dict[str, any]]] | None = None
+        self._replayed: dict[str, int] = {}
+        self._dirty = False
+        if mode == RECORD:
+            atexit.register(self.save)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    def _load(self) -> dict[str, list[dict[str, any]]]:
+        """Return the archive entries, reading them from disk on first use. Call with the lock held."""
+        if self._entries is None:
+            if self.replaying or os.path.exists(self.path):
+                with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                    self._entries = json.load(f)["entries"]
+            else:
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def key(method: str, url: str, json_data: dict | None = None) -> str:
+        body = json.dumps(json_data, sort_keys=True, separators=(",", ":")) if json_data is not None else ""
+        return f"{method.upper()} {url} {body}"
+
+    def record(self, method: str, url: str, json_data: dict | None, status_code: int, headers: dict, content: bytes):
+        """Add a response to the archive."""
+        if status_code == 429:
+            return
+        entry = {"status_code": status_code, "content_type": headers.get("Content-Type", "application/json"), "body": content.decode("utf-8")}
+        with self._lock:
+            self._load().setdefault(self.key(method, url, json_data), []).append(entry)
+            self._dirty = True
+
+    def lookup(self, method: str, url: str, json_data: dict | None = None) -> dict[str, any]:
+        """Return the next recorded response for a request."""
+        key = self.key(method, url, json_data)
+        with self._lock:
+            entries = self._load().get(key)
+            if not entries:
+                raise Exception(f"Error fetching data: no recorded response for {method.upper()} {url} in {self.path}")
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            return entries[min(index, len(entries) - 1)]
+
+    def replay(self, method: str, url: str, json_data: dict | None = None) -> requests.Response:
+        """Build a requests.Response from the archive, for the sync API."""
+        entry = self.lookup(method, url, json_data)
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response.headers = CaseInsensitiveDict({"Content-Type": entry["content_type"]})
+        response._content = entry["body"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+    def replay_async(self, method: str, url: str, json_data: dict | None = None) -> httpx.Response:
+        """Build an httpx.Response from the archive, for the asyncio API."""
+        entry = self.lookup(method, url, json_data)
+        return httpx.Response(entry["status_code"], headers={"Content-Type": entry["content_type"]}, content=entry["body"].encode("utf-8"), request=httpx.Request(method.upper(), url))
+
+    def save(self):
+        """Write recorded responses to disk, if anything was recorded since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": self._entries}, f, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+            self._dirty = False
+
+
+def archive_from_env() -> ResponseArchive | None:
+    """Build an archive from FINANCIAL_DATASETS_ARCHIVE_PATH and FINANCIAL_DATASETS_ARCHIVE_MODE, if set."""
+    path = os.environ.get("FINANCIAL_DATASETS_ARCHIVE_PATH")
+    if not path:
+        return None
+    return ResponseArchive(path, os.environ.get("FINANCIAL_DATASETS_ARCHIVE_MODE", REPLAY))
+
+
+class _ArchiveHolder:
+    """Holds the process-wide archive, resolving it from the environment on first use."""
+
+    def __init__(self):
+        self._archive: ResponseArchive | None = None
+        self._pending = True
+        self._lock = threading.Lock()
+
+    def get(self) -> ResponseArchive | None:
+        if self._pending:
+            with self._lock:
+                if self._pending:
+                    self._archive = archive_from_env()
+                    self._pending = False
+        return self._archive
+
+    def set(self, archive: ResponseArchive | None):
+        with self._lock:
+            if self._archive is not None and self._archive.recording:
+                self._archive.save()
+            self._archive = archive
+            self._pending = False
+
+
+_archive = _ArchiveHolder()
+
+
+def get_archive() -> ResponseArchive | None:
+    """Get the archive that API requests are recorded to or replayed from, if any."""
+    return _archive.get()
+
+
+def set_archive(archive: ResponseArchive | None):
+    """Record to or replay from the given archive, or go back to live requests with None."""
+    _archive.set(archive)
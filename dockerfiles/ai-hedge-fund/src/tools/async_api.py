@@ -0,0 +1,211 @@
+"""Asyncio twins of the financial data functions in src.tools.api, plus multi-ticker helpers."""
+
+import asyncio
+from typing import Awaitable, Callable
+
+import httpx
+
+from src.data.models import CompanyNews, FinancialMetrics, InsiderTrade, LineItem, PriceSeries
+from src.tools import api
+from src.tools.api import (
+    FINANCIAL_METRICS_MIN_FETCH_LIMIT,
+    Flow,
+    _company_news_flow,
+    _flight_key,
+    _financial_metrics_flow,
+    _insider_trades_flow,
+    _line_items_batch_flow,
+    _line_items_flow,
+    _market_cap_flow,
+    _prices_flow,
+)
+from src.tools.archive import get_archive
+from src.tools.client import get_async_client, get_rate_limiter
+from src.utils.rate_limiter import backoff_delay
+from src.utils.singleflight import AsyncSingleFlight
+
+# Global asyncio HTTP client and shared rate limiter instances
+_async_client = get_async_client()
+_rate_limiter = get_rate_limiter()
+
+# Concurrent identical calls on the event loop share one fetch
+_single_flight = AsyncSingleFlight()
+
+# Default number of tickers fetched at once by the multi-ticker helpers
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+async def _make_api_request(url: str, headers: dict, method: str = "GET", json_data: dict = None, max_retries: int = 3) -> httpx.Response:
+    """
+    Make an async API request through the pooled client, paced by the shared rate limiter.
+
+    Args:
+        url: The URL to request
+        headers: Headers to include in the request
+        method: HTTP method (GET or POST)
+        json_data: JSON data for POST requests
+        max_retries: Maximum number of retries (default: 3)
+
+    Returns:
+        httpx.Response: The response object
+    """
+    # Replayed responses come from the archive without touching the network or the rate limiter
+    archive = get_archive()
+    if archive is not None and archive.replaying:
+        return archive.replay_async(method, url, json_data)
+
+    for attempt in range(max_retries + 1):  # +1 for initial attempt
+        await _rate_limiter.acquire_async()
+        if method.upper() == "POST":
+            response = await _async_client.post(url, headers=headers, json=json_data)
+        else:
+            response = await _async_client.get(url, headers=headers)
+
+        advised_wait = _rate_limiter.update_from_headers(response.headers)
+
+        if response.status_code == 429 and attempt < max_retries:
+            delay = advised_wait if advised_wait is not None else backoff_delay(attempt)
+            print(f"Rate limited (429). Attempt {attempt + 1}/{max_retries + 1}. Waiting {delay:.1f}s before retrying...")
+            _rate_limiter.pause(delay)
+            continue
+
+        if archive is not None and archive.recording:
+            archive.record(method, url, json_data, response.status_code, response.headers, response.content)
+
+        # Return the response (whether success, other errors, or final 429)
+        return response
+
+
+async def _run_flow(flow: Flow):
+    """Drive a fetch flow to completion, sending each batch of requests concurrently."""
+    try:
+        batch = next(flow)
+        while True:
+            responses = await asyncio.gather(*(_make_api_request(request.url, request.headers, method=request.method, json_data=request.json_data) for request in batch))
+            batch = flow.send(list(responses))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _fill(key: tuple, make_flow: Callable[[], Flow]):
+    """Run a fetch flow, coordinating with other processes that share the persistent cache (see src.tools.api._fill)."""
+    # Looked up on the module so the cache the flows use is the one coordinated
+    if not api._cache.shared:
+        return await _run_flow(make_flow())
+
+    flow = make_flow()
+    try:
+        next(flow)
+    except StopIteration as stop:
+        return stop.value
+    flow.close()
+
+    async with api._cache.fill_lock_async(repr(key)):
+        with api._cache.read_through():
+            return await _run_flow(make_flow())
+
+
+async def get_prices(ticker: str, start_date: str, end_date: str) -> PriceSeries:
+    """Fetch price data from cache or API, requesting only the date ranges that are not cached yet."""
+    key = _flight_key("prices", ticker=ticker, start_date=start_date, end_date=end_date)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _prices_flow(ticker, start_date, end_date)))
+
+
+async def get_financial_metrics(
+    ticker: str,
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[FinancialMetrics]:
+    """Fetch financial metrics from cache or API, sharing one fetch between callers asking for different limits."""
+    fetch_limit = max(limit, FINANCIAL_METRICS_MIN_FETCH_LIMIT)
+    key = _flight_key("financial_metrics", ticker=ticker, end_date=end_date, period=period, limit=fetch_limit)
+    return (await _single_flight.do(key, lambda: _fill(key, lambda: _financial_metrics_flow(ticker, end_date, period, fetch_limit))))[:limit]
+
+
+async def search_line_items(
+    ticker: str,
+    line_items: list[str],
+    end_date: str,
+    period: str = "ttm",
+    limit: int = 10,
+) -> list[LineItem]:
+    """Fetch line items from cache or API, requesting only the fields that are not cached yet."""
+    key = _flight_key("line_items", ticker=ticker, line_items=line_items, end_date=end_date, period=period, limit=limit)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _line_items_flow(ticker, line_items, end_date, period, limit)))
+
+
+async def get_insider_trades(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    concurrent_windows: int = 1,
+) -> list[InsiderTrade]:
+    """Fetch insider trades from cache or API, optionally paging concurrent date sub-ranges."""
+    key = _flight_key("insider_trades", ticker=ticker, end_date=end_date, start_date=start_date, limit=limit)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _insider_trades_flow(ticker, end_date, start_date, limit, concurrent_windows)))
+
+
+async def get_company_news(
+    ticker: str,
+    end_date: str,
+    start_date: str | None = None,
+    limit: int = 1000,
+    concurrent_windows: int = 1,
+) -> list[CompanyNews]:
+    """Fetch company news from cache or API, optionally paging concurrent date sub-ranges."""
+    key = _flight_key("company_news", ticker=ticker, end_date=end_date, start_date=start_date, limit=limit)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _company_news_flow(ticker, end_date, start_date, limit, concurrent_windows)))
+
+
+async def get_market_cap(
+    ticker: str,
+    end_date: str,
+) -> float | None:
+    """Fetch market cap from the API."""
+    key = _flight_key("market_cap", ticker=ticker, end_date=end_date)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _market_cap_flow(ticker, end_date)))
+
+
+async def gather_by_ticker(tickers: list[str], fetch: Callable[[str], Awaitable], max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, any]:
+    """Run fetch(ticker) for every ticker concurrently, at most max_concurrency at a time."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_one(ticker: str):
+        async with semaphore:
+            return await fetch(ticker)
+
+    results = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+    return dict(zip(tickers, results))
+
+
+async def get_prices_for_tickers(tickers: list[str], start_date: str, end_date: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, PriceSeries]:
+    """Fetch price data for many tickers concurrently."""
+    return await gather_by_ticker(tickers, lambda ticker: get_prices(ticker, start_date, end_date), max_concurrency)
+
+
+async def get_financial_metrics_for_tickers(tickers: list[str], end_date: str, period: str = "ttm", limit: int = 10, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, list[FinancialMetrics]]:
+    """Fetch financial metrics for many tickers concurrently."""
+    return await gather_by_ticker(tickers, lambda ticker: get_financial_metrics(ticker, end_date, period, limit), max_concurrency)
+
+
+async def search_line_items_for_tickers(tickers: list[str], line_items: list[str], end_date: str, period: str = "ttm", limit: int = 10) -> dict[str, list[LineItem]]:
+    """Fetch line items for many tickers, sending the batched requests concurrently."""
+    key = _flight_key("line_items_batch", tickers=tickers, line_items=line_items, end_date=end_date, period=period, limit=limit)
+    return await _single_flight.do(key, lambda: _fill(key, lambda: _line_items_batch_flow(tickers, line_items, end_date, period, limit)))
+
+
+async def get_insider_trades_for_tickers(tickers: list[str], end_date: str, start_date: str | None = None, limit: int = 1000, concurrent_windows: int = 1, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, list[InsiderTrade]]:
+    """Fetch insider trades for many tickers concurrently."""
+    return await gather_by_ticker(tickers, lambda ticker: get_insider_trades(ticker, end_date, start_date, limit, concurrent_windows), max_concurrency)
+
+
+async def get_company_news_for_tickers(tickers: list[str], end_date: str, start_date: str | None = None, limit: int = 1000, concurrent_windows: int = 1, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, list[CompanyNews]]:
+    """Fetch company news for many tickers concurrently."""
+    return await gather_by_ticker(tickers, lambda ticker: get_company_news(ticker, end_date, start_date, limit, concurrent_windows), max_concurrency)
+
+
+async def get_market_cap_for_tickers(tickers: list[str], end_date: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> dict[str, float | None]:
+    """Fetch market caps for many tickers concurrently."""
+    return await gather_by_ticker(tickers, lambda ticker: get_market_cap(ticker, end_date), max_concurrency)
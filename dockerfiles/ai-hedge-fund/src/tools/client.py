@@ -0,0 +1,137 @@
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+
+class _ClientSettings:
+    """Connection pool and timeout settings, read from the environment unless given explicitly."""
+
+    def __init__(self, pool_size: int | None = None, connect_timeout: float | None = None, read_timeout: float | None = None):
+        self._pool_size = pool_size
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool_size or int(os.environ.get("FINANCIAL_DATASETS_POOL_SIZE", "32"))
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """(connect, read) timeouts in seconds."""
+        connect_timeout = self._connect_timeout or float(os.environ.get("FINANCIAL_DATASETS_CONNECT_TIMEOUT", "5"))
+        read_timeout = self._read_timeout or float(os.environ.get("FINANCIAL_DATASETS_READ_TIMEOUT", "60"))
+        return connect_timeout, read_timeout
+
+
+class FinancialDatasetsClient(_ClientSettings):
+    """
+    HTTP client for api.financialdatasets.ai that reuses pooled keep-alive connections.
+
+    All requests share one requests.Session, so concurrent agents reuse TCP/TLS
+    connections instead of opening a new one per call. The pool blocks when every
+    connection is busy rather than opening throwaway connections.
+    """
+
+    def __init__(self, pool_size: int | None = None, connect_timeout: float | None = None, read_timeout: float | None = None):
+        super().__init__(pool_size, connect_timeout, read_timeout)
+        self._session: requests.Session | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """The shared session, created on first use so environment settings are picked up."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, pool_block=True)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["Connection"] = "keep-alive"
+                    self._session = session
+        return self._session
+
+    def get(self, url: str, headers: dict | None = None) -> requests.Response:
+        """Send a GET request through the pooled session."""
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def post(self, url: str, headers: dict | None = None, json: dict | None = None) -> requests.Response:
+        """Send a POST request through the pooled session."""
+        return self.session.post(url, headers=headers, json=json, timeout=self.timeout)
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class AsyncFinancialDatasetsClient(_ClientSettings):
+    """
+    Asyncio counterpart of FinancialDatasetsClient built on a pooled httpx.AsyncClient.
+
+    httpx connection pools are bound to the event loop that created them, so one
+    AsyncClient is kept per running loop.
+    """
+
+    def __init__(self, pool_size: int | None = None, connect_timeout: float | None = None, read_timeout: float | None = None):
+        super().__init__(pool_size, connect_timeout, read_timeout)
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            connect_timeout, read_timeout = self.timeout
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                # pool=None waits for a free connection instead of failing under fan-out
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=None),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def get(self, url: str, headers: dict | None = None) -> httpx.Response:
+        """Send a GET request through the pooled AsyncClient."""
+        return await self.http_client.get(url, headers=headers)
+
+    async def post(self, url: str, headers: dict | None = None, json: dict | None = None) -> httpx.Response:
+        """Send a POST request through the pooled AsyncClient."""
+        return await self.http_client.post(url, headers=headers, json=json)
+
+    async def aclose(self):
+        """Close the AsyncClient for the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# Global client instances, sharing one rate limiter across threads and event loops
+_client = FinancialDatasetsClient()
+_async_client = AsyncFinancialDatasetsClient()
+_rate_limiter = TokenBucketRateLimiter()
+
+
+def get_client() -> FinancialDatasetsClient:
+    """Get the global financial data client."""
+    return _client
+
+
+def get_async_client() -> AsyncFinancialDatasetsClient:
+    """Get the global asyncio financial data client."""
+    return _async_client
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the process-wide rate limiter for the financial data API."""
+    return _rate_limiter
@@ -0,0 +1,397 @@
+"""
+Local stand-in for the financialdatasets.ai endpoints, for load-testing the data layer.
+
+Serves /prices/, /financial-metrics/, /financials/search/line-items, /insider-trades/,
+/news/ and /company/facts/ from deterministic synthetic data, or from a response
+archive recorded with src.tools.archive, with configurable latency, page sizes and
+429 injection. Point the API functions at it with FINANCIAL_DATASETS_BASE_URL:
+
+    poetry run python -m src.tools.local_server --port 8750 --latency 0.05 --throttle-probability 0.1
+    FINANCIAL_DATASETS_BASE_URL=http://127.0.0.1:8750 poetry run python src/backtester.py --ticker AAPL,MSFT
+"""
+
+import argparse
+import datetime
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.data.models import FinancialMetrics
+from src.tools.api import BASE_URL
+from src.tools.archive import REPLAY, ResponseArchive
+
+# Days of history generated for dated endpoints queried without a start date
+DEFAULT_LOOKBACK_DAYS = 3 * 365
+
+NEWS_SOURCES = ("Reuters", "Bloomberg", "The Wall Street Journal", "Financial Times", "CNBC")
+NEWS_SENTIMENTS = ("positive", "neutral", "negative")
+INSIDER_TITLES = ("Chief Executive Officer", "Chief Financial Officer", "Director", "General Counsel", "Chief Operating Officer")
+
+
+def _rng(*parts) -> random.Random:
+    """A random generator seeded by its parts, so the same request always gets the same data."""
+    return random.Random(zlib.crc32("|".join(str(part) for part in parts).encode()))
+
+
+def _dates_desc(end_date: str, start_date: str | None):
+    """Calendar dates from end_date back to start_date (or the default lookback), newest first."""
+    day = datetime.date.fromisoformat(end_date)
+    first = datetime.date.fromisoformat(start_date) if start_date else day - datetime.timedelta(days=DEFAULT_LOOKBACK_DAYS)
+    while day >= first:
+        yield day
+        day -= datetime.timedelta(days=1)
+
+
+def _report_periods(end_date: str, period: str, limit: int) -> list[str]:
+    """Fiscal period ends on or before end_date, newest first."""
+    end = datetime.date.fromisoformat(end_date)
+    year, quarter = end.year, (end.month - 1) // 3 + 1
+    periods = []
+    while len(periods) < limit:
+        if period == "annual":
+            period_end = datetime.date(year, 12, 31)
+            year -= 1
+        else:
+            period_end = datetime.date(year + quarter // 4, 3 * quarter % 12 + 1, 1) - datetime.timedelta(days=1)
+            year, quarter = (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+        if period_end <= end:
+            periods.append(period_end.isoformat())
+    return periods
+
+
+def synthetic_prices(ticker: str, start_date: str, end_date: str) -> list[dict]:
+    """Daily bars for business days in the range; a given day's bar does not depend on the range asked for."""
+    base = 20 + zlib.crc32(ticker.encode()) % 480
+    prices = []
+    for day in reversed(list(_dates_desc(end_date, start_date))):
+        if day.weekday() >= 5:
+            continue
+        rng = _rng(ticker, day)
+        close = base * (1 + 0.2 * ((day.toordinal() % 97) / 97 - 0.5)) * rng.uniform(0.98, 1.02)
+        open_ = close * rng.uniform(0.98, 1.02)
+        prices.append(
+            {
+                "time": f"{day.isoformat()}T04:00:00Z",
+                "open": round(open_, 2),
+                "close": round(close, 2),
+                "high": round(max(open_, close) * rng.uniform(1.0, 1.02), 2),
+                "low": round(min(open_, close) * rng.uniform(0.98, 1.0), 2),
+                "volume": rng.randint(100_000, 50_000_000),
+            }
+        )
+    return prices
+
+
+def synthetic_financial_metrics(ticker: str, end_date: str, period: str, limit: int) -> list[dict]:
+    """Financial metrics with a plausible value for every field, one per report period."""
+    metrics = []
+    for report_period in _report_periods(end_date, period, limit):
+        rng = _rng(ticker, period, report_period)
+        values = {field: round(rng.uniform(-0.2, 2.0), 4) for field in FinancialMetrics.model_fields}
+        values.update(
+            ticker=ticker,
+            report_period=report_period,
+            period=period,
+            currency="USD",
+            market_cap=float(rng.randint(1, 3000)) * 1e9,
+            enterprise_value=float(rng.randint(1, 3000)) * 1e9,
+            price_to_earnings_ratio=round(rng.uniform(5, 60), 2),
+        )
+        metrics.append(values)
+    return metrics
+
+
+def synthetic_line_items(tickers: list[str], line_items: list[str], end_date: str, period: str, limit: int) -> list[dict]:
+    """Search results for the requested fields, newest report period first across all tickers, capped at limit."""
+    results = []
+    for ticker in tickers:
+        for report_period in _report_periods(end_date, period, limit):
+            rng = _rng(ticker, period, report_period, "line_items")
+            fields = {field: round(rng.uniform(1e6, 1e11), 2) for field in line_items}
+            results.append({"ticker": ticker, "report_period": report_period, "period": period, "currency": "USD", **fields})
+    results.sort(key=lambda item: item["report_period"], reverse=True)
+    return results[:limit]
+
+
+def synthetic_insider_trades(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[dict]:
+    """Insider trades filed on about one day in three, newest first."""
+    trades = []
+    for day in _dates_desc(end_date, start_date):
+        rng = _rng(ticker, day, "insider_trades")
+        if rng.random() >= 1 / 3:
+            continue
+        shares = float(rng.randint(-50_000, 50_000) or 1)
+        price = round(rng.uniform(10, 500), 2)
+        owned_before = float(rng.randint(100_000, 5_000_000))
+        trades.append(
+            {
+                "ticker": ticker,
+                "issuer": f"{ticker} Inc.",
+                "name": f"Insider {rng.randint(1, 20)}",
+                "title": rng.choice(INSIDER_TITLES),
+                "is_board_director": rng.random() < 0.3,
+                "transaction_date": (day - datetime.timedelta(days=2)).isoformat(),
+                "transaction_shares": shares,
+                "transaction_price_per_share": price,
+                "transaction_value": round(shares * price, 2),
+                "shares_owned_before_transaction": owned_before,
+                "shares_owned_after_transaction": owned_before + shares,
+                "security_title": "Common Stock",
+                "filing_date": day.isoformat(),
+            }
+        )
+        if len(trades) >= limit:
+            break
+    return trades
+
+
+def synthetic_news(ticker: str, end_date: str, start_date: str | None, limit: int) -> list[dict]:
+    """Up to two articles a day, newest first."""
+    news = []
+    for day in _dates_desc(end_date, start_date):
+        rng = _rng(ticker, day, "news")
+        articles = []
+        for index in range(rng.randint(0, 2)):
+            articles.append(
+                {
+                    "ticker": ticker,
+                    "title": f"{ticker} headline {day.isoformat()} #{index}",
+                    "author": f"Reporter {rng.randint(1, 50)}",
+                    "source": rng.choice(NEWS_SOURCES),
+                    "date": f"{day.isoformat()}T{12 + index:02d}:00:00Z",
+                    "url": f"https://news.example.com/{ticker.lower()}/{day.isoformat()}/{index}",
+                    "sentiment": rng.choice(NEWS_SENTIMENTS),
+                }
+            )
+        news.extend(reversed(articles))
+        if len(news) >= limit:
+            break
+    return news[:limit]
+
+
+def synthetic_company_facts(ticker: str) -> dict:
+    rng = _rng(ticker, "company_facts")
+    return {
+        "ticker": ticker,
+        "name": f"{ticker} Inc.",
+        "industry": "Software",
+        "sector": "Technology",
+        "exchange": "NASDAQ",
+        "is_active": True,
+        "market_cap": float(rng.randint(1, 3000)) * 1e9,
+        "number_of_employees": rng.randint(100, 200_000),
+        "weighted_average_shares": rng.randint(10_000_000, 20_000_000_000),
+    }
+
+
+class LocalFinancialDatasetsServer:
+    """
+    Threaded HTTP server emulating the financialdatasets.ai endpoints the data layer uses.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+        latency: Seconds added to every response
+        page_size: Most items returned per insider trades or news page, whatever limit is asked for
+        throttle_every: Answer every Nth request with a 429 (0 disables)
+        throttle_probability: Chance of answering any request with a 429
+        retry_after: Retry-After seconds sent with injected 429s
+        archive: Serve recorded responses from this archive instead of synthetic data
+        seed: Seed for the 429 injection, so throttled runs can be repeated
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        page_size: int | None = None,
+        throttle_every: int = 0,
+        throttle_probability: float = 0.0,
+        retry_after: float = 1.0,
+        archive: ResponseArchive | None = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.page_size = page_size
+        self.throttle_every = throttle_every
+        self.throttle_probability = throttle_probability
+        self.retry_after = retry_after
+        self.archive = archive
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._throttled = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._requests_by_path: dict[str, int] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "LocalFinancialDatasetsServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="local-financial-datasets", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve requests on the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "LocalFinancialDatasetsServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> dict[str, any]:
+        """Request counts, injected 429s and the peak number of requests handled at once."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "throttled": self._throttled,
+                "max_concurrent": self._max_in_flight,
+                "by_path": dict(self._requests_by_path),
+            }
+
+    def _should_throttle(self) -> bool:
+        """Decide whether to answer the current request with a 429. Call with the lock held."""
+        if self.throttle_every and self._requests % self.throttle_every == 0:
+            return True
+        return self.throttle_probability > 0 and self._random.random() < self.throttle_probability
+
+    def _respond(self, method: str, path: str, query: str, body: dict | None) -> tuple[int, dict]:
+        """Answer a request with a status code and JSON body."""
+        if self.archive is not None:
+            # Archived requests were recorded against the real API
+            entry = self.archive.lookup(method, f"{BASE_URL}{path}?{query}" if query else f"{BASE_URL}{path}", body)
+            return entry["status_code"], json.loads(entry["body"])
+
+        params = {name: values[0] for name, values in parse_qs(query).items()}
+        page_size = self.page_size or 1_000_000
+        if path == "/prices/":
+            return 200, {"ticker": params["ticker"], "prices": synthetic_prices(params["ticker"], params["start_date"], params["end_date"])}
+        if path == "/financial-metrics/":
+            metrics = synthetic_financial_metrics(params["ticker"], params["report_period_lte"], params.get("period", "ttm"), int(params.get("limit", 10)))
+            return 200, {"financial_metrics": metrics}
+        if path == "/financials/search/line-items" and method == "POST":
+            return 200, {"search_results": synthetic_line_items(body["tickers"], body["line_items"], body["end_date"], body.get("period", "ttm"), int(body.get("limit", 10)))}
+        if path == "/insider-trades/":
+            limit = min(int(params.get("limit", 1000)), page_size)
+            return 200, {"insider_trades": synthetic_insider_trades(params["ticker"], params["filing_date_lte"], params.get("filing_date_gte"), limit)}
+        if path == "/news/":
+            limit = min(int(params.get("limit", 1000)), page_size)
+            return 200, {"news": synthetic_news(params["ticker"], params["end_date"], params.get("start_date"), limit)}
+        if path == "/company/facts/":
+            return 200, {"company_facts": synthetic_company_facts(params["ticker"])}
+        return 404, {"error": f"Unknown endpoint: {method} {path}"}
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            url = urlparse(handler.path)
+            self._requests_by_path[url.path] = self._requests_by_path.get(url.path, 0) + 1
+            throttled = self._should_throttle()
+            if throttled:
+                self._throttled += 1
+
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+
+            # Always drain the body so a kept-alive connection stays in sync
+            length = int(handler.headers.get("Content-Length") or 0)
+            raw_body = handler.rfile.read(length) if length else b""
+
+            headers = {}
+            if throttled:
+                status_code, payload = 429, {"error": "Too many requests"}
+                headers["Retry-After"] = f"{self.retry_after:g}"
+            else:
+                body = json.loads(raw_body) if raw_body else None
+                try:
+                    status_code, payload = self._respond(method, url.path, url.query, body)
+                except (KeyError, ValueError) as e:
+                    status_code, payload = 400, {"error": f"Bad request: {e}"}
+                except Exception as e:
+                    # An unrecorded request in archive mode
+                    status_code, payload = 404, {"error": str(e)}
+
+            content = json.dumps(payload).encode("utf-8")
+            handler.send_response(status_code)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.end_headers()
+            handler.wfile.write(content)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, "GET")
+
+            def do_POST(self):
+                server._handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the financialdatasets.ai API")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to listen on. Defaults to 127.0.0.1")
+    parser.add_argument("--port", type=int, default=8750, help="Port to listen on. Defaults to 8750")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response. Defaults to 0")
+    parser.add_argument("--page-size", type=int, help="Most items per insider trades or news page. Defaults to the requested limit")
+    parser.add_argument("--throttle-every", type=int, default=0, help="Answer every Nth request with a 429. Defaults to never")
+    parser.add_argument("--throttle-probability", type=float, default=0.0, help="Chance of answering a request with a 429. Defaults to 0")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s. Defaults to 1")
+    parser.add_argument("--archive", type=str, help="Serve responses recorded with --record-archive instead of synthetic data")
+    args = parser.parse_args()
+
+    server = LocalFinancialDatasetsServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        page_size=args.page_size,
+        throttle_every=args.throttle_every,
+        throttle_probability=args.throttle_probability,
+        retry_after=args.retry_after,
+        archive=ResponseArchive(args.archive, REPLAY) if args.archive else None,
+    )
+    print(f"Serving on {server.base_url}; set FINANCIAL_DATASETS_BASE_URL={server.base_url} to use it.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
@@ -0,0 +1,182 @@
+"""Data for one run of the hedge fund, fetched up front for every selected analyst and shared with the agents."""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Awaitable, Callable
+
+import pandas as pd
+
+from src.data.cache import LINE_ITEM_BASE_FIELDS
+from src.data.models import CompanyNews, DataRequirements, DatedRequirement, FinancialMetrics, InsiderTrade, LineItem, PriceSeries
+from src.tools import api, async_api
+from src.tools.client import get_async_client
+
+
+def _dated_start(requirement: DatedRequirement, end_date: str) -> str | None:
+    if requirement.lookback_days is None:
+        return None
+    return (datetime.fromisoformat(end_date) - timedelta(days=requirement.lookback_days)).date().isoformat()
+
+
+def plan_fetches(requirements: DataRequirements, tickers: list[str], start_date: str, end_date: str, page_windows: int = 1) -> list[tuple[str, str, any, Callable[[], Awaitable]]]:
+    """
+    Build the fetches that satisfy the requirements for every ticker.
+
+    Returns (dataset, ticker, requirement, fetch) tuples, where requirement is None
+    for prices and market cap; line items are fetched for the whole universe at once
+    through the batched search, so their ticker is "*".
+    """
+    fetches = []
+    for requirement in requirements.line_items:
+        fetches.append(("line_items", "*", requirement, lambda r=requirement: async_api.search_line_items_for_tickers(tickers, list(r.line_items), end_date, r.period, r.limit)))
+
+    for ticker in tickers:
+        if requirements.prices:
+            fetches.append(("prices", ticker, None, lambda t=ticker: async_api.get_prices(t, start_date, end_date)))
+        for requirement in requirements.financial_metrics:
+            fetches.append(("financial_metrics", ticker, requirement, lambda t=ticker, r=requirement: async_api.get_financial_metrics(t, end_date, r.period, r.limit)))
+        if requirements.market_cap:
+            fetches.append(("market_cap", ticker, None, lambda t=ticker: async_api.get_market_cap(t, end_date)))
+        for requirement in requirements.insider_trades:
+            fetches.append(("insider_trades", ticker, requirement, lambda t=ticker, r=requirement: async_api.get_insider_trades(t, end_date, _dated_start(r, end_date), r.limit, page_windows)))
+        for requirement in requirements.company_news:
+            fetches.append(("company_news", ticker, requirement, lambda t=ticker, r=requirement: async_api.get_company_news(t, end_date, _dated_start(r, end_date), r.limit, page_windows)))
+    return fetches
+
+
+class RunDataContext:
+    """
+    Read-only data fetched once for a run, answering the agents' data requests from memory.
+
+    The accessors take the same arguments as the functions in src.tools.api and
+    return what they would: results are sliced to the requested limit, date range
+    or line item fields. A request the context was not built for (another end date,
+    a larger limit, a ticker or field nobody declared) falls through to src.tools.api,
+    so an empty context behaves exactly like calling the API functions directly.
+    """
+
+    def __init__(
+        self,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        prices: dict[str, PriceSeries] | None = None,
+        financial_metrics: dict[tuple[str, str], tuple[int, list[FinancialMetrics]]] | None = None,
+        line_items: dict[tuple[str, str], tuple[frozenset[str], int, list[LineItem]]] | None = None,
+        market_caps: dict[str, float | None] | None = None,
+        insider_trades: dict[tuple[str, str | None], tuple[int, list[InsiderTrade]]] | None = None,
+        company_news: dict[tuple[str, str | None], tuple[int, list[CompanyNews]]] | None = None,
+    ):
+        self.start_date = start_date
+        self.end_date = end_date
+        # Results are frozen into tuples behind read-only mappings, and accessors hand out copies
+        self._prices = MappingProxyType(dict(prices or {}))
+        self._financial_metrics = MappingProxyType({key: (limit, tuple(results)) for key, (limit, results) in (financial_metrics or {}).items()})
+        self._line_items = MappingProxyType({key: (fields, limit, tuple(results)) for key, (fields, limit, results) in (line_items or {}).items()})
+        self._market_caps = MappingProxyType(dict(market_caps or {}))
+        self._insider_trades = MappingProxyType({key: (limit, tuple(results)) for key, (limit, results) in (insider_trades or {}).items()})
+        self._company_news = MappingProxyType({key: (limit, tuple(results)) for key, (limit, results) in (company_news or {}).items()})
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RunDataContext":
+        """Get the context attached to the graph state, or an empty one that defers to the API."""
+        return state["data"].get("run_data") or cls()
+
+    def get_prices(self, ticker: str, start_date: str, end_date: str) -> PriceSeries:
+        series = self._prices.get(ticker)
+        if series is None or start_date < self.start_date or end_date > self.end_date:
+            return api.get_prices(ticker, start_date, end_date)
+        return series.between(start_date, end_date)
+
+    def get_price_data(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        return api.prices_to_df(self.get_prices(ticker, start_date, end_date))
+
+    def get_financial_metrics(self, ticker: str, end_date: str, period: str = "ttm", limit: int = 10) -> list[FinancialMetrics]:
+        entry = self._financial_metrics.get((ticker, period)) if end_date == self.end_date else None
+        # A short result holds every report there is, so it answers any limit
+        if entry is None or (limit > entry[0] and len(entry[1]) == entry[0]):
+            return api.get_financial_metrics(ticker, end_date, period, limit)
+        return list(entry[1][:limit])
+
+    def search_line_items(self, ticker: str, line_items: list[str], end_date: str, period: str = "ttm", limit: int = 10) -> list[LineItem]:
+        entry = self._line_items.get((ticker, period)) if end_date == self.end_date else None
+        if entry is None or limit > entry[1] or not entry[0].issuperset(line_items):
+            return api.search_line_items(ticker, line_items, end_date, period, limit)
+        # Only return the requested columns, as the API does
+        columns = set(LINE_ITEM_BASE_FIELDS) | set(line_items)
+        return [LineItem.model_construct(**{name: value for name, value in row if name in columns}) for row in entry[2][:limit]]
+
+    def get_market_cap(self, ticker: str, end_date: str) -> float | None:
+        if end_date != self.end_date or ticker not in self._market_caps:
+            return api.get_market_cap(ticker, end_date)
+        return self._market_caps[ticker]
+
+    def get_insider_trades(self, ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000) -> list[InsiderTrade]:
+        items = self._dated(self._insider_trades, ticker, end_date, start_date, limit)
+        return api.get_insider_trades(ticker, end_date, start_date, limit) if items is None else items
+
+    def get_company_news(self, ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000) -> list[CompanyNews]:
+        items = self._dated(self._company_news, ticker, end_date, start_date, limit)
+        return api.get_company_news(ticker, end_date, start_date, limit) if items is None else items
+
+    def _dated(self, entries: MappingProxyType, ticker: str, end_date: str, start_date: str | None, limit: int) -> list | None:
+        entry = entries.get((ticker, start_date)) if end_date == self.end_date else None
+        if entry is None:
+            return None
+        # With a start date the API returns the whole range whatever the limit
+        if start_date:
+            return list(entry[1])
+        if limit > entry[0] and len(entry[1]) == entry[0]:
+            return None
+        return list(entry[1][:limit])
+
+
+async def fetch_run_data(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    requirements: DataRequirements,
+    max_concurrency: int = async_api.DEFAULT_MAX_CONCURRENCY,
+    page_windows: int = 1,
+) -> RunDataContext:
+    """
+    Fetch everything the requirements need, at most max_concurrency fetches at a time, into a RunDataContext.
+
+    A failed fetch is left out of the context, so the agent asking for it falls
+    through to the API and sees the error as it would without the context. The
+    event loop's HTTP client is closed afterwards, since each graph run plans its
+    data on a fresh loop.
+    """
+    results = {dataset: {} for dataset in ("prices", "financial_metrics", "line_items", "market_cap", "insider_trades", "company_news")}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(dataset: str, ticker: str, requirement, fetch: Callable[[], Awaitable]):
+        async with semaphore:
+            try:
+                result = await fetch()
+            except Exception:
+                return
+        if dataset == "line_items":
+            for item_ticker, items in result.items():
+                results[dataset][(item_ticker, requirement.period)] = (frozenset(requirement.line_items), requirement.limit, items)
+        elif dataset == "financial_metrics":
+            results[dataset][(ticker, requirement.period)] = (requirement.limit, result)
+        elif dataset in ("insider_trades", "company_news"):
+            results[dataset][(ticker, _dated_start(requirement, end_date))] = (requirement.limit, result)
+        else:
+            results[dataset][ticker] = result
+
+    try:
+        await asyncio.gather(*(run(*fetch) for fetch in plan_fetches(requirements, tickers, start_date, end_date, page_windows)))
+    finally:
+        await get_async_client().aclose()
+    return RunDataContext(
+        start_date,
+        end_date,
+        prices=results["prices"],
+        financial_metrics=results["financial_metrics"],
+        line_items=results["line_items"],
+        market_caps=results["market_cap"],
+        insider_trades=results["insider_trades"],
+        company_news=results["company_news"],
+    )
@@ -1,20 +1,22 @@
 """Constants and utilities related to analysts configuration."""
 
-from src.agents.aswath_damodaran import aswath_damodaran_agent
-from src.agents.ben_graham import ben_graham_agent
-from src.agents.bill_ackman import bill_ackman_agent
-from src.agents.cathie_wood import cathie_wood_agent
-from src.agents.charlie_munger import charlie_munger_agent
-from src.agents.fundamentals import fundamentals_analyst_agent
-from src.agents.michael_burry import michael_burry_agent
-from src.agents.phil_fisher import phil_fisher_agent
-from src.agents.peter_lynch import peter_lynch_agent
-from src.agents.sentiment import sentiment_analyst_agent
-from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
-from src.agents.technicals import technical_analyst_agent
-from src.agents.valuation import valuation_analyst_agent
-from src.agents.warren_buffett import warren_buffett_agent
-from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent
+from src.agents.aswath_damodaran import aswath_damodaran_agent, DATA_REQUIREMENTS as ASWATH_DAMODARAN_DATA
+from src.agents.ben_graham import ben_graham_agent, DATA_REQUIREMENTS as BEN_GRAHAM_DATA
+from src.agents.bill_ackman import bill_ackman_agent, DATA_REQUIREMENTS as BILL_ACKMAN_DATA
+from src.agents.cathie_wood import cathie_wood_agent, DATA_REQUIREMENTS as CATHIE_WOOD_DATA
+from src.agents.charlie_munger import charlie_munger_agent, DATA_REQUIREMENTS as CHARLIE_MUNGER_DATA
+from src.agents.fundamentals import fundamentals_analyst_agent, DATA_REQUIREMENTS as FUNDAMENTALS_DATA
+from src.agents.michael_burry import michael_burry_agent, DATA_REQUIREMENTS as MICHAEL_BURRY_DATA
+from src.agents.phil_fisher import phil_fisher_agent, DATA_REQUIREMENTS as PHIL_FISHER_DATA
+from src.agents.peter_lynch import peter_lynch_agent, DATA_REQUIREMENTS as PETER_LYNCH_DATA
+from src.agents.sentiment import sentiment_analyst_agent, DATA_REQUIREMENTS as SENTIMENT_DATA
+from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent, DATA_REQUIREMENTS as STANLEY_DRUCKENMILLER_DATA
+from src.agents.technicals import technical_analyst_agent, DATA_REQUIREMENTS as TECHNICALS_DATA
+from src.agents.valuation import valuation_analyst_agent, DATA_REQUIREMENTS as VALUATION_DATA
+from src.agents.warren_buffett import warren_buffett_agent, DATA_REQUIREMENTS as WARREN_BUFFETT_DATA
+from src.agents.risk_manager import DATA_REQUIREMENTS as RISK_MANAGER_DATA
+from src.agents.rakesh_jhunjhunwala import rakesh_jhunjhunwala_agent, DATA_REQUIREMENTS as RAKESH_JHUNJHUNWALA_DATA
+from src.data.models import DataRequirements
 
 # Define analyst configuration - single source of truth
 ANALYST_CONFIG = {
@@ -23,6 +25,7 @@ ANALYST_CONFIG = {
         "description": "The Dean of Valuation",
         "investing_style": "quantitative_analytical",
         "agent_func": aswath_damodaran_agent,
+        "data_requirements": ASWATH_DAMODARAN_DATA,
         "order": 0,
     },
     "ben_graham": {
@@ -30,6 +33,7 @@ ANALYST_CONFIG = {
         "description": "The Father of Value Investing",
         "investing_style": "value_investing",
         "agent_func": ben_graham_agent,
+        "data_requirements": BEN_GRAHAM_DATA,
         "order": 1,
     },
     "bill_ackman": {
@@ -37,6 +41,7 @@ ANALYST_CONFIG = {
         "description": "The Activist Investor",
         "investing_style": "contrarian_activist",
         "agent_func": bill_ackman_agent,
+        "data_requirements": BILL_ACKMAN_DATA,
         "order": 2,
     },
     "cathie_wood": {
@@ -44,6 +49,7 @@ ANALYST_CONFIG = {
         "description": "The Queen of Growth Investing",
         "investing_style": "growth_investing",
         "agent_func": cathie_wood_agent,
+        "data_requirements": CATHIE_WOOD_DATA,
         "order": 3,
     },
     "charlie_munger": {
@@ -51,6 +57,7 @@ ANALYST_CONFIG = {
         "description": "The Rational Thinker",
         "investing_style": "value_investing",
         "agent_func": charlie_munger_agent,
+        "data_requirements": CHARLIE_MUNGER_DATA,
         "order": 4,
     },
     "michael_burry": {
@@ -58,6 +65,7 @@ ANALYST_CONFIG = {
         "description": "The Big Short Contrarian",
         "investing_style": "contrarian_activist",
         "agent_func": michael_burry_agent,
+        "data_requirements": MICHAEL_BURRY_DATA,
         "order": 5,
     },
     "peter_lynch": {
@@ -65,6 +73,7 @@ ANALYST_CONFIG = {
         "description": "The 10-Bagger Investor",
         "investing_style": "growth_investing",
         "agent_func": peter_lynch_agent,
+        "data_requirements": PETER_LYNCH_DATA,
         "order": 6,
     },
     "phil_fisher": {
@@ -72,6 +81,7 @@ ANALYST_CONFIG = {
         "description": "The Scuttlebutt Investor",
         "investing_style": "growth_investing",
         "agent_func": phil_fisher_agent,
+        "data_requirements": PHIL_FISHER_DATA,
         "order": 7,
     },
     "rakesh_jhunjhunwala": {
@@ -79,6 +89,7 @@ ANALYST_CONFIG = {
         "description": "The Big Bull Of India",
         "investing_style": "macro_global",
         "agent_func": rakesh_jhunjhunwala_agent,
+        "data_requirements": RAKESH_JHUNJHUNWALA_DATA,
         "order": 8,
     },
     "stanley_druckenmiller": {
@@ -86,6 +97,7 @@ ANALYST_CONFIG = {
         "description": "The Macro Investor",
         "investing_style": "macro_global",
         "agent_func": stanley_druckenmiller_agent,
+        "data_requirements": STANLEY_DRUCKENMILLER_DATA,
         "order": 9,
     },
     "warren_buffett": {
@@ -93,6 +105,7 @@ ANALYST_CONFIG = {
         "description": "The Oracle of Omaha",
         "investing_style": "value_investing",
         "agent_func": warren_buffett_agent,
+        "data_requirements": WARREN_BUFFETT_DATA,
         "order": 10,
     },
     "technical_analyst": {
@@ -100,6 +113,7 @@ ANALYST_CONFIG = {
         "description": "Chart Pattern Specialist",
         "investing_style": "technical_analysis",
         "agent_func": technical_analyst_agent,
+        "data_requirements": TECHNICALS_DATA,
         "order": 11,
     },
     "fundamentals_analyst": {
@@ -107,6 +121,7 @@ ANALYST_CONFIG = {
         "description": "Financial Statement Specialist",
         "investing_style": "quantitative_analytical",
         "agent_func": fundamentals_analyst_agent,
+        "data_requirements": FUNDAMENTALS_DATA,
         "order": 12,
     },
     "sentiment_analyst": {
@@ -114,6 +129,7 @@ ANALYST_CONFIG = {
         "description": "Market Sentiment Specialist",
         "investing_style": "technical_analysis",
         "agent_func": sentiment_analyst_agent,
+        "data_requirements": SENTIMENT_DATA,
         "order": 13,
     },
     "valuation_analyst": {
@@ -121,6 +137,7 @@ ANALYST_CONFIG = {
         "description": "Company Valuation Specialist",
         "investing_style": "quantitative_analytical",
         "agent_func": valuation_analyst_agent,
+        "data_requirements": VALUATION_DATA,
         "order": 14,
     },
 }
@@ -134,6 +151,12 @@ def get_analyst_nodes():
     return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
 
 
+def get_data_requirements(selected_analysts: list[str] | None = None) -> DataRequirements:
+    """Get the combined per-ticker data needs of the selected analysts (all if None) and the risk manager."""
+    keys = selected_analysts if selected_analysts is not None else list(ANALYST_CONFIG)
+    return DataRequirements.union([ANALYST_CONFIG[key]["data_requirements"] for key in keys] + [RISK_MANAGER_DATA])
+
+
 def get_agents_list():
     """Get the list of agents for API responses."""
     return [
@@ -4,8 +4,12 @@ import json
 from pydantic import BaseModel
 from src.llm.models import get_model, get_model_info
 from src.utils.progress import progress
+from src.utils.parallel import get_llm_limiter
 from src.graph.state import AgentState
 
+# Agents analyze tickers concurrently, so LLM calls are bounded per provider
+_llm_limiter = get_llm_limiter()
+
 
 def call_llm(
     prompt: any,
@@ -54,7 +58,8 @@ def call_llm(
     for attempt in range(max_retries):
         try:
             # Call the LLM
-            result = llm.invoke(prompt)
+            with _llm_limiter.slot(model_provider):
+                result = llm.invoke(prompt)
 
             # For non-JSON support models, we need to extract and parse the JSON manually
             if model_info and not model_info.has_json_mode():
@@ -0,0 +1,103 @@
+"""Fan an agent's per-ticker work out over threads, and bound concurrent LLM calls per provider."""
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+
+from src.utils.progress import progress
+
+T = TypeVar("T")
+
+# Threads each agent analyzes its tickers on, unless AGENT_TICKER_WORKERS says otherwise
+DEFAULT_TICKER_WORKERS = 8
+
+# Concurrent LLM calls per provider across all agents; a local Ollama server only runs a few requests at once
+DEFAULT_LLM_CONCURRENCY = 8
+DEFAULT_PROVIDER_LLM_CONCURRENCY = {"ollama": 2}
+
+
+def ticker_workers() -> int:
+    """Get the number of threads each agent uses for its tickers."""
+    return int(os.environ.get("AGENT_TICKER_WORKERS", DEFAULT_TICKER_WORKERS))
+
+
+def map_tickers(tickers: list[str], analyze: Callable[[str], T | None], max_workers: int | None = None) -> dict[str, T]:
+    """
+    Run analyze(ticker) for every ticker on a bounded thread pool and collect the results.
+
+    Results are keyed in ticker order whatever order the work finishes in, and a
+    ticker for which analyze returns None is left out, like a `continue` in a loop.
+    Progress updates are emitted as they happen, except each ticker's final "Done",
+    which is held back until every ticker before it is done, so those lines come
+    out in ticker order with the time they were made. If analyze raises, the
+    exception of the first failing ticker (in ticker order) is re-raised once every
+    ticker has finished. Each call runs in a copy of the caller's context, so
+    context variables set by LangGraph and the cache carry over.
+    """
+    workers = min(max_workers or ticker_workers(), len(tickers))
+    if workers <= 1:
+        results = [analyze(ticker) for ticker in tickers]
+    else:
+        updates = [[] for _ in tickers]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ticker") as executor:
+            futures = [executor.submit(contextvars.copy_context().run, _analyze_captured, analyze, ticker, ticker_updates) for ticker, ticker_updates in zip(tickers, updates)]
+            for future, ticker_updates in zip(futures, updates):
+                wait([future])
+                progress.replay(ticker_updates)
+        results = [future.result() for future in futures]
+    return {ticker: result for ticker, result in zip(tickers, results) if result is not None}
+
+
+def _analyze_captured(analyze: Callable[[str], T | None], ticker: str, updates: list) -> T | None:
+    with progress.capture(updates):
+        return analyze(ticker)
+
+
+def _parse_llm_concurrency(value: str | None) -> dict[str, int]:
+    """Parse "Ollama=1,OpenAI=16" into per-provider limits; a bare number sets the default for every provider."""
+    limits = dict(DEFAULT_PROVIDER_LLM_CONCURRENCY)
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        provider, _, limit = part.rpartition("=")
+        limits[provider.strip().lower() or "*"] = int(limit)
+    return limits
+
+
+class LLMConcurrencyLimiter:
+    """
+    Bounds the number of LLM calls in flight per model provider, across every agent and thread.
+
+    Limits come from LLM_MAX_CONCURRENCY (for example "8" or "Ollama=1,OpenAI=16"),
+    read when a provider is first used.
+    """
+
+    def __init__(self):
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def limit(self, provider: str) -> int:
+        limits = _parse_llm_concurrency(os.environ.get("LLM_MAX_CONCURRENCY"))
+        return limits.get(provider.lower(), limits.get("*", DEFAULT_LLM_CONCURRENCY))
+
+    @contextmanager
+    def slot(self, provider: str) -> Iterator[None]:
+        """Hold one of the provider's slots for the duration of an LLM call."""
+        key = getattr(provider, "value", provider).lower()
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.setdefault(key, threading.BoundedSemaphore(self.limit(key)))
+        with semaphore:
+            yield
+
+
+_llm_limiter = LLMConcurrencyLimiter()
+
+
+def get_llm_limiter() -> LLMConcurrencyLimiter:
+    """Get the global per-provider LLM concurrency limiter."""
+    return _llm_limiter
@@ -1,13 +1,19 @@
+import contextvars
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.style import Style
 from rich.text import Text
-from typing import Dict, Optional, Callable, List
+from typing import Dict, Iterator, Optional, Callable, List
 
 console = Console()
 
+# Set while a ticker is analyzed on a worker thread, holding back its "Done" update to be emitted in ticker order
+_captured: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("progress_captured", default=None)
+
 
 class AgentProgress:
     """Manages progress tracking for multiple agents."""
@@ -18,6 +24,8 @@ class AgentProgress:
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
         self.update_handlers: List[Callable[[str, Optional[str], str], None]] = []
+        # Agents and their per-ticker threads report concurrently
+        self._lock = threading.RLock()
 
     def register_handler(self, handler: Callable[[str, Optional[str], str], None]):
         """Register a handler to be called when agent status updates."""
@@ -41,27 +49,48 @@ class AgentProgress:
             self.live.stop()
             self.started = False
 
+    @contextmanager
+    def capture(self, updates: list) -> Iterator[None]:
+        """Collect per-ticker "Done" updates made in this context into updates, to be replayed later; every other update is emitted as it happens."""
+        token = _captured.set(updates)
+        try:
+            yield
+        finally:
+            _captured.reset(token)
+
+    def replay(self, updates: list):
+        """Emit updates collected by capture(), in the order and with the timestamps they were made with."""
+        for update in updates:
+            self._emit(*update)
+
     def update_status(self, agent_name: str, ticker: Optional[str] = None, status: str = "", analysis: Optional[str] = None):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
-
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
-        if analysis:
-            self.agent_status[agent_name]["analysis"] = analysis
-        
         # Set the timestamp as UTC datetime
         timestamp = datetime.now(timezone.utc).isoformat()
-        self.agent_status[agent_name]["timestamp"] = timestamp
+        if ticker and status == "Done" and (captured := _captured.get()) is not None:
+            captured.append((agent_name, ticker, status, analysis, timestamp))
+            return
+        self._emit(agent_name, ticker, status, analysis, timestamp)
+
+    def _emit(self, agent_name: str, ticker: Optional[str], status: str, analysis: Optional[str], timestamp: str):
+        with self._lock:
+            if agent_name not in self.agent_status:
+                self.agent_status[agent_name] = {"status": "", "ticker": None}
+
+            if ticker:
+                self.agent_status[agent_name]["ticker"] = ticker
+            if status:
+                self.agent_status[agent_name]["status"] = status
+            if analysis:
+                self.agent_status[agent_name]["analysis"] = analysis
+
+            self.agent_status[agent_name]["timestamp"] = timestamp
 
-        # Notify all registered handlers
-        for handler in self.update_handlers:
-            handler(agent_name, ticker, status, analysis, timestamp)
+            # Notify all registered handlers
+            for handler in self.update_handlers:
+                handler(agent_name, ticker, status, analysis, timestamp)
 
-        self._refresh_display()
+            self._refresh_display()
 
     def get_all_status(self):
         """Get the current status of all agents as a dictionary."""
@@ -0,0 +1,132 @@
+"""Process-wide token-bucket rate limiting shared by threads and asyncio tasks."""
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Callable, Mapping
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket that paces outgoing requests to a requests-per-minute quota.
+
+    Each request reserves a token up front; when the bucket is empty the token is
+    borrowed from the future and the caller waits until it would have refilled, so
+    concurrent callers are spaced out evenly instead of bursting into 429s. A server
+    signal (Retry-After or an exhausted X-RateLimit-Remaining) pauses every caller
+    until the given time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        burst: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._requests_per_minute = requests_per_minute
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens: float | None = None
+        self._updated_at = 0.0
+        self._paused_until = 0.0
+
+    @property
+    def requests_per_minute(self) -> float:
+        return self._requests_per_minute or float(os.environ.get("FINANCIAL_DATASETS_REQUESTS_PER_MINUTE", "1000"))
+
+    @property
+    def burst(self) -> int:
+        return self._burst or int(os.environ.get("FINANCIAL_DATASETS_RATE_LIMIT_BURST", "20"))
+
+    def _refill(self, now: float):
+        """Add the tokens accrued since the last update, up to the burst size."""
+        if self._tokens is None:
+            self._tokens = float(self.burst)
+        else:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated_at) * self.requests_per_minute / 60)
+        self._updated_at = now
+
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens * 60 / self.requests_per_minute if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        if (wait := self._reserve()) > 0:
+            self._sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        if (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            resume_at = now + seconds
+            if resume_at > self._paused_until:
+                # Put the bucket in debt for the pause so callers resume paced, not all at once
+                extension = resume_at - max(self._paused_until, now)
+                self._tokens = min(self._tokens, 0.0) - extension * self.requests_per_minute / 60
+                self._paused_until = resume_at
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> float | None:
+        """
+        Apply server rate-limit headers and return the advised wait in seconds, if any.
+
+        Retry-After (seconds or an HTTP date) takes precedence; otherwise an exhausted
+        X-RateLimit-Remaining pauses callers until X-RateLimit-Reset.
+        """
+        wait = parse_retry_after(headers.get("Retry-After"))
+        if wait is None and headers.get("X-RateLimit-Remaining") == "0":
+            wait = _parse_reset(headers.get("X-RateLimit-Reset"))
+        if wait is not None:
+            self.pause(wait)
+        return wait
+
+
+def backoff_delay(attempt: int, base: float = 5.0, cap: float = 120.0) -> float:
+    """Jittered exponential backoff, used when the server gives no rate-limit hint."""
+    return random.uniform(0.5, 1.0) * min(cap, base * 2**attempt)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either as delay seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _parse_reset(value: str | None) -> float | None:
+    """Parse X-RateLimit-Reset, given either as seconds until reset or as a Unix timestamp."""
+    if not value:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    # Values this large are absolute epoch timestamps rather than relative delays
+    if reset > 1_000_000_000:
+        reset -= time.time()
+    return max(0.0, reset)
@@ -0,0 +1,83 @@
+"""Single-flight call coalescing: concurrent callers with the same key share one execution."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls across threads so only one runs per key at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], any]) -> any:
+        """
+        Run fn() unless a call with the same key is already in flight, in which case
+        wait for that call and return its result (or raise its exception).
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """Coalesces concurrent coroutine calls on an event loop so only one runs per key at a time."""
+
+    def __init__(self):
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]) -> any:
+        """
+        Await fn() unless a call with the same key is already in flight on this loop,
+        in which case wait for that call and return its result (or raise its exception).
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        if (future := self._calls.get(call_key)) is not None:
+            # Shield so a cancelled follower does not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._calls[call_key] = future
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no follower was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(call_key, None)
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being executed."""
+        return len(self._calls)
@@ -0,0 +1,55 @@
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from src.data.cache import Cache
+from src.data.models import FinancialMetrics, InsiderTrade
+from src.tools.local_server import LocalFinancialDatasetsServer
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Start a local server and point the API functions at it with a fresh cache and a limiter that never sleeps."""
+    servers = []
+    limiter = TokenBucketRateLimiter(requests_per_minute=60_000, burst=100, sleep=lambda seconds: None)
+    monkeypatch.setattr("src.tools.api._cache", Cache())
+    monkeypatch.setattr("src.tools.api._rate_limiter", limiter)
+    monkeypatch.setattr("src.tools.async_api._rate_limiter", limiter)
+
+    def start(**options) -> LocalFinancialDatasetsServer:
+        server = LocalFinancialDatasetsServer(retry_after=0, **options).start()
+        servers.append(server)
+        monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+async def _fake_api(url, headers, method="GET", json_data=None):
+    """Answer every endpoint the analysts use with one plausible record."""
+    path = urlparse(url).path
+    params = {name: values[0] for name, values in parse_qs(urlparse(url).query).items()}
+    base = {"report_period": "2024-03-31", "currency": "USD"}
+    if path == "/financials/search/line-items":
+        body = {"search_results": [{"ticker": ticker, "period": json_data["period"], **base, **{field: 1.0 for field in json_data["line_items"]}} for ticker in json_data["tickers"]]}
+    elif path == "/prices/":
+        body = {"ticker": params["ticker"], "prices": [{"time": "2024-06-03T04:00:00Z", "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0, "volume": 1}]}
+    elif path == "/financial-metrics/":
+        body = {"financial_metrics": [{field: None for field in FinancialMetrics.model_fields} | {"ticker": params["ticker"], "period": params["period"], **base, "market_cap": 1e9}]}
+    elif path == "/insider-trades/":
+        body = {"insider_trades": [{field: None for field in InsiderTrade.model_fields} | {"ticker": params["ticker"], "filing_date": "2024-06-01"}]}
+    elif path == "/news/":
+        body = {"news": [{"ticker": params["ticker"], "title": "t", "author": "a", "source": "s", "date": "2024-06-01", "url": "https://example.com"}]}
+    else:
+        raise AssertionError(f"Unexpected request: {url}")
+    return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def fake_api():
+    """An async stand-in for _make_api_request answering every endpoint the analysts use with one plausible record."""
+    return _fake_api
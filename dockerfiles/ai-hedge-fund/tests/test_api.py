@@ -0,0 +1,24 @@
+import json
+from unittest.mock import patch
+
+import requests
+
+from src.data.models import CompanyNewsResponse
+from src.tools.api import _decode
+from src.tools.local_server import synthetic_news
+
+
+class TestResponseDecoding:
+    """Test suite for validating API responses straight from their bytes."""
+
+    def test_body_is_validated_without_parsing_into_dicts(self):
+        """Test that a raw body validates to the same models as the parsed payload, without response.json()."""
+        body = {"news": synthetic_news("AAPL", "2024-06-30", "2024-06-01", 100)}
+        response = requests.Response()
+        response._content = json.dumps(body).encode()
+
+        with patch.object(requests.Response, "json", side_effect=AssertionError("body parsed into dicts")):
+            decoded = _decode(response, CompanyNewsResponse)
+
+        assert decoded == CompanyNewsResponse.model_validate(body)
+        assert len(decoded.news) == len(body["news"])
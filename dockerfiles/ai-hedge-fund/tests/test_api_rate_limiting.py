@@ -1,187 +1,202 @@
+import json
 import os
 import pytest
 from unittest.mock import Mock, patch, call
 
+from src.data.cache import Cache
 from src.tools.api import _make_api_request, get_prices
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only advances when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """Patch the shared rate limiter with one driven by a fake clock."""
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(requests_per_minute=6000, burst=10, clock=clock, sleep=clock.sleep)
+    with patch('src.tools.api._rate_limiter', limiter), patch('src.utils.rate_limiter.random.uniform', return_value=1.0):
+        yield clock
+
+
+def make_response(status_code: int, text: str = "", headers: dict | None = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.content = text.encode()
+    response.headers = headers or {}
+    return response
+
 
 class TestRateLimiting:
     """Test suite for API rate limiting functionality."""
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_handles_single_rate_limit(self, mock_get, mock_sleep):
+    @patch('src.tools.api._client.get')
+    def test_handles_single_rate_limit(self, mock_get, clock):
         """Test that API retries once after a 429 and succeeds."""
         # Setup mock responses: first 429, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_get.side_effect = [mock_429_response, mock_200_response]
-        
+        mock_get.side_effect = [make_response(429), make_response(200, "Success")]
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called twice
+
+        # Verify the client GET was called twice
         assert mock_get.call_count == 2
         mock_get.assert_has_calls([
             call(url, headers=headers),
             call(url, headers=headers)
         ])
-        
-        # Verify sleep was called once with 60 seconds (first retry)
-        mock_sleep.assert_called_once_with(60)
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_handles_multiple_rate_limits(self, mock_get, mock_sleep):
+        # Verify the fallback backoff waited once (5s base, jitter pinned to 1.0)
+        assert clock.sleeps == [pytest.approx(5.0, abs=0.05)]
+
+    @patch('src.tools.api._client.get')
+    def test_handles_multiple_rate_limits(self, mock_get, clock):
         """Test that API retries multiple times after 429s."""
         # Setup mock responses: three 429s, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
         mock_get.side_effect = [
-            mock_429_response, 
-            mock_429_response, 
-            mock_429_response, 
-            mock_200_response
+            make_response(429),
+            make_response(429),
+            make_response(429),
+            make_response(200, "Success"),
         ]
-        
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called 4 times
+
+        # Verify the client GET was called 4 times
         assert mock_get.call_count == 4
-        
-        # Verify sleep was called 3 times with linear backoff: 60s, 90s, 120s
-        assert mock_sleep.call_count == 3
-        expected_calls = [call(60), call(90), call(120)]
-        mock_sleep.assert_has_calls(expected_calls)
-
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.post')
-    def test_handles_post_rate_limiting(self, mock_post, mock_sleep):
+
+        # Verify exponential backoff: 5s, 10s, 20s
+        assert clock.sleeps == [pytest.approx(5.0, abs=0.05), pytest.approx(10.0, abs=0.05), pytest.approx(20.0, abs=0.05)]
+
+    @patch('src.tools.api._client.post')
+    def test_handles_post_rate_limiting(self, mock_post, clock):
         """Test that POST requests handle rate limiting."""
         # Setup mock responses: first 429, then 200
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_post.side_effect = [mock_429_response, mock_200_response]
-        
+        mock_post.side_effect = [make_response(429), make_response(200, "Success")]
+
         # Call the function with POST method
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
         json_data = {"test": "data"}
-        
+
         result = _make_api_request(url, headers, method="POST", json_data=json_data)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.post was called twice
+
+        # Verify the client POST was called twice
         assert mock_post.call_count == 2
         mock_post.assert_has_calls([
             call(url, headers=headers, json=json_data),
             call(url, headers=headers, json=json_data)
         ])
-        
-        # Verify sleep was called once with 60 seconds (first retry)
-        mock_sleep.assert_called_once_with(60)
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_ignores_other_errors(self, mock_get, mock_sleep):
+        # Verify the fallback backoff waited once
+        assert clock.sleeps == [pytest.approx(5.0, abs=0.05)]
+
+    @patch('src.tools.api._client.get')
+    def test_honors_retry_after_header(self, mock_get, clock):
+        """Test that a Retry-After header replaces the fallback backoff."""
+        mock_get.side_effect = [make_response(429, headers={"Retry-After": "2"}), make_response(200, "Success")]
+
+        result = _make_api_request("https://api.financialdatasets.ai/test", {})
+
+        assert result.status_code == 200
+        assert clock.sleeps == [pytest.approx(2.0, abs=0.05)]
+
+    @patch('src.tools.api._client.get')
+    def test_exhausted_quota_header_pauses_next_request(self, mock_get, clock):
+        """Test that X-RateLimit-Remaining: 0 holds back the next request until the reset."""
+        mock_get.return_value = make_response(200, "Success", headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"})
+
+        _make_api_request("https://api.financialdatasets.ai/test", {})
+        assert clock.sleeps == []
+
+        _make_api_request("https://api.financialdatasets.ai/test", {})
+        assert clock.sleeps == [pytest.approx(3.0, abs=0.05)]
+
+    @patch('src.tools.api._client.get')
+    def test_ignores_other_errors(self, mock_get, clock):
         """Test that non-429 errors are returned without retrying."""
         # Setup mock response: 500 error
-        mock_500_response = Mock()
-        mock_500_response.status_code = 500
-        mock_500_response.text = "Internal Server Error"
-        
-        mock_get.return_value = mock_500_response
-        
+        mock_get.return_value = make_response(500, "Internal Server Error")
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 500
         assert result.text == "Internal Server Error"
-        
-        # Verify requests.get was called only once
+
+        # Verify the client GET was called only once
         assert mock_get.call_count == 1
-        
-        # Verify sleep was never called
-        mock_sleep.assert_not_called()
 
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_normal_success_requests(self, mock_get, mock_sleep):
+        # Verify nothing waited
+        assert clock.sleeps == []
+
+    @patch('src.tools.api._client.get')
+    def test_normal_success_requests(self, mock_get, clock):
         """Test that successful requests return immediately without retry."""
         # Setup mock response: 200 success
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.text = "Success"
-        
-        mock_get.return_value = mock_200_response
-        
+        mock_get.return_value = make_response(200, "Success")
+
         # Call the function
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers)
-        
+
         # Verify behavior
         assert result.status_code == 200
         assert result.text == "Success"
-        
-        # Verify requests.get was called only once
+
+        # Verify the client GET was called only once
         assert mock_get.call_count == 1
-        
-        # Verify sleep was never called
-        mock_sleep.assert_not_called()
-
-    @patch('src.tools.api._cache')
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_full_integration(self, mock_get, mock_sleep, mock_cache):
+
+        # Verify nothing waited
+        assert clock.sleeps == []
+
+    @patch('src.tools.api._cache', new_callable=Cache)
+    @patch('src.tools.api._client.get')
+    def test_full_integration(self, mock_get, mock_cache, clock):
         """Test that get_prices function properly handles rate limiting."""
-        # Mock cache to return None (cache miss)
-        mock_cache.get_prices.return_value = None
-        
+        # The patched cache starts empty (cache miss)
+
         # Setup mock responses: first 429, then 200 with valid data
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        
-        mock_200_response = Mock()
-        mock_200_response.status_code = 200
-        mock_200_response.json.return_value = {
+        mock_200_response = make_response(200, json.dumps({
             "ticker": "AAPL",
             "prices": [
                 {
@@ -193,57 +208,75 @@ class TestRateLimiting:
                     "volume": 1000
                 }
             ]
-        }
-        
-        mock_get.side_effect = [mock_429_response, mock_200_response]
-        
+        }))
+
+        mock_get.side_effect = [make_response(429), mock_200_response]
+
         # Set environment variable for API key
         with patch.dict(os.environ, {"FINANCIAL_DATASETS_API_KEY": "test-key"}):
             # Call get_prices
             result = get_prices("AAPL", "2024-01-01", "2024-01-02")
-        
+
         # Verify the function succeeded and returned data
         assert len(result) == 1
         assert result[0].open == 100.0
         assert result[0].close == 101.0
-        
+
         # Verify rate limiting behavior
         assert mock_get.call_count == 2
-        mock_sleep.assert_called_once_with(60)
-        
-        # Verify cache operations
-        mock_cache.get_prices.assert_called_once()
-        mock_cache.set_prices.assert_called_once()
-
-    @patch('src.tools.api.time.sleep')
-    @patch('src.tools.api.requests.get')
-    def test_max_retries_exceeded(self, mock_get, mock_sleep):
+        assert clock.sleeps == [pytest.approx(5.0, abs=0.05)]
+
+        # Verify the fetched range was cached
+        assert mock_cache.missing_price_ranges("AAPL", "2024-01-01", "2024-01-02") == []
+        assert len(mock_cache.get_prices("AAPL", "2024-01-01", "2024-01-02")) == 1
+
+    @patch('src.tools.api._client.get')
+    def test_max_retries_exceeded(self, mock_get, clock):
         """Test that function stops retrying after max_retries and returns final 429."""
         # Setup mock responses: all 429s (exceeds max retries)
-        mock_429_response = Mock()
-        mock_429_response.status_code = 429
-        mock_429_response.text = "Too Many Requests"
-        
-        mock_get.return_value = mock_429_response
-        
+        mock_get.return_value = make_response(429, "Too Many Requests")
+
         # Call the function with max_retries=2
         headers = {"X-API-KEY": "test-key"}
         url = "https://api.financialdatasets.ai/test"
-        
+
         result = _make_api_request(url, headers, max_retries=2)
-        
+
         # Verify final 429 is returned
         assert result.status_code == 429
         assert result.text == "Too Many Requests"
-        
-        # Verify requests.get was called 3 times (1 initial + 2 retries)
+
+        # Verify the client GET was called 3 times (1 initial + 2 retries)
         assert mock_get.call_count == 3
-        
-        # Verify sleep was called 2 times with linear backoff: 60s, 90s
-        assert mock_sleep.call_count == 2
-        expected_calls = [call(60), call(90)]
-        mock_sleep.assert_has_calls(expected_calls)
+
+        # Verify exponential backoff between attempts: 5s, 10s
+        assert clock.sleeps == [pytest.approx(5.0, abs=0.05), pytest.approx(10.0, abs=0.05)]
+
+
+class TestTokenBucketRateLimiter:
+    """Test suite for the shared token-bucket rate limiter."""
+
+    def test_paces_requests_beyond_the_burst(self):
+        """Test that requests beyond the burst are spaced at the configured rate."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=2, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            limiter.acquire()
+
+        # Two burst tokens, then one request per second
+        assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0), pytest.approx(1.0)]
+
+    def test_pause_holds_back_every_caller(self):
+        """Test that a pause delays callers that did not see the 429 themselves."""
+        clock = FakeClock()
+        limiter = TokenBucketRateLimiter(requests_per_minute=60, burst=5, clock=clock, sleep=clock.sleep)
+
+        limiter.pause(10)
+        limiter.pause(4)  # A shorter pause does not shorten the longer one
+
+        assert limiter._reserve() == pytest.approx(11.0)
 
 
 if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__])
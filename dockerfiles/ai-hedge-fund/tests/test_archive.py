@@ -0,0 +1,72 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.data.cache import Cache
+from src.tools import async_api
+from src.tools.api import _make_api_request, get_prices
+from src.tools.archive import RECORD, REPLAY, ResponseArchive, set_archive
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+PRICES_URL = "https://api.financialdatasets.ai/prices/?ticker=AAPL&interval=day&interval_multiplier=1&start_date=2024-01-02&end_date=2024-01-03"
+PRICES_BODY = {"ticker": "AAPL", "prices": [{"time": "2024-01-02T05:00:00Z", "open": 1.0, "close": 2.0, "high": 3.0, "low": 0.5, "volume": 10}]}
+
+
+def live_response(status_code: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers["Content-Type"] = "application/json"
+    response._content = json.dumps(body).encode()
+    return response
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    yield str(tmp_path / "responses.json.gz")
+    set_archive(None)
+
+
+class TestResponseArchive:
+    """Test suite for recording and replaying API responses."""
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_recorded_responses_replay_without_network(self, mock_cache, archive_path):
+        """Test that a recorded run replays identically through the sync and async APIs."""
+        set_archive(ResponseArchive(archive_path, RECORD))
+        with patch("src.tools.api._client.get", side_effect=[live_response(429, {}), live_response(200, PRICES_BODY)]), patch("src.tools.api._rate_limiter", TokenBucketRateLimiter(sleep=lambda seconds: None)):
+            recorded = get_prices("AAPL", "2024-01-02", "2024-01-03")
+
+        set_archive(ResponseArchive(archive_path, REPLAY))
+        mock_cache.clear()
+        with patch("src.tools.api._client.get", side_effect=AssertionError("network used during replay")), patch("src.tools.api._rate_limiter.acquire", side_effect=AssertionError("rate limited during replay")):
+            replayed = get_prices("AAPL", "2024-01-02", "2024-01-03")
+
+        mock_cache.clear()
+        replayed_async = asyncio.run(async_api.get_prices("AAPL", "2024-01-02", "2024-01-03"))
+
+        assert replayed == recorded == replayed_async
+        assert recorded[0].close == 2.0
+
+    def test_unrecorded_request_raises(self, archive_path):
+        """Test that replay never falls through to the network for an unknown request."""
+        recorder = ResponseArchive(archive_path, RECORD)
+        recorder.record("GET", PRICES_URL, None, 200, {"Content-Type": "application/json"}, json.dumps(PRICES_BODY).encode())
+        recorder.save()
+        set_archive(ResponseArchive(archive_path, REPLAY))
+
+        with pytest.raises(Exception, match="no recorded response"):
+            _make_api_request(PRICES_URL.replace("AAPL", "MSFT"), {})
+
+    def test_repeated_requests_replay_in_recorded_order(self, archive_path):
+        """Test that responses to the same request come back in order, then repeat the last one."""
+        recorder = ResponseArchive(archive_path, RECORD)
+        for status_code in (500, 200):
+            recorder.record("POST", PRICES_URL, {"b": 1, "a": 2}, status_code, {}, b"{}")
+        recorder.save()
+
+        replay = ResponseArchive(archive_path, REPLAY)
+
+        assert [replay.replay("POST", PRICES_URL, {"a": 2, "b": 1}).status_code for _ in range(3)] == [500, 200, 200]
@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from src.data.cache import Cache
+from src.data.models import FinancialMetrics
+from src.tools import async_api
+
+
+def _metrics_response(ticker: str) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "financial_metrics": [
+                {"ticker": ticker, "report_period": "2024-03-31", "period": "ttm", "currency": "USD", **{field: None for field in FinancialMetrics.model_fields if field not in ("ticker", "report_period", "period", "currency")}},
+            ]
+        },
+    )
+
+
+class TestAsyncApi:
+    """Test suite for the asyncio financial data functions."""
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_multi_ticker_fetch_runs_concurrently(self, mock_cache):
+        """Test that fetching many tickers takes about as long as the slowest request."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(url, headers, method="GET", json_data=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _metrics_response(url.split("ticker=")[1].split("&")[0])
+
+        tickers = [f"T{i}" for i in range(10)]
+        with patch("src.tools.async_api._make_api_request", side_effect=fake_request):
+            results = asyncio.run(async_api.get_financial_metrics_for_tickers(tickers, "2024-06-30"))
+
+        assert list(results) == tickers
+        assert all(results[ticker][0].ticker == ticker for ticker in tickers)
+        assert peak == len(tickers)
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_max_concurrency_is_respected(self, mock_cache):
+        """Test that the multi-ticker helpers bound the number of in-flight fetches."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(url, headers, method="GET", json_data=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _metrics_response("X")
+
+        with patch("src.tools.async_api._make_api_request", side_effect=fake_request):
+            asyncio.run(async_api.get_financial_metrics_for_tickers([f"T{i}" for i in range(10)], "2024-06-30", max_concurrency=3))
+
+        assert peak == 3
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_sync_and_async_share_the_cache(self, mock_cache):
+        """Test that a result fetched asynchronously is served to the sync wrapper from cache."""
+        from src.tools.api import get_financial_metrics
+
+        async def fake_request(url, headers, method="GET", json_data=None):
+            return _metrics_response("AAPL")
+
+        with patch("src.tools.async_api._make_api_request", side_effect=fake_request):
+            asyncio.run(async_api.get_financial_metrics("AAPL", "2024-06-30"))
+
+        with patch("src.tools.api._make_api_request") as mock_request:
+            metrics = get_financial_metrics("AAPL", "2024-06-30")
+
+        mock_request.assert_not_called()
+        assert metrics[0].ticker == "AAPL"
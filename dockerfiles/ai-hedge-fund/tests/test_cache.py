@@ -0,0 +1,570 @@
+import json
+import multiprocessing
+import time
+from urllib.parse import parse_qs, urlparse
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from src.data.cache import Cache, estimate_size
+from src.data.cache_store import CacheStore, SQLiteCacheStore, _loads
+from src.data.models import CompanyNews, CompressedNews, FinancialMetrics, PriceSeries
+from src.tools.api import get_company_news, get_financial_metrics, get_insider_trades, get_market_cap, get_prices, search_line_items, search_line_items_for_tickers
+from src.tools.local_server import LocalFinancialDatasetsServer, synthetic_insider_trades, synthetic_news
+
+
+def price_row(time: str, close: float = 1.0) -> dict:
+    return {"time": time, "open": close, "close": close, "high": close, "low": close, "volume": 100}
+
+
+def news_item(title: str = "x", date: str = "2024-01-02") -> CompanyNews:
+    return CompanyNews(ticker="AAPL", title=title, author="a", source="s", date=date, url="https://example.com")
+
+
+def synthetic_api(url, headers, method="GET", json_data=None) -> httpx.Response:
+    """Answer insider trade and news requests from the local server's synthetic data."""
+    params = {name: values[0] for name, values in parse_qs(urlparse(url).query).items()}
+    if "/insider-trades/" in url:
+        body = {"insider_trades": synthetic_insider_trades(params["ticker"], params["filing_date_lte"], params.get("filing_date_gte"), int(params["limit"]))}
+    else:
+        body = {"news": synthetic_news(params["ticker"], params["end_date"], params.get("start_date"), int(params["limit"]))}
+    return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCacheStore(str(tmp_path / "cache.sqlite"))
+    yield store
+    store.close()
+
+
+class TestPersistentCache:
+    """Test suite for the persistent cache store."""
+
+    def test_survives_new_cache_instance(self, store):
+        """Test that data written by one Cache is visible to a fresh one."""
+        Cache(store=store).set_prices("AAPL", [price_row("2024-01-02")], "2024-01-01", "2024-01-31")
+
+        assert Cache(store=store).get_prices("AAPL", "2024-01-01", "2024-01-31") == PriceSeries.from_records("AAPL", [price_row("2024-01-02")])
+
+    def test_entries_expire_after_ttl(self, store):
+        """Test that an entry is dropped from memory and the store once its TTL passes."""
+        cache = Cache(store=store, ttls={"company_news": 0.01})
+        cache.set_company_news("AAPL", [news_item()])
+        assert cache.get_company_news("AAPL") is not None
+
+        time.sleep(0.02)
+
+        assert cache.get_company_news("AAPL") is None
+        assert store.get("company_news", "AAPL") is None
+
+    def test_promoted_entries_keep_the_store_expiry(self, store):
+        """Test that an entry read from the store expires in memory when it does in the store, not a full TTL later."""
+        Cache(store=store, ttls={"company_news": 0.2}).set_company_news("AAPL", [news_item()])
+        time.sleep(0.1)
+        cache = Cache(store=store)  # Default company_news TTL of an hour
+
+        assert cache.get_company_news("AAPL") is not None
+        time.sleep(0.15)
+
+        assert cache.get_company_news("AAPL") is None
+
+    def test_prices_never_expire_by_default(self, store):
+        """Test that historical prices are stored without an expiry."""
+        Cache(store=store).set_prices("AAPL", [price_row("2024-01-02")], "2024-01-01", "2024-01-31")
+
+        expires_at = store._conn.execute("SELECT expires_at FROM cache_entries WHERE dataset = 'prices' AND key = 'AAPL'").fetchone()[0]
+        assert expires_at is None
+
+    def test_evicts_least_recently_used_entries(self, tmp_path):
+        """Test that the store stays under its size budget by evicting old entries first."""
+        payload = [{"time": str(i), "text": "x" * 100} for i in range(10)]
+        entry_size = len(json.dumps(payload))
+        store = SQLiteCacheStore(str(tmp_path / "cache.sqlite"), max_bytes=entry_size * 3)
+
+        store.set("prices", "A", payload)
+        store.set("prices", "B", payload)
+        store.set("prices", "C", payload)
+        store.get("prices", "A")  # A is now more recently used than B
+        store.set("prices", "D", payload)
+
+        assert store.total_bytes() <= entry_size * 3
+        assert store.get("prices", "B") is None
+        assert store.get("prices", "A") is not None
+        assert store.get("prices", "D") is not None
+        store.close()
+
+    def test_store_payloads_with_nan_still_decode(self):
+        """Test that payloads json.dumps wrote with NaN decode whichever decoder is installed."""
+        assert _loads(json.dumps([{"close": float("nan")}, {"close": 1.0}]))[1] == {"close": 1.0}
+
+
+    def test_incomplete_store_fails_when_constructed(self):
+        """Test that a backend missing part of the store interface is rejected up front rather than mid-fill."""
+
+        class DictStore(CacheStore):
+            def get_entry(self, dataset, key):
+                return None
+
+            def set(self, dataset, key, data, ttl=None):
+                pass
+
+        with pytest.raises(TypeError, match="acquire_fill_lock"):
+            DictStore()
+
+def fetch_metrics_in_worker(results):
+    """Run in a separate process configured through the inherited environment."""
+    results.put(len(get_financial_metrics("AAPL", "2024-06-30", limit=5)))
+
+
+class TestSharedCache:
+    """Test suite for sharing the persistent cache between processes."""
+
+    def test_fill_lock_admits_one_holder_until_released_or_expired(self, tmp_path):
+        """Test that two stores on one file see each other's fill locks."""
+        path = str(tmp_path / "cache.sqlite")
+        first, second = SQLiteCacheStore(path), SQLiteCacheStore(path)
+
+        token = first.acquire_fill_lock("AAPL", lease=60)
+        assert token is not None
+        assert second.acquire_fill_lock("AAPL", lease=60) is None
+        assert second.acquire_fill_lock("MSFT", lease=60) is not None
+
+        first.release_fill_lock("AAPL", token)
+        assert second.acquire_fill_lock("AAPL", lease=0) is not None
+        # A lease that has run out is taken over
+        assert first.acquire_fill_lock("AAPL", lease=60) is not None
+        first.close()
+        second.close()
+
+    def test_fill_lock_lease_is_renewed_while_held(self, tmp_path):
+        """Test that a holder keeps its lock past the lease, and a waiter that times out goes ahead without it."""
+        path = str(tmp_path / "cache.sqlite")
+        first, waiter = SQLiteCacheStore(path), SQLiteCacheStore(path)
+
+        with Cache(store=first).fill_lock("AAPL", lease=0.2):
+            time.sleep(0.5)
+            assert waiter.acquire_fill_lock("AAPL", lease=60) is None
+
+            start = time.monotonic()
+            with Cache(store=waiter).fill_lock("AAPL", lease=0.2, wait_timeout=0.3):
+                assert time.monotonic() - start >= 0.3
+
+        assert waiter.acquire_fill_lock("AAPL", lease=60) is not None
+        first.close()
+        waiter.close()
+
+    def test_concurrent_workers_fetch_a_missing_entry_once(self, tmp_path, monkeypatch):
+        """Test that processes sharing a cache file make one upstream request between them."""
+        with LocalFinancialDatasetsServer(latency=0.5) as server:
+            monkeypatch.setenv("FINANCIAL_DATASETS_BASE_URL", server.base_url)
+            monkeypatch.setenv("FINANCIAL_DATASETS_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+            context = multiprocessing.get_context("spawn")
+            results = context.Queue()
+            workers = [context.Process(target=fetch_metrics_in_worker, args=(results,)) for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            counts = [results.get(timeout=60) for _ in workers]
+            for worker in workers:
+                worker.join()
+
+            assert counts == [5, 5, 5, 5]
+            assert server.stats()["by_path"]["/financial-metrics/"] == 1
+
+
+class TestMemoryBudget:
+    """Test suite for the byte-bounded in-memory LRU and its statistics."""
+
+    def test_evicts_least_recently_used_entries_over_budget(self):
+        """Test that a dataset stays within its memory budget, dropping the coldest entries."""
+        news = [news_item("x" * 100)]
+        entry_size = estimate_size(CompressedNews.from_items(news))
+        cache = Cache(memory_budgets={"company_news": entry_size * 2})
+
+        cache.set_company_news("AAPL", news)
+        cache.set_company_news("MSFT", news)
+        cache.get_company_news("AAPL")  # AAPL is now more recently used than MSFT
+        cache.set_company_news("NVDA", news)
+
+        assert cache.get_company_news("MSFT") is None
+        assert cache.get_company_news("AAPL") == news
+        stats = cache.stats()["company_news"]
+        assert stats["resident_bytes"] == entry_size * 2
+        assert stats["evictions"] == 1
+
+    def test_long_timelines_are_sized_from_a_sample(self):
+        """Test that sizing a long timeline serializes a bounded sample yet stays close to its full size."""
+        items = [news_item(f"headline {i}" * (1 + i % 5)).model_dump() for i in range(2000)]
+        full_size = len(json.dumps(items, separators=(",", ":")))
+
+        with patch("src.data.cache.to_json", wraps=json.dumps) as serialize:
+            size = estimate_size(items)
+
+        assert all(len(call.args[0]) <= 32 for call in serialize.call_args_list)
+        assert abs(size - full_size) < full_size * 0.1
+
+    def test_counts_hits_misses_and_store_hits(self, store):
+        """Test that stats separate memory hits, persistent-store hits and misses."""
+        Cache(store=store).set_company_news("AAPL", [news_item()])
+        cache = Cache(store=store)
+
+        cache.get_company_news("AAPL")  # Promoted from the store
+        cache.get_company_news("AAPL")
+        cache.get_company_news("MSFT")
+
+        stats = cache.stats()
+        assert (stats["company_news"]["store_hits"], stats["company_news"]["hits"], stats["company_news"]["misses"]) == (1, 1, 1)
+        assert stats["total"]["entries"] == 1
+
+    def test_budgets_can_be_set_from_the_environment(self, monkeypatch):
+        """Test that FINANCIAL_DATASETS_CACHE_MEMORY_MB overrides the default budgets."""
+        monkeypatch.setenv("FINANCIAL_DATASETS_CACHE_MEMORY_MB", "company_news=1.5, prices=none")
+
+        stats = Cache().stats()
+
+        assert stats["company_news"]["budget_bytes"] == int(1.5 * 1024 * 1024)
+        assert stats["prices"]["budget_bytes"] is None
+        assert stats["total"]["budget_bytes"] is None
+
+
+class TestValidatedModelCache:
+    """Test suite for caching validated model objects instead of raw dicts."""
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_hits_share_the_validated_models(self, mock_request, mock_cache):
+        """Test that cache hits return the models validated at fetch time, in a fresh list."""
+        metric = {name: None for name in FinancialMetrics.model_fields} | {"ticker": "AAPL", "report_period": "2024-03-31", "period": "ttm", "currency": "USD"}
+        mock_request.return_value = httpx.Response(200, json={"financial_metrics": [metric]})
+
+        first = get_financial_metrics("AAPL", "2024-04-01")
+        with patch.object(FinancialMetrics, "__init__", side_effect=AssertionError("revalidated on a cache hit")):
+            second = get_financial_metrics("AAPL", "2024-04-01")
+
+        mock_request.assert_called_once()
+        assert second[0] is first[0]
+        assert second is not first
+
+    def test_cached_models_are_immutable(self):
+        """Test that shared cached models cannot be changed by one caller."""
+        with pytest.raises(ValidationError):
+            news_item().title = "changed"
+
+    def test_store_round_trip_returns_models(self, store):
+        """Test that entries read back from the persistent store are models again."""
+        Cache(store=store).set_company_news("AAPL", [news_item()])
+
+        assert Cache(store=store).get_company_news("AAPL") == [news_item()]
+
+
+class TestFinancialMetricsLimitReuse:
+    """Test suite for serving financial metrics requests from a cached result for a larger limit."""
+
+    @staticmethod
+    def respond(url, headers, method="GET", json_data=None) -> httpx.Response:
+        limit = int(url.split("limit=")[1].split("&")[0])
+        periods = [f"{2024 - i}-03-31" for i in range(min(limit, 12))]
+        metrics = [{name: None for name in FinancialMetrics.model_fields} | {"ticker": "AAPL", "report_period": period, "period": "ttm", "currency": "USD", "market_cap": 1e9} for period in periods]
+        return httpx.Response(200, json={"financial_metrics": metrics})
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_smaller_limits_and_market_cap_share_one_request(self, mock_request, mock_cache):
+        """Test that limit=5, limit=10 and the market cap lookup for one ticker and period make one request."""
+        mock_request.side_effect = self.respond
+
+        five = get_financial_metrics("AAPL", "2024-06-30", limit=5)
+        ten = get_financial_metrics("AAPL", "2024-06-30", limit=10)
+        market_cap = get_market_cap("AAPL", "2024-06-30")
+
+        mock_request.assert_called_once()
+        assert len(five) == 5 and len(ten) == 10 and ten[:5] == five
+        assert market_cap == 1e9
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_larger_limit_upgrades_the_cached_result(self, mock_request, mock_cache):
+        """Test that a larger limit is fetched once and then serves every smaller one."""
+        mock_request.side_effect = self.respond
+        get_financial_metrics("AAPL", "2024-06-30", limit=10)
+
+        assert len(get_financial_metrics("AAPL", "2024-06-30", limit=20)) == 12
+        assert mock_request.call_count == 2
+        assert "limit=20" in mock_request.call_args[0][0]
+
+        # Twelve periods is the whole history, so even larger limits are served from the cache
+        assert len(get_financial_metrics("AAPL", "2024-06-30", limit=50)) == 12
+        assert len(get_financial_metrics("AAPL", "2024-06-30", limit=3)) == 3
+        assert mock_request.call_count == 2
+
+    def test_smaller_result_does_not_replace_a_larger_one(self):
+        """Test that caching a smaller limit keeps the larger cached result."""
+        cache = Cache()
+        rows = [FinancialMetrics(**row) for row in self.respond("limit=10", {}).json()["financial_metrics"]]
+        cache.set_financial_metrics("AAPL", "ttm", "2024-06-30", 10, rows)
+        cache.set_financial_metrics("AAPL", "ttm", "2024-06-30", 5, rows[:5])
+
+        assert len(cache.get_financial_metrics("AAPL", "ttm", "2024-06-30", 10)) == 10
+
+
+class TestRangeAwarePriceCache:
+    """Test suite for serving price sub-ranges from cached coverage."""
+
+    def test_serves_contained_range_by_slicing(self):
+        """Test that a sub-range of a cached superset is answered without gaps."""
+        cache = Cache()
+        cache.set_prices("AAPL", [price_row("2024-01-02T05:00:00Z"), price_row("2024-01-03T05:00:00Z"), price_row("2024-01-04T05:00:00Z")], "2024-01-01", "2024-01-31")
+
+        assert cache.missing_price_ranges("AAPL", "2024-01-03", "2024-01-04") == []
+        assert [p.time for p in cache.get_prices("AAPL", "2024-01-03", "2024-01-04")] == ["2024-01-03T05:00:00Z", "2024-01-04T05:00:00Z"]
+
+    def test_reports_only_missing_gaps(self):
+        """Test that only the uncovered parts of a range are reported as missing."""
+        cache = Cache()
+        cache.set_prices("AAPL", [], "2024-01-10", "2024-01-20")
+        cache.set_prices("AAPL", [], "2024-02-01", "2024-02-10")
+
+        assert cache.get_prices("AAPL", "2024-01-01", "2024-02-20") is None
+        assert cache.missing_price_ranges("AAPL", "2024-01-01", "2024-02-20") == [
+            ("2024-01-01", "2024-01-09"),
+            ("2024-01-21", "2024-01-31"),
+            ("2024-02-11", "2024-02-20"),
+        ]
+
+    def test_adjacent_ranges_merge_into_one_interval(self):
+        """Test that back-to-back daily fetches leave a single covered interval."""
+        cache = Cache()
+        cache.set_prices("AAPL", [], "2024-01-01", "2024-01-02")
+        cache.set_prices("AAPL", [], "2024-01-03", "2024-01-03")
+
+        assert cache._price_coverage_cache["AAPL"] == [{"start": "2024-01-01", "end": "2024-01-03", "expires_at": None}]
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_get_prices_fetches_only_gaps(self, mock_request, mock_cache):
+        """Test that get_prices only requests the uncovered part of a range."""
+        mock_cache.set_prices("AAPL", [price_row("2024-01-02")], "2024-01-01", "2024-01-15")
+        mock_request.return_value = httpx.Response(200, json={"ticker": "AAPL", "prices": [{"time": "2024-01-16", "open": 2.0, "close": 2.0, "high": 2.0, "low": 2.0, "volume": 2}]})
+
+        prices = get_prices("AAPL", "2024-01-01", "2024-01-20")
+
+        assert [p.time for p in prices] == ["2024-01-02T00:00:00Z", "2024-01-16T00:00:00Z"]
+        mock_request.assert_called_once()
+        assert "start_date=2024-01-16&end_date=2024-01-20" in mock_request.call_args[0][0]
+
+        # A contained range is now served entirely from the cache
+        assert len(get_prices("AAPL", "2024-01-02", "2024-01-18")) == 2
+        mock_request.assert_called_once()
+
+    @patch("src.tools.api._make_api_request")
+    def test_evicted_series_is_fetched_again(self, mock_request):
+        """Test that coverage left behind by an evicted or oversized series does not answer with an empty series."""
+        mock_request.return_value = httpx.Response(200, json={"ticker": "AAPL", "prices": [price_row(f"2024-01-{day:02d}") for day in range(2, 12)]})
+
+        # Room for two tickers' series
+        with patch("src.tools.api._cache", Cache(memory_budgets={"prices": 1000})):
+            for ticker in ("AAPL", "MSFT", "NVDA", "AAPL"):
+                assert len(get_prices(ticker, "2024-01-01", "2024-01-31")) == 10
+        assert mock_request.call_count == 4
+
+        with patch("src.tools.api._cache", Cache(memory_budgets={"prices": 100})):
+            assert len(get_prices("AAPL", "2024-01-01", "2024-01-31")) == 10
+            assert len(get_prices("AAPL", "2024-01-05", "2024-01-31")) == 7
+        assert mock_request.call_count == 6
+
+
+class TestLineItemCache:
+    """Test suite for the field-union line item cache."""
+
+    @staticmethod
+    def _row(report_period: str, **fields) -> dict:
+        return {"ticker": "AAPL", "report_period": report_period, "period": "ttm", "currency": "USD", **fields}
+
+    def test_merges_columns_across_requests(self):
+        """Test that fields fetched separately are merged per report period and served together."""
+        cache = Cache()
+        cache.set_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 2, [self._row("2024-03-31", revenue=10), self._row("2023-12-31", revenue=9)])
+        cache.set_line_items("AAPL", "ttm", "2024-06-30", ["net_income"], 2, [self._row("2024-03-31", net_income=2), self._row("2023-12-31", net_income=1)])
+
+        assert cache.missing_line_items("AAPL", "ttm", "2024-06-30", ["revenue", "net_income"], 2) == []
+        assert cache.get_line_items("AAPL", "ttm", "2024-06-30", ["net_income", "revenue"], 2) == [
+            self._row("2024-03-31", revenue=10, net_income=2),
+            self._row("2023-12-31", revenue=9, net_income=1),
+        ]
+
+    def test_returns_only_requested_columns(self):
+        """Test that cached but unrequested fields are not returned."""
+        cache = Cache()
+        cache.set_line_items("AAPL", "ttm", "2024-06-30", ["revenue", "net_income"], 1, [self._row("2024-03-31", revenue=10, net_income=2)])
+
+        assert cache.get_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 1) == [self._row("2024-03-31", revenue=10)]
+
+    def test_larger_limit_is_a_miss(self):
+        """Test that a field cached for fewer periods than requested must be refetched."""
+        cache = Cache()
+        cache.set_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 5, [self._row("2024-03-31", revenue=10)])
+
+        assert cache.get_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 3) == [self._row("2024-03-31", revenue=10)]
+        assert cache.get_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 10) is None
+        assert cache.missing_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 10) == ["revenue"]
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_search_line_items_fetches_only_missing_fields(self, mock_request, mock_cache):
+        """Test that search_line_items only requests fields that are not cached yet."""
+        mock_cache.set_line_items("AAPL", "ttm", "2024-06-30", ["revenue"], 1, [self._row("2024-03-31", revenue=10)])
+        mock_request.return_value = httpx.Response(200, json={"search_results": [self._row("2024-03-31", free_cash_flow=3)]})
+
+        results = search_line_items("AAPL", ["revenue", "free_cash_flow"], "2024-06-30", limit=1)
+
+        assert mock_request.call_args.kwargs["json_data"]["line_items"] == ["free_cash_flow"]
+        assert results[0].revenue == 10
+        assert results[0].free_cash_flow == 3
+
+        search_line_items("AAPL", ["free_cash_flow"], "2024-06-30", limit=1)
+        mock_request.assert_called_once()
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api.LINE_ITEMS_MAX_TICKERS", 2)
+    @patch("src.tools.api._make_api_request")
+    def test_batch_search_chunks_tickers_and_splits_results(self, mock_request, mock_cache):
+        """Test that a ticker universe is fetched in chunked POSTs and cached per ticker."""
+        mock_cache.set_line_items("MSFT", "ttm", "2024-06-30", ["revenue"], 1, [{**self._row("2024-03-31", revenue=5), "ticker": "MSFT"}])
+
+        def respond(url, headers, method="GET", json_data=None):
+            return httpx.Response(200, json={"search_results": [{**self._row("2024-03-31", revenue=len(ticker)), "ticker": ticker} for ticker in json_data["tickers"]]})
+
+        mock_request.side_effect = respond
+
+        results = search_line_items_for_tickers(["AAPL", "MSFT", "GOOGL", "NVDA", "TSLA"], ["revenue"], "2024-06-30", limit=1)
+
+        # MSFT was cached, the other four tickers go out in two chunks of two
+        assert sorted(call.kwargs["json_data"]["tickers"] for call in mock_request.call_args_list) == [["AAPL", "GOOGL"], ["NVDA", "TSLA"]]
+        assert list(results) == ["AAPL", "MSFT", "GOOGL", "NVDA", "TSLA"]
+        assert results["MSFT"][0].revenue == 5
+        assert results["GOOGL"][0].revenue == 5
+        assert mock_cache.get_line_items("TSLA", "ttm", "2024-06-30", ["revenue"], 1) is not None
+
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_tickers_crowded_out_of_a_batch_are_fetched_alone(self, mock_request, mock_cache):
+        """Test that when the batch limit applies to the whole request, a ticker it cut short is not cached as complete."""
+        periods = {"AAPL": ["2024-03-31", "2023-12-31", "2023-09-30", "2023-06-30"], "MSFT": ["2024-03-31", "2023-12-31"]}
+
+        def respond(url, headers, method="GET", json_data=None):
+            rows = [{**self._row(period, revenue=1), "ticker": ticker} for ticker in json_data["tickers"] for period in periods[ticker]]
+            return httpx.Response(200, json={"search_results": rows[: json_data["limit"]]})
+
+        mock_request.side_effect = respond
+
+        results = search_line_items_for_tickers(["AAPL", "MSFT"], ["revenue"], "2024-06-30", limit=2)
+
+        assert [call.kwargs["json_data"]["tickers"] for call in mock_request.call_args_list] == [["AAPL", "MSFT"], ["MSFT"]]
+        assert [len(results[ticker]) for ticker in ("AAPL", "MSFT")] == [2, 2]
+
+
+class TestDeltaRefresh:
+    """Test suite for refreshing cached insider trades and news with only the newer items."""
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request", side_effect=synthetic_api)
+    def test_moving_end_date_fetches_only_the_new_days(self, mock_request, mock_cache):
+        """Test that a window moved forward a day requests just that day and matches a full fetch."""
+        get_insider_trades("AAPL", "2024-06-28", start_date="2024-01-01", limit=20)
+        mock_request.reset_mock()
+
+        trades = get_insider_trades("AAPL", "2024-07-01", start_date="2024-01-01", limit=20)
+
+        assert [call[0][0].split("?")[1] for call in mock_request.call_args_list] == ["ticker=AAPL&filing_date_lte=2024-07-01&filing_date_gte=2024-06-29&limit=20"]
+        assert [trade.model_dump() for trade in trades] == synthetic_insider_trades("AAPL", "2024-07-01", "2024-01-01", 1000)
+        assert mock_cache.get_watermark("insider_trades", "AAPL")["covered_through"] == "2024-07-01"
+
+        # Any narrower window inside the covered range needs no request at all
+        mock_request.reset_mock()
+        get_insider_trades("AAPL", "2024-03-31", start_date="2024-02-01", limit=20)
+        mock_request.assert_not_called()
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request", side_effect=synthetic_api)
+    def test_latest_n_requests_resume_from_the_watermark(self, mock_request, mock_cache):
+        """Test that a newest-N request for a later day only asks for items after the covered range."""
+        get_company_news("AAPL", "2024-06-28", limit=10)
+        mock_request.reset_mock()
+
+        news = get_company_news("AAPL", "2024-07-02", limit=10)
+
+        mock_request.assert_called_once()
+        assert "start_date=2024-06-29" in mock_request.call_args[0][0]
+        assert [item.model_dump() for item in news] == synthetic_news("AAPL", "2024-07-02", None, 10)
+
+    @patch("src.tools.api._make_api_request", side_effect=synthetic_api)
+    def test_timeline_over_budget_is_fetched_again(self, mock_request):
+        """Test that coverage recorded for a timeline too large to hold does not answer with no items."""
+        expected_news = synthetic_news("AAPL", "2024-06-28", "2024-01-01", 1000)
+        expected_trades = synthetic_insider_trades("AAPL", "2024-06-28", "2024-01-01", 1000)
+
+        with patch("src.tools.api._cache", Cache(memory_budgets={"company_news": 500, "insider_trades": 500})):
+            for _ in range(2):
+                news = get_company_news("AAPL", "2024-06-28", start_date="2024-01-01", limit=1000)
+                trades = get_insider_trades("AAPL", "2024-06-28", start_date="2024-01-01", limit=1000)
+                assert [item.model_dump() for item in news] == expected_news
+                assert [trade.model_dump() for trade in trades] == expected_trades
+
+            assert len(get_company_news("AAPL", "2024-06-28", limit=10)) == 10
+        assert mock_request.call_count == 5
+
+    def test_watermark_tracks_newest_item_and_refresh_time(self):
+        """Test that storing a delta advances the watermark."""
+        cache = Cache()
+        assert cache.get_watermark("company_news", "AAPL") is None
+
+        before = time.time()
+        cache.set_dated("company_news", "AAPL", [news_item(date="2024-01-02")], "2024-01-01", "2024-01-05", limit=10)
+
+        watermark = cache.get_watermark("company_news", "AAPL")
+        assert watermark["newest"] == "2024-01-02"
+        assert watermark["covered_through"] == "2024-01-05"
+        assert watermark["refreshed_at"] >= before
+
+
+class TestCompressedNews:
+    """Test suite for holding cached company news compressed in memory."""
+
+    def test_round_trip_preserves_items(self):
+        """Test that packed news unpacks to equal items in the same order."""
+        items = [CompanyNews(**row) for row in synthetic_news("AAPL", "2024-06-30", "2024-01-01", 1000)] + [news_item()]
+
+        packed = CompressedNews.from_items(items)
+
+        assert packed.to_items() == items
+        assert len(packed) == len(items)
+        assert packed.tables["ticker"] == ("AAPL",)
+
+    def test_cached_news_is_held_compressed(self):
+        """Test that the news cache stores the packed form and hands back full items."""
+        cache = Cache()
+        items = [CompanyNews(**row) for row in synthetic_news("AAPL", "2024-06-30", "2024-01-01", 1000)]
+
+        cache.set_dated("company_news", "AAPL", items, "2024-01-01", "2024-06-30", limit=1000)
+
+        assert isinstance(cache._company_news_cache.get("AAPL"), CompressedNews)
+        assert cache.stats()["company_news"]["resident_bytes"] < estimate_size(items) / 4
+        assert cache.get_dated("company_news", "AAPL", "2024-01-01", "2024-06-30", 1000) == items
+
+    def test_range_reads_rebuild_only_items_in_range(self):
+        """Test that a date-bounded read filters the packed rows first and rebuilds them without validation."""
+        cache = Cache()
+        items = [CompanyNews(**row) for row in synthetic_news("AAPL", "2024-06-30", "2024-01-01", 1000)]
+        cache.set_dated("company_news", "AAPL", items, "2024-01-01", "2024-06-30", limit=1000)
+        in_range = [item for item in items if "2024-06-01" <= item.date[:10] <= "2024-06-10"]
+
+        with patch.object(CompanyNews, "model_construct", wraps=CompanyNews.model_construct) as model_construct, patch.object(CompanyNews, "model_validate", side_effect=AssertionError("revalidated on read")):
+            news = cache.get_dated("company_news", "AAPL", "2024-06-01", "2024-06-10", 1000)
+
+        assert news == in_range
+        assert model_construct.call_count == len(in_range) < len(items)
+
@@ -0,0 +1,29 @@
+from unittest.mock import patch
+
+from src.tools.client import FinancialDatasetsClient
+
+
+class TestFinancialDatasetsClient:
+    """Test suite for the pooled financial data client."""
+
+    def test_session_is_reused_with_bounded_pool(self):
+        """Test that the client keeps one session with a blocking pool of the configured size."""
+        client = FinancialDatasetsClient(pool_size=4)
+
+        session = client.session
+        adapter = session.get_adapter("https://api.financialdatasets.ai/prices/")
+
+        assert client.session is session
+        assert adapter._pool_maxsize == 4
+        assert adapter._pool_block is True
+
+    def test_requests_use_configured_timeouts(self):
+        """Test that GET and POST pass the (connect, read) timeouts."""
+        client = FinancialDatasetsClient(connect_timeout=1.5, read_timeout=7)
+
+        with patch.object(client.session, "get") as mock_get, patch.object(client.session, "post") as mock_post:
+            client.get("https://api.financialdatasets.ai/test", headers={"X-API-KEY": "k"})
+            client.post("https://api.financialdatasets.ai/test", json={"a": 1})
+
+        mock_get.assert_called_once_with("https://api.financialdatasets.ai/test", headers={"X-API-KEY": "k"}, timeout=(1.5, 7))
+        mock_post.assert_called_once_with("https://api.financialdatasets.ai/test", headers=None, json={"a": 1}, timeout=(1.5, 7))
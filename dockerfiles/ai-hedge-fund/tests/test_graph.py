@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from langchain_core.messages import HumanMessage
+
+from src.agents.portfolio_manager import PortfolioManagerOutput
+from src.graph.state import merge_analyst_signals
+from app.backend.services.graph import get_graph
+from src.main import create_workflow, get_workflow
+
+
+def run_workflow(selected_analysts: list[str], tickers: list[str]) -> dict:
+    """Run the hedge fund graph against the local server's synthetic data, with a stubbed portfolio manager LLM call."""
+    state = {
+        "messages": [HumanMessage(content="Make trading decisions based on the provided data.")],
+        "data": {"tickers": tickers, "portfolio": {"cash": 100000.0, "positions": {}}, "start_date": "2024-01-01", "end_date": "2024-06-28"},
+        "analyst_signals": {},
+        "metadata": {"show_reasoning": False, "model_name": "gpt-4.1", "model_provider": "OpenAI"},
+    }
+    with patch("src.agents.portfolio_manager.call_llm", return_value=PortfolioManagerOutput(decisions={})):
+        return create_workflow(selected_analysts).compile().invoke(state, config={"max_concurrency": len(selected_analysts)})
+
+
+class TestAgentState:
+    """Test suite for how the agents update the graph state."""
+
+    def test_each_node_appends_one_message(self, serve):
+        """Test that nodes return only their own message instead of the whole history."""
+        serve()
+        final_state = run_workflow(["technical_analyst", "sentiment_analyst", "fundamentals_analyst"], ["AAPL", "MSFT"])
+
+        names = [message.name for message in final_state["messages"]]
+        assert len(names) == 6
+        assert sorted(names[1:4]) == ["fundamentals_analyst_agent", "sentiment_analyst_agent", "technical_analyst_agent"]
+        assert names[4:] == ["risk_management_agent", "portfolio_manager"]
+
+    def test_parallel_analysts_signals_all_arrive(self, serve):
+        """Test that analysts running on a thread pool each contribute their signals through the reducer."""
+        serve(latency=0.01)
+        final_state = run_workflow(["technical_analyst", "sentiment_analyst", "fundamentals_analyst", "valuation_analyst"], ["AAPL", "MSFT"])
+
+        signals = final_state["analyst_signals"]
+        assert set(signals) == {"technical_analyst_agent", "sentiment_agent", "fundamentals_analyst_agent", "valuation_analyst_agent", "risk_management_agent"}
+        assert all(set(signals[agent]) == {"AAPL", "MSFT"} for agent in signals)
+        assert "analyst_signals" not in final_state["data"]
+
+    def test_signals_merge_per_agent_and_ticker(self):
+        """Test that signal updates for the same agent add tickers instead of replacing the agent's signals."""
+        merged = merge_analyst_signals({"a": {"AAPL": 1}}, {"a": {"MSFT": 2}, "b": {"AAPL": 3}})
+
+        assert merged == {"a": {"AAPL": 1, "MSFT": 2}, "b": {"AAPL": 3}}
+
+
+class TestCompiledWorkflowCache:
+    """Test suite for compiling each analyst selection's workflow once."""
+
+    def test_same_selection_reuses_the_compiled_graph(self):
+        """Test that one selection of analysts, in any order, compiles to a single shared graph."""
+        workflow = get_workflow(["technical_analyst", "sentiment_analyst"])
+
+        assert get_workflow(["sentiment_analyst", "technical_analyst"]) is workflow
+        assert get_workflow(["technical_analyst"]) is not workflow
+        assert get_workflow() is get_workflow(None)
+
+    def test_backend_shares_the_cache(self):
+        """Test that the backend's graph for a selection is the one the CLI and backtester run, ignoring unknown agents."""
+        assert get_graph(["sentiment_analyst", "unknown_agent", "technical_analyst"]) is get_workflow(["technical_analyst", "sentiment_analyst"])
+
+    def test_compile_options_are_part_of_the_key(self):
+        """Test that the same selection compiled with different options gives different graphs."""
+        workflow = get_workflow(["technical_analyst"], debug=True)
+
+        assert workflow is get_workflow(["technical_analyst"], debug=True)
+        assert workflow is not get_workflow(["technical_analyst"])
+        assert workflow.debug
@@ -0,0 +1,51 @@
+import asyncio
+import datetime
+
+from src.tools import api, async_api
+from src.tools.local_server import synthetic_insider_trades, synthetic_news
+
+
+class TestLocalServer:
+    """Test suite for the local stand-in financial data server."""
+
+    def test_sync_api_round_trip_with_throttling(self, serve):
+        """Test that every endpoint answers the real client, which retries through injected 429s."""
+        server = serve(throttle_every=3)
+        today = datetime.date.today().isoformat()
+
+        prices = api.get_prices("AAPL", "2024-01-01", "2024-01-31")
+        metrics = api.get_financial_metrics("AAPL", "2024-06-30", period="annual", limit=3)
+        line_items = api.search_line_items("AAPL", ["revenue", "net_income"], "2024-06-30", limit=4)
+        trades = api.get_insider_trades("AAPL", "2024-06-30", "2024-03-01", limit=5)
+        news = api.get_company_news("AAPL", "2024-06-30", "2024-05-01", limit=5)
+
+        assert len(prices) == 23 and prices[0].time.startswith("2024-01-01")
+        assert [m.report_period for m in metrics] == ["2023-12-31", "2022-12-31", "2021-12-31"]
+        assert [item.report_period for item in line_items] == ["2024-06-30", "2024-03-31", "2023-12-31", "2023-09-30"]
+        assert line_items[0].revenue > 0
+        # Paged five at a time, everything after the window start comes back once (paging stops on reaching the start day)
+        assert [t.model_dump() for t in trades if t.filing_date > "2024-03-01"] == synthetic_insider_trades("AAPL", "2024-06-30", "2024-03-02", 1000)
+        assert [n.model_dump() for n in news if n.date > "2024-05-02"] == synthetic_news("AAPL", "2024-06-30", "2024-05-02", 1000)
+        assert api.get_market_cap("AAPL", today) > 0
+
+        stats = server.stats()
+        assert stats["by_path"]["/insider-trades/"] > 2 and stats["by_path"]["/news/"] > 2
+        assert stats["throttled"] == stats["requests"] // 3
+
+    def test_async_api_sees_latency_concurrently(self, serve):
+        """Test that the asyncio helpers overlap slow requests instead of queueing them."""
+        server = serve(latency=0.1)
+        tickers = [f"T{i}" for i in range(8)]
+
+        results = asyncio.run(async_api.get_financial_metrics_for_tickers(tickers, "2024-06-30"))
+
+        assert all(results[ticker][0].ticker == ticker for ticker in tickers)
+        assert server.stats()["max_concurrent"] > 1
+
+    def test_page_size_caps_dated_pages(self, serve):
+        """Test that the server returns at most page_size items however many are asked for."""
+        serve(page_size=3)
+
+        trades = api.get_insider_trades("MSFT", "2024-06-30", limit=50)
+
+        assert len(trades) == 3
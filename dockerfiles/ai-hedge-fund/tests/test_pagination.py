@@ -0,0 +1,93 @@
+import datetime
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+from unittest.mock import patch
+
+import httpx
+
+from src.data.cache import Cache
+from src.tools.api import _split_date_range, get_company_news, get_insider_trades
+
+# One insider trade filed per day through 2023, served newest first like the real API
+FILING_DATES = [(datetime.date(2023, 1, 1) + datetime.timedelta(days=i)).isoformat() for i in range(365)]
+
+
+def trade(filing_date: str) -> dict:
+    return {
+        "ticker": "AAPL",
+        "issuer": None,
+        "name": f"insider {filing_date}",
+        "title": None,
+        "is_board_director": None,
+        "transaction_date": filing_date,
+        "transaction_shares": 1.0,
+        "transaction_price_per_share": None,
+        "transaction_value": None,
+        "shares_owned_before_transaction": None,
+        "shares_owned_after_transaction": None,
+        "security_title": None,
+        "filing_date": filing_date,
+    }
+
+
+class FakeInsiderTradesApi:
+    """Serves date-filtered pages of FILING_DATES and records how many requests overlap."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, headers, method="GET", json_data=None):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        params = {name: values[0] for name, values in parse_qs(urlparse(url).query).items()}
+        dates = [date for date in reversed(FILING_DATES) if params.get("filing_date_gte", "") <= date <= params["filing_date_lte"]]
+        with self._lock:
+            self.active -= 1
+        return httpx.Response(200, json={"insider_trades": [trade(date) for date in dates[: int(params["limit"])]]})
+
+
+class TestConcurrentPagination:
+    """Test suite for fetching paginated insider trades and news in concurrent date windows."""
+
+    def test_split_date_range_covers_the_window_newest_first(self):
+        """Test that sub-ranges are contiguous, non-overlapping and ordered newest first."""
+        assert _split_date_range("2024-01-01", "2024-01-10", 3) == [("2024-01-07", "2024-01-10"), ("2024-01-04", "2024-01-06"), ("2024-01-01", "2024-01-03")]
+        assert _split_date_range("2024-01-01", "2024-01-02", 5) == [("2024-01-02", "2024-01-02"), ("2024-01-01", "2024-01-01")]
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_windows_return_the_same_trades_as_sequential_paging(self, mock_cache):
+        """Test that concurrent windows fetch every trade once, newest first, with overlapping requests."""
+        sequential_api = FakeInsiderTradesApi()
+        with patch("src.tools.api._make_api_request", side_effect=sequential_api):
+            sequential = get_insider_trades("AAPL", "2023-12-31", start_date="2023-01-01", limit=50)
+
+        mock_cache.clear()
+        concurrent_api = FakeInsiderTradesApi(delay=0.02)
+        with patch("src.tools.api._make_api_request", side_effect=concurrent_api):
+            concurrent = get_insider_trades("AAPL", "2023-12-31", start_date="2023-01-01", limit=50, concurrent_windows=4)
+
+        assert [t.filing_date for t in concurrent] == [t.filing_date for t in sequential] == list(reversed(FILING_DATES))
+        assert concurrent_api.max_active > 1
+        assert sequential_api.max_active == 1
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_page_boundary_duplicates_are_dropped(self, mock_request, mock_cache):
+        """Test that an item repeated on consecutive pages is only returned once."""
+        news = lambda date: {"ticker": "AAPL", "title": date, "author": "a", "source": "s", "date": date, "url": "https://example.com"}
+        first_page = httpx.Response(200, json={"news": [news("2024-01-03"), news("2024-01-02")]})
+        second_page = httpx.Response(200, json={"news": [news("2024-01-02")]})
+        mock_request.side_effect = [first_page, second_page]
+
+        result = get_company_news("AAPL", "2024-01-03", start_date="2024-01-01", limit=2)
+
+        assert [item.date for item in result] == ["2024-01-03", "2024-01-02"]
+        assert "end_date=2024-01-02" in mock_request.call_args_list[1][0][0]
@@ -0,0 +1,129 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils.parallel import LLMConcurrencyLimiter, map_tickers
+from src.utils.progress import progress
+
+_run_id = contextvars.ContextVar("run_id", default=None)
+
+
+class TestMapTickers:
+    """Test suite for fanning an agent's tickers out over threads."""
+
+    def test_results_keep_ticker_order_and_skip_none(self):
+        """Test that results come back in ticker order, whichever finishes first, without skipped tickers."""
+        tickers = ["AAPL", "MSFT", "NVDA", "TSLA"]
+        started = []
+
+        def analyze(ticker: str):
+            started.append(ticker)
+            # Later tickers finish first
+            time.sleep(0.02 * (len(tickers) - tickers.index(ticker)))
+            return None if ticker == "NVDA" else f"{ticker} signal"
+
+        results = map_tickers(tickers, analyze, max_workers=4)
+
+        assert list(results) == ["AAPL", "MSFT", "TSLA"]
+        assert results["TSLA"] == "TSLA signal"
+        assert sorted(started) == sorted(tickers)
+
+    def test_progress_is_live_and_done_lines_keep_ticker_order(self):
+        """Test that updates are emitted while tickers run, and each ticker's "Done" comes out in ticker order with the time it was made."""
+        tickers = ["AAPL", "MSFT", "NVDA", "TSLA"]
+        emitted = []
+
+        def analyze(ticker: str):
+            progress.update_status("test_agent", ticker, "Fetching data")
+            # Later tickers finish first
+            time.sleep(0.05 * (len(tickers) - tickers.index(ticker)))
+            progress.update_status("test_agent", ticker, "Done")
+            return ticker
+
+        handler = progress.register_handler(lambda agent_name, ticker, status, analysis, timestamp: emitted.append((ticker, status, timestamp)))
+        try:
+            map_tickers(tickers, analyze, max_workers=4)
+        finally:
+            progress.unregister_handler(handler)
+
+        assert sorted((ticker, status) for ticker, status, _ in emitted[:4]) == [(ticker, "Fetching data") for ticker in sorted(tickers)]
+        done = emitted[4:]
+        assert [(ticker, status) for ticker, status, _ in done] == [(ticker, "Done") for ticker in tickers]
+        # TSLA finished first, so its "Done" keeps the earliest timestamp
+        assert sorted(done, key=lambda update: update[2])[0][0] == "TSLA"
+
+    def test_tickers_run_concurrently_up_to_the_bound(self):
+        """Test that at most max_workers tickers are analyzed at once."""
+        lock = threading.Lock()
+        active = peak = 0
+
+        def analyze(ticker: str):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return ticker
+
+        map_tickers([f"T{i}" for i in range(12)], analyze, max_workers=3)
+
+        assert peak == 3
+
+    def test_first_failing_ticker_is_raised(self):
+        """Test that the exception of the first failing ticker in ticker order propagates."""
+
+        def analyze(ticker: str):
+            if ticker == "MSFT":
+                time.sleep(0.05)
+                raise ValueError("MSFT failed")
+            if ticker == "NVDA":
+                raise KeyError("NVDA failed")
+            return ticker
+
+        with pytest.raises(ValueError, match="MSFT failed"):
+            map_tickers(["AAPL", "MSFT", "NVDA"], analyze, max_workers=3)
+
+    def test_context_variables_carry_over(self):
+        """Test that each ticker runs with the caller's context variables."""
+        _run_id.set("run-1")
+
+        assert map_tickers(["AAPL", "MSFT"], lambda ticker: _run_id.get(), max_workers=2) == {"AAPL": "run-1", "MSFT": "run-1"}
+
+
+class TestLLMConcurrencyLimiter:
+    """Test suite for bounding concurrent LLM calls per provider."""
+
+    def test_limits_are_read_per_provider(self, monkeypatch):
+        """Test that LLM_MAX_CONCURRENCY sets a default and per-provider overrides."""
+        monkeypatch.setenv("LLM_MAX_CONCURRENCY", "4,OpenAI=16")
+        limiter = LLMConcurrencyLimiter()
+
+        assert (limiter.limit("OpenAI"), limiter.limit("Anthropic"), limiter.limit("Ollama")) == (16, 4, 2)
+
+    def test_slots_bound_calls_in_flight(self, monkeypatch):
+        """Test that calls for one provider wait for a free slot while other providers are unaffected."""
+        monkeypatch.setenv("LLM_MAX_CONCURRENCY", "Groq=2")
+        limiter = LLMConcurrencyLimiter()
+        lock = threading.Lock()
+        active = {"Groq": 0, "OpenAI": 0}
+        peak = dict(active)
+
+        def call(provider: str):
+            with limiter.slot(provider):
+                with lock:
+                    active[provider] += 1
+                    peak[provider] = max(peak[provider], active[provider])
+                time.sleep(0.02)
+                with lock:
+                    active[provider] -= 1
+
+        with ThreadPoolExecutor(max_workers=12) as executor:
+            list(executor.map(call, ["Groq"] * 6 + ["OpenAI"] * 6))
+
+        assert peak["Groq"] == 2
+        assert peak["OpenAI"] > 2
@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+from src.data.cache import Cache
+from src.prewarm import prewarm, read_universe
+from src.tools import api
+from src.tools.run_data import _dated_start
+from src.utils.analysts import ANALYST_CONFIG, get_data_requirements
+
+END_DATE = "2024-06-28"
+
+
+class TestPrewarm:
+    """Test suite for the cache prewarm command."""
+
+    def test_read_universe_accepts_lines_commas_and_comments(self, tmp_path):
+        """Test that tickers are normalized and de-duplicated in file order."""
+        universe = tmp_path / "universe.txt"
+        universe.write_text("# Mega caps\naapl, MSFT\nNVDA  # chips\n\nmsft\n")
+
+        assert read_universe(str(universe)) == ["AAPL", "MSFT", "NVDA"]
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_prewarmed_analyst_fetches_hit_the_cache(self, mock_cache, fake_api):
+        """Test that after a prewarm every analyst's own fetches are served without requests."""
+        tickers = ["AAPL", "MSFT"]
+        with patch("src.tools.async_api._make_api_request", side_effect=fake_api):
+            failures = asyncio.run(prewarm(tickers, "2024-06-01", END_DATE, get_data_requirements()))
+        assert failures == []
+
+        with patch("src.tools.api._make_api_request", side_effect=AssertionError("cache miss after prewarm")):
+            for config in ANALYST_CONFIG.values():
+                requirements = config["data_requirements"]
+                for ticker in tickers:
+                    for requirement in requirements.line_items:
+                        assert api.search_line_items(ticker, list(requirement.line_items), END_DATE, requirement.period, requirement.limit)
+                    for requirement in requirements.financial_metrics:
+                        assert api.get_financial_metrics(ticker, END_DATE, requirement.period, requirement.limit)
+                    if requirements.market_cap:
+                        assert api.get_market_cap(ticker, END_DATE) == 1e9
+                    for requirement in requirements.insider_trades:
+                        assert api.get_insider_trades(ticker, END_DATE, _dated_start(requirement, END_DATE), requirement.limit)
+                    for requirement in requirements.company_news:
+                        assert api.get_company_news(ticker, END_DATE, _dated_start(requirement, END_DATE), requirement.limit)
+                    if requirements.prices:
+                        assert api.get_prices(ticker, "2024-06-01", END_DATE)
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_failures_are_reported_without_stopping_other_fetches(self, mock_cache, fake_api):
+        """Test that one failing fetch is returned while the rest still complete."""
+
+        async def flaky_api(url, headers, method="GET", json_data=None):
+            if "ticker=BAD" in url:
+                return Mock(status_code=500, text="boom")
+            return await fake_api(url, headers, method, json_data)
+
+        with patch("src.tools.async_api._make_api_request", side_effect=flaky_api):
+            failures = asyncio.run(prewarm(["AAPL", "BAD"], "2024-06-01", END_DATE, get_data_requirements(["technical_analyst"])))
+
+        assert [(dataset, ticker) for dataset, ticker, _ in failures] == [("prices", "BAD")]
+        assert mock_cache.get_prices("AAPL", "2024-06-01", END_DATE) is not None
+
+    def test_union_keeps_the_largest_metrics_limit_per_period(self):
+        """Test that financial metrics requirements collapse to one fetch per period."""
+        requirements = get_data_requirements()
+
+        assert sorted((r.period, r.limit) for r in requirements.financial_metrics) == [("annual", 10), ("ttm", 10)]
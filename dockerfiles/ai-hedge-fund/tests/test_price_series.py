@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from src.data.models import Price, PriceSeries
+from src.tools.api import prices_to_df
+
+
+def make_series(times: list[str], close: float = 1.0) -> PriceSeries:
+    return PriceSeries.from_records("AAPL", [{"time": time, "open": close, "close": close, "high": close, "low": close, "volume": 100} for time in times])
+
+
+class TestPriceSeries:
+    """Test suite for the columnar price series."""
+
+    def test_to_df_shares_memory_with_the_series(self):
+        """Test that the series' own DataFrame does not copy the price arrays."""
+        series = make_series(["2024-01-03T00:00:00Z", "2024-01-02T00:00:00Z"])
+
+        df = series.to_df()
+
+        assert list(df.index) == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+        for column in PriceSeries.COLUMNS:
+            assert np.shares_memory(df[column].to_numpy(), getattr(series, column))
+
+    def test_prices_to_df_is_writable_and_utc(self):
+        """Test that prices_to_df matches the list-of-prices frame, with a UTC index, and can be edited without touching the series."""
+        series = make_series(["2024-01-03T00:00:00Z", "2024-01-02T00:00:00Z"])
+
+        df = prices_to_df(series)
+        df["close"] = df["close"] * 2
+        df.loc[df.index[0], "open"] = 5.0
+
+        expected = prices_to_df(list(series))
+        assert list(df.index) == list(expected.index) == [pd.Timestamp("2024-01-02", tz="UTC"), pd.Timestamp("2024-01-03", tz="UTC")]
+        assert list(df["close"]) == [2.0, 2.0]
+        assert list(series.close) == [1.0, 1.0]
+        assert series.open[0] == 1.0
+
+    def test_between_returns_views_of_the_selected_dates(self):
+        """Test that date slicing is inclusive of both ends and does not copy."""
+        series = make_series(["2024-01-02T05:00:00Z", "2024-01-03T05:00:00Z", "2024-01-04T05:00:00Z"])
+
+        window = series.between("2024-01-03", "2024-01-04")
+
+        assert [p.time for p in window] == ["2024-01-03T05:00:00Z", "2024-01-04T05:00:00Z"]
+        assert np.shares_memory(window.close, series.close)
+
+    def test_merge_prefers_newer_rows(self):
+        """Test that merged rows are sorted and the incoming series wins on duplicate times."""
+        merged = make_series(["2024-01-02", "2024-01-03"], close=1.0).merge(make_series(["2024-01-03", "2024-01-04"], close=2.0))
+
+        assert [(p.time[:10], p.close) for p in merged] == [("2024-01-02", 1.0), ("2024-01-03", 2.0), ("2024-01-04", 2.0)]
+
+    def test_behaves_like_a_list_of_prices(self):
+        """Test that existing callers can keep treating the series as a sequence of Price."""
+        series = make_series(["2024-01-02"])
+
+        assert len(series) == 1 and series
+        assert not PriceSeries.empty("AAPL")
+        assert isinstance(series[0], Price)
+        assert series[0].volume == 100
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.data.cache import Cache
+from src.data.models import DataRequirements, DatedRequirement
+from src.main import create_data_planning_node, create_workflow
+from src.tools import api
+from src.tools.client import get_async_client
+from src.tools.run_data import RunDataContext, _dated_start, fetch_run_data
+from src.utils.analysts import ANALYST_CONFIG, get_data_requirements
+
+START_DATE = "2024-06-01"
+END_DATE = "2024-06-28"
+
+
+@pytest.fixture
+def run_data(fake_api):
+    """A context fetched for two tickers and every analyst, with the cache emptied afterwards."""
+    with patch("src.tools.api._cache", new_callable=Cache) as cache, patch("src.tools.async_api._make_api_request", side_effect=fake_api):
+        context = asyncio.run(fetch_run_data(["AAPL", "MSFT"], START_DATE, END_DATE, get_data_requirements()))
+        cache.clear()
+        yield context
+
+
+class TestRunDataContext:
+    """Test suite for the per-run data context the agents read from."""
+
+    def test_declared_requests_are_answered_from_memory(self, run_data):
+        """Test that every analyst's declared fetches come from the context, without the cache or the network."""
+        with patch("src.tools.api._make_api_request", side_effect=AssertionError("request for data in the context")):
+            for config in ANALYST_CONFIG.values():
+                requirements = config["data_requirements"]
+                for ticker in ("AAPL", "MSFT"):
+                    for requirement in requirements.line_items:
+                        items = run_data.search_line_items(ticker, list(requirement.line_items), END_DATE, requirement.period, requirement.limit)
+                        assert items and set(items[0].model_dump()) == {"ticker", "report_period", "period", "currency", *requirement.line_items}
+                    for requirement in requirements.financial_metrics:
+                        assert run_data.get_financial_metrics(ticker, END_DATE, requirement.period, requirement.limit)
+                    if requirements.market_cap:
+                        assert run_data.get_market_cap(ticker, END_DATE) == 1e9
+                    for requirement in requirements.insider_trades:
+                        assert run_data.get_insider_trades(ticker, END_DATE, _dated_start(requirement, END_DATE), requirement.limit)
+                    for requirement in requirements.company_news:
+                        assert run_data.get_company_news(ticker, END_DATE, _dated_start(requirement, END_DATE), requirement.limit)
+                    if requirements.prices:
+                        assert len(run_data.get_prices(ticker, START_DATE, END_DATE)) == 1
+
+    def test_undeclared_requests_fall_through_to_the_api(self, run_data):
+        """Test that requests outside what the context was built for are passed to src.tools.api."""
+        with patch("src.tools.api.get_financial_metrics", return_value=[]) as get_financial_metrics, patch("src.tools.api.get_prices", return_value=[]) as get_prices:
+            run_data.get_financial_metrics("AAPL", "2024-03-28", "annual", 5)
+            run_data.get_financial_metrics("NVDA", END_DATE, "annual", 5)
+            run_data.get_prices("AAPL", "2024-01-01", END_DATE)
+
+        assert get_financial_metrics.call_count == 2
+        assert get_prices.call_count == 1
+
+    def test_results_are_copies(self, run_data):
+        """Test that an agent changing a returned list does not change what the next agent sees."""
+        run_data.get_financial_metrics("AAPL", END_DATE, "ttm", 10).clear()
+
+        assert run_data.get_financial_metrics("AAPL", END_DATE, "ttm", 10)
+
+    def test_empty_context_defers_to_the_api(self):
+        """Test that agents run without a planning node see the API functions unchanged."""
+        with patch("src.tools.api.get_market_cap", return_value=5.0) as get_market_cap:
+            assert RunDataContext.from_state({"data": {}}).get_market_cap("AAPL", END_DATE) == 5.0
+        get_market_cap.assert_called_once_with("AAPL", END_DATE)
+
+    def test_union_merges_dated_requirements_without_a_lookback(self):
+        """Test that limit-only insider trades and news requirements collapse into the largest limit."""
+        requirements = DataRequirements.union(
+            [
+                DataRequirements(company_news=[DatedRequirement(limit=50)]),
+                DataRequirements(company_news=[DatedRequirement(limit=100), DatedRequirement(limit=250, lookback_days=365)]),
+            ]
+        )
+
+        assert requirements.company_news == (DatedRequirement(limit=100), DatedRequirement(limit=250, lookback_days=365))
+
+
+class TestDataPlanningNode:
+    """Test suite for the graph node that fetches a run's data before the analysts."""
+
+    def test_analysts_run_after_data_planning(self):
+        """Test that the workflow routes start_node through data_planning to every analyst."""
+        workflow = create_workflow(["technical_analyst", "sentiment_analyst"])
+
+        assert ("start_node", "data_planning") in workflow.edges
+        assert {("data_planning", "technical_analyst_agent"), ("data_planning", "sentiment_analyst_agent")} <= workflow.edges
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_node_attaches_the_run_data(self, mock_cache, fake_api):
+        """Test that the node fetches the selected analysts' data into state["data"]["run_data"]."""
+        state = {"data": {"tickers": ["AAPL"], "start_date": START_DATE, "end_date": END_DATE}}
+        with patch("src.tools.async_api._make_api_request", side_effect=fake_api) as make_api_request:
+            update = create_data_planning_node(["sentiment_analyst"])(state)
+
+        run_data = update["data"]["run_data"]
+        # Insider trades, news and the risk manager's prices
+        assert make_api_request.call_count == 3
+        assert run_data.get_company_news("AAPL", END_DATE, limit=100)[0].ticker == "AAPL"
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    def test_node_closes_its_http_client(self, mock_cache, fake_api):
+        """Test that planning on a fresh event loop per run leaves no HTTP client open behind it."""
+        state = {"data": {"tickers": ["AAPL"], "start_date": START_DATE, "end_date": END_DATE}}
+        clients = []
+
+        async def make_api_request(url, headers, method="GET", json_data=None):
+            clients.append(get_async_client().http_client)
+            return await fake_api(url, headers, method, json_data)
+
+        with patch("src.tools.async_api._make_api_request", side_effect=make_api_request):
+            for _ in range(3):
+                mock_cache.clear()
+                create_data_planning_node(["sentiment_analyst"])(state)
+
+        assert len(set(map(id, clients))) == 3
+        assert all(client.is_closed for client in clients)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.data.cache import Cache
+from src.data.models import FinancialMetrics
+from src.tools.api import get_financial_metrics
+from src.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for single-flight request coalescing."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test that threads asking for the same key wait on a single execution."""
+        flight = SingleFlight()
+        calls = 0
+        release = threading.Event()
+
+        def fetch():
+            nonlocal calls
+            calls += 1
+            release.wait(1)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flight.do, "key", fetch) for _ in range(8)]
+            time.sleep(0.05)
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert calls == 1
+        assert results == ["result"] * 8
+        assert flight.in_flight() == 0
+
+    def test_exception_is_shared_and_key_released(self):
+        """Test that followers see the leader's exception and later calls run again."""
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        assert flight.do("key", lambda: "ok") == "ok"
+
+    def test_async_callers_share_one_call(self):
+        """Test that coroutines asking for the same key await a single execution."""
+        flight = AsyncSingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert asyncio.run(run()) == ["result"] * 5
+        assert calls == 1
+
+    @patch("src.tools.api._cache", new_callable=Cache)
+    @patch("src.tools.api._make_api_request")
+    def test_parallel_agents_make_one_metrics_request(self, mock_request, mock_cache):
+        """Test that concurrent identical get_financial_metrics calls hit the API once."""
+        response = httpx.Response(
+            200,
+            json={"financial_metrics": [{"ticker": "AAPL", "report_period": "2024-03-31", "period": "annual", "currency": "USD", **{field: None for field in FinancialMetrics.model_fields if field not in ("ticker", "report_period", "period", "currency")}}]},
+        )
+
+        def slow_request(*args, **kwargs):
+            time.sleep(0.05)
+            return response
+
+        mock_request.side_effect = slow_request
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = list(executor.map(lambda _: get_financial_metrics("AAPL", "2024-06-30", period="annual", limit=5), range(6)))
+
+        assert mock_request.call_count == 1
+        assert all(result[0].ticker == "AAPL" for result in results)